@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+transform 每个键的开销基准测试
+
+使用大量小数组测量 transform 的逐键固定开销（与数组大小无关的部分），
+对比 C++ 后端、NumPy 后端以及直接调用 C++ 扩展的情况。
+"""
+
+import numpy as np
+import sys
+import os
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pybase.transform import transform, get_cpp_availability
+
+
+def best_time(func, repeat=7):
+    """返回多次运行中的最短耗时（秒）"""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def per_key_overhead(n_keys, array_size=4):
+    """测量给定键数量下每个键的耗时（微秒）"""
+    input_dict = {f"key_{i}": np.ones(array_size) for i in range(n_keys)}
+    out = transform(input_dict)
+    
+    cases = {
+        "transform (numpy)": lambda: transform(input_dict, backend="numpy"),
+    }
+    if get_cpp_availability():
+        from pybase import _transform
+        cases["transform (cpp)"] = lambda: transform(input_dict, backend="cpp", threads=1)
+        cases["transform (cpp, out=)"] = lambda: transform(input_dict, out=out, backend="cpp", threads=1)
+        cases["_transform.transform"] = lambda: _transform.transform(input_dict, None, 1)
+    
+    return {name: best_time(func) / n_keys * 1e6 for name, func in cases.items()}
+
+
+def main():
+    """主函数"""
+    print("PyBase transform 逐键开销基准")
+    print("=" * 70)
+    print(f"C++ 实现可用: {get_cpp_availability()}")
+    
+    for n_keys in (100, 1000, 10000, 100000):
+        print(f"\n键数量: {n_keys}（每个数组 4 个元素）")
+        for name, micros in per_key_overhead(n_keys).items():
+            print(f"  {name:<24} {micros:8.3f} 微秒/键")
+
+
+if __name__ == "__main__":
+    main()
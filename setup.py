@@ -6,10 +6,14 @@ This file is needed because pyproject.toml has limited support for C++ extension
 The main configuration is in pyproject.toml, but C++ extensions are defined here.
 """
 
+import sys
 from setuptools import setup
 from pybind11.setup_helpers import Pybind11Extension, build_ext
 import numpy as np
 
+# The native kernels use std::thread
+thread_flags = [] if sys.platform == "win32" else ["-pthread"]
+
 # Define the C++ extension
 ext_modules = [
     Pybind11Extension(
@@ -18,6 +22,8 @@ ext_modules = [
         include_dirs=[np.get_include()],
         language='c++',
         cxx_std=17,  # Use C++17 standard
+        extra_compile_args=thread_flags,
+        extra_link_args=thread_flags,
     ),
 ]
 
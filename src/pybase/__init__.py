@@ -0,0 +1,75 @@
+"""
+PyBase: scaling of NumPy arrays with a C++ backend.
+
+Submodules and the main entry points are imported on first attribute access
+(PEP 562), so ``import pybase`` does not import NumPy or load the native
+extension until they are actually used::
+
+    import pybase
+    
+    result = pybase.scale_array(arr)   # imports pybase.transform here
+"""
+
+import importlib
+from typing import Any, List
+
+# Public attribute -> (submodule, attribute in it); None exports the
+# submodule itself
+_LAZY_ATTRIBUTES = {
+    "transform": ("transform", None),
+    "npyio": ("npyio", None),
+    "bench": ("bench", None),
+    "cli": ("cli", None),
+    "gui": ("gui", None),
+    "scale_array": ("transform", "scale_array"),
+    "create_new_key": ("transform", "create_new_key"),
+    "create_new_keys": ("transform", "create_new_keys"),
+    "transform_stream": ("transform", "transform_stream"),
+    "atransform": ("transform", "atransform"),
+    "ascale_array": ("transform", "ascale_array"),
+    "Pipeline": ("transform", "Pipeline"),
+    "Transformer": ("transform", "Transformer"),
+    "IncrementalTransformer": ("transform", "IncrementalTransformer"),
+    "BufferPool": ("transform", "BufferPool"),
+    "LazyTransformResult": ("transform", "LazyTransformResult"),
+    "get_cpp_availability": ("transform", "get_cpp_availability"),
+    "transform_npy": ("npyio", "transform_npy"),
+    "transform_npz": ("npyio", "transform_npz"),
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+# Reported when the package metadata is missing, e.g. when running from a
+# source checkout that was never installed
+_UNKNOWN_VERSION = "0+unknown"
+
+
+def _package_version() -> str:
+    """Version of the installed distribution, as declared in pyproject.toml."""
+    from importlib.metadata import PackageNotFoundError, version
+    
+    try:
+        return version(__name__)
+    except PackageNotFoundError:
+        return _UNKNOWN_VERSION
+
+
+def __getattr__(name: str) -> Any:
+    if name == "__version__":
+        value = globals()[name] = _package_version()
+        return value
+    
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    # Later lookups find the value directly instead of calling __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | {"__version__"})
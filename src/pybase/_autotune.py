@@ -0,0 +1,152 @@
+"""
+Autotuning of the transform backend dispatch thresholds.
+
+Measures, on the running host, the array size from which the native kernel
+beats NumPy and the size from which threading pays off, and caches the
+result as JSON so the measurement only has to run once per host.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+# Bump when the meaning of the stored thresholds changes
+CACHE_VERSION = 1
+
+CACHE_FILE_NAME = "autotune.json"
+
+# Thresholds used until autotune() has been run on the host: always use
+# the native kernel, and let it decide about threading on its own
+DEFAULT_THRESHOLDS = {
+    "native_min_size": 0,
+    "parallel_min_size": 0,
+}
+
+
+def cache_path() -> Path:
+    """
+    Location of the autotune cache file.
+    
+    Uses $PYBASE_CACHE_DIR if set, otherwise $XDG_CACHE_HOME/pybase or
+    ~/.cache/pybase.
+    """
+    cache_dir = os.environ.get("PYBASE_CACHE_DIR")
+    if not cache_dir:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        cache_dir = os.path.join(xdg_cache, "pybase")
+    return Path(cache_dir) / CACHE_FILE_NAME
+
+
+def load(signature: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Load cached thresholds measured on a host with the same signature.
+    
+    Args:
+        signature: Description of the host and library versions
+        
+    Returns:
+        Thresholds dictionary, or None if there is no usable cache
+    """
+    try:
+        with open(cache_path(), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return None
+    if data.get("signature") != signature:
+        return None
+    
+    thresholds = data.get("thresholds")
+    if not isinstance(thresholds, dict) or set(thresholds) != set(DEFAULT_THRESHOLDS):
+        return None
+    return thresholds
+
+
+def save(signature: Dict[str, Any], thresholds: Dict[str, Any]) -> Path:
+    """
+    Write thresholds to the cache file atomically.
+    
+    Args:
+        signature: Description of the host and library versions
+        thresholds: Measured thresholds
+        
+    Returns:
+        Path of the written cache file
+    """
+    path = cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    data = {"version": CACHE_VERSION, "signature": signature, "thresholds": thresholds}
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _median_time(func: Callable[[], Any], repeat: int) -> float:
+    """Median wall time of func() over repeat runs, after one warm-up call."""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def measure(native_scale: Callable[[np.ndarray, np.ndarray, int], Any],
+            numpy_scale: Callable[[np.ndarray, np.ndarray], Any],
+            threads: int,
+            max_size: int = 1 << 22) -> Dict[str, Any]:
+    """
+    Measure the dispatch thresholds on this host.
+    
+    Args:
+        native_scale: Calls the native kernel as native_scale(arr, out, threads)
+        numpy_scale: Calls the NumPy backend as numpy_scale(arr, out)
+        threads: Thread count to compare against the serial native kernel
+        max_size: Largest array size (elements) to measure
+        
+    Returns:
+        Thresholds dictionary with the same keys as DEFAULT_THRESHOLDS.
+        parallel_min_size is None when threading never helped.
+    """
+    sizes = [1 << k for k in range(4, max_size.bit_length())]
+    
+    # Smallest size from which the native kernel wins at every larger size
+    native_min_size = 0
+    for size in sizes:
+        arr = np.random.random(size)
+        out = np.empty_like(arr)
+        repeat = max(5, min(200, (1 << 20) // size))
+        native = _median_time(lambda: native_scale(arr, out, 1), repeat)
+        numpy = _median_time(lambda: numpy_scale(arr, out), repeat)
+        if native > numpy:
+            native_min_size = size * 2
+    
+    # Smallest size from which threading wins at every larger size
+    parallel_min_size = None
+    if threads > 1:
+        parallel_min_size = 0
+        for size in sizes:
+            arr = np.random.random(size)
+            out = np.empty_like(arr)
+            repeat = max(5, min(50, (1 << 22) // size))
+            serial = _median_time(lambda: native_scale(arr, out, 1), repeat)
+            threaded = _median_time(lambda: native_scale(arr, out, threads), repeat)
+            if threaded >= serial:
+                parallel_min_size = size * 2
+        if parallel_min_size > sizes[-1]:
+            parallel_min_size = None
+    
+    return {
+        "native_min_size": native_min_size,
+        "parallel_min_size": parallel_min_size,
+    }
@@ -0,0 +1,112 @@
+"""
+Content-addressed LRU cache of transform results.
+
+Entries are keyed on a hash of the input bytes plus everything else the
+result depends on (shape, dtype, memory order, factor, pipeline steps and
+the result dtype).
+Cached arrays are read-only, so one array can be handed to every caller.
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "entries", "nbytes", "max_bytes"])
+
+
+class ResultCache:
+    """
+    Thread-safe LRU mapping from content keys to read-only result arrays,
+    bounded by the total size of the stored arrays.
+    """
+    
+    def __init__(self, max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: tuple) -> Optional[np.ndarray]:
+        """Return the cached array for key, counting a hit or a miss."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+    
+    def put(self, key: tuple, result: np.ndarray) -> np.ndarray:
+        """
+        Make result read-only and store it, evicting least recently used
+        entries to stay within max_bytes. Results larger than the whole
+        budget are returned without being stored.
+        """
+        result.flags.writeable = False
+        if result.nbytes > self.max_bytes:
+            return result
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+            self._entries[key] = result
+            self.nbytes += result.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+        return result
+    
+    def resize(self, max_bytes: int) -> None:
+        """Change the budget, evicting entries that no longer fit."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+    
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = self.hits = self.misses = 0
+    
+    def info(self) -> CacheInfo:
+        """Snapshot of the counters and size."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, len(self._entries), self.nbytes, self.max_bytes)
+
+
+def content_key(arr: np.ndarray, factor: float, steps: tuple,
+                hasher: Optional[Callable[[np.ndarray], int]] = None,
+                dtype: np.dtype = np.dtype(np.float64)) -> Optional[Tuple]:
+    """
+    Cache key for scaling arr, or None if arr is not contiguous.
+    
+    Args:
+        arr: Input array
+        factor: Scaling factor
+        steps: Pipeline steps applied after scaling
+        hasher: Hash of the bytes of a contiguous array (the native
+            XXH64); BLAKE2b is used when not given
+        dtype: Dtype of the result
+    """
+    if arr.flags.c_contiguous:
+        order = "C"
+    elif arr.flags.f_contiguous:
+        order = "F"
+    else:
+        return None
+    
+    if hasher is not None:
+        digest = hasher(arr)
+    else:
+        import hashlib
+        
+        data = arr.ravel(order="K").view(np.uint8)
+        digest = hashlib.blake2b(data, digest_size=8).digest()
+    return (digest, arr.shape, arr.dtype.str, order, float(factor), steps, dtype.str)
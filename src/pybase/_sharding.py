@@ -0,0 +1,213 @@
+"""
+Process-pool sharding of transforms over shared memory.
+
+Inputs are packed into one shared memory segment and outputs are written by
+the worker processes into a second one, so arrays never go through pickle:
+only segment names and offsets are sent to the workers. The outputs handed
+back to the caller are views over the output segment, which is unlinked as
+soon as the workers are done and unmapped when the last view is collected.
+"""
+
+import atexit
+import ctypes
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Alignment of every array inside a segment, in bytes
+ALIGNMENT = 64
+
+# (input offset, input dtype, output offset, element count); offsets in bytes
+Piece = Tuple[int, str, int, int]
+
+# Workers are never forked straight from the caller: it usually runs other
+# threads (async executor, stream workers, native kernels), and forking a
+# multi-threaded process can deadlock the child on a lock held by one of
+# them. forkserver forks from a single-threaded server instead, and spawn
+# is used where forkserver does not exist. The server's preload list is
+# process-wide and left to the application; workers import this module
+# when they receive their first task
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+class SharedBlock:
+    """
+    Owner of the shared memory segment behind sharded outputs.
+    
+    Arrays are created from the block through the array interface, so each
+    of them keeps the block, and with it the mapping, alive. The mapping is
+    closed when the last array is collected.
+    """
+    
+    def __init__(self, shm: shared_memory.SharedMemory):
+        self.shm = shm
+        self.address = ctypes.addressof(ctypes.c_char.from_buffer(shm.buf))
+        self.__array_interface__ = {
+            "shape": (shm.size,),
+            "typestr": "|u1",
+            "data": (self.address, False),
+            "version": 3,
+        }
+    
+    def array(self, offset: int, shape: tuple, dtype: np.dtype,
+              fortran_order: bool) -> np.ndarray:
+        """View of the block as an array starting offset bytes in."""
+        count = int(np.prod(shape, dtype=np.int64))
+        flat = np.asarray(self)[offset:offset + count * dtype.itemsize].view(dtype)
+        return flat.reshape(shape, order="F" if fortran_order else "C")
+    
+    def __del__(self):
+        try:
+            self.shm.close()
+        except (OSError, BufferError):
+            pass
+
+
+def transform_sharded(input_dict: Dict[str, np.ndarray], processes: int,
+                      threads: int, backend: str) -> Dict[str, np.ndarray]:
+    """
+    Scale the arrays of a validated dict by 0.3 in a pool of processes.
+    
+    Keys are balanced across the processes largest first; an array larger
+    than an even share is split into flat chunks, so a single huge array is
+    spread over the whole pool as well.
+    
+    Args:
+        input_dict: Validated dictionary of numeric numpy arrays
+        processes: Number of worker processes
+        threads: Native threads used by each worker
+        backend: Backend used by each worker, as for transform()
+        
+    Returns:
+        Dictionary with "_new" keys whose arrays are views over one shared
+        output segment
+    """
+    layouts = {}
+    in_size = out_size = 0
+    for key, arr in input_dict.items():
+        fortran_order = arr.flags.f_contiguous and not arr.flags.c_contiguous
+        layouts[key] = (in_size, out_size, fortran_order)
+        in_size += _aligned(arr.nbytes)
+        out_size += _aligned(arr.size * 8)
+    
+    in_shm = shared_memory.SharedMemory(create=True, size=max(1, in_size))
+    try:
+        in_block = SharedBlock(in_shm)
+        out_shm = shared_memory.SharedMemory(create=True, size=max(1, out_size))
+        try:
+            out_block = SharedBlock(out_shm)
+            
+            # Pack the inputs; the copy is the only one the data goes through
+            for key, arr in input_dict.items():
+                in_offset, _, fortran_order = layouts[key]
+                in_block.array(in_offset, arr.shape, arr.dtype, fortran_order)[...] = arr
+            
+            pieces = []
+            for key, arr in input_dict.items():
+                in_offset, out_offset, _ = layouts[key]
+                pieces.append((in_offset, arr.dtype.str, out_offset, arr.size))
+            
+            shards = _balance(pieces, processes)
+            futures = [_get_pool(processes).submit(_run_shard, in_shm.name, out_shm.name,
+                                                   shard, threads, backend)
+                       for shard in shards]
+            try:
+                for future in futures:
+                    future.result()
+            except BrokenProcessPool:
+                _reset_pool()
+                raise
+            
+            return {
+                key + "_new": out_block.array(layouts[key][1], arr.shape,
+                                              np.dtype(np.float64), layouts[key][2])
+                for key, arr in input_dict.items()
+            }
+        finally:
+            # Mappings stay valid after unlinking; the memory itself is
+            # released once the last output view is gone
+            out_shm.unlink()
+    finally:
+        in_shm.unlink()
+
+
+def _aligned(nbytes: int) -> int:
+    """Round nbytes up to a multiple of ALIGNMENT."""
+    return -(-nbytes // ALIGNMENT) * ALIGNMENT
+
+
+def _balance(pieces: List[Piece], processes: int) -> List[List[Piece]]:
+    """Split pieces into at most processes shards of similar element count."""
+    total = sum(piece[3] for piece in pieces)
+    share = max(1, -(-total // processes))
+    
+    # Split arrays larger than an even share into flat chunks
+    chunks = []
+    for in_offset, dtype, out_offset, count in pieces:
+        itemsize = np.dtype(dtype).itemsize
+        for start in range(0, count, share):
+            size = min(share, count - start)
+            chunks.append((in_offset + start * itemsize, dtype, out_offset + start * 8, size))
+    
+    # Largest first onto the least loaded shard
+    shards: List[List[Piece]] = [[] for _ in range(processes)]
+    loads = [0] * processes
+    for chunk in sorted(chunks, key=lambda chunk: -chunk[3]):
+        target = loads.index(min(loads))
+        shards[target].append(chunk)
+        loads[target] += chunk[3]
+    return [shard for shard in shards if shard]
+
+
+def _run_shard(in_name: str, out_name: str, shard: List[Piece],
+               threads: int, backend: str) -> None:
+    """Worker entry point: scale the pieces of one shard in place."""
+    from .transform import scale_array
+    
+    in_shm = shared_memory.SharedMemory(name=in_name)
+    try:
+        out_shm = shared_memory.SharedMemory(name=out_name)
+        try:
+            for in_offset, dtype, out_offset, count in shard:
+                arr = np.frombuffer(in_shm.buf, dtype=dtype, count=count, offset=in_offset)
+                out = np.frombuffer(out_shm.buf, dtype=np.float64, count=count, offset=out_offset)
+                scale_array(arr, 0.3, out=out, threads=threads, backend=backend)
+                del arr, out
+        finally:
+            out_shm.close()
+    finally:
+        in_shm.close()
+
+
+def _get_pool(processes: int) -> ProcessPoolExecutor:
+    """Process pool with the given number of workers, reused across calls."""
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None or _pool_size != processes:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=processes,
+                                        mp_context=multiprocessing.get_context(_START_METHOD))
+            _pool_size = processes
+        return _pool
+
+
+def _reset_pool() -> None:
+    """Drop the process pool, e.g. after a worker died."""
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool, _pool_size = None, 0
+
+
+atexit.register(_reset_pool)
@@ -0,0 +1,370 @@
+"""
+PyBase Benchmark Module
+
+Reproducible timings of transform(), scale_array() and create_new_key()
+across array sizes, dtypes, key counts and memory layouts. Every case is
+warmed up, calibrated so one sample lasts long enough to time reliably, and
+sampled repeatedly; the report gives percentiles of the time per call and
+the achieved bandwidth, and is plain JSON so reports from different runs or
+hosts can be saved and compared with compare().
+"""
+
+import datetime
+import functools
+import gc
+import json
+import os
+import platform
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from . import transform as _transform_module
+from .transform import create_new_key, create_new_keys, scale_array, transform
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+# Bump when the layout of the report changes
+REPORT_VERSION = 1
+
+SUITES = ("quick", "full")
+
+# Percentiles of the time per call included in every result
+PERCENTILES = (50, 90, 99)
+
+# Shortest sample worth timing; faster cases run several calls per sample
+DEFAULT_MIN_SAMPLE_TIME = 1e-3
+
+# Cases of each suite; the full suite is a superset of the quick one
+_SCALE_SIZES = {"quick": (1 << 10, 1 << 16, 1 << 20), "full": (1 << 10, 1 << 16, 1 << 20, 1 << 24)}
+_SCALE_DTYPES = {"quick": ("float64", "float32", "int32"),
+                 "full": ("float64", "float32", "float16", "int64", "int32", "uint8")}
+_SCALE_LAYOUTS = ("contiguous", "strided", "fortran")
+# (number of keys, elements per array)
+_TRANSFORM_SHAPES = {"quick": ((1, 1 << 20), (100, 1 << 10), (10000, 16)),
+                     "full": ((1, 1 << 20), (1, 1 << 24), (100, 1 << 10), (1000, 1 << 12),
+                              (10000, 16), (10000, 1 << 8))}
+_KEY_COUNTS = {"quick": (100, 10000), "full": (100, 10000, 100000)}
+
+# A benchmark case: its parameters, and a function that builds the inputs
+# and returns the callable to time, the bytes read plus written by one call
+# (None if not meaningful) and the items one call handles
+_Case = Tuple[str, Dict[str, Any], Callable[[], Tuple[Callable[[], Any], Optional[int], int]]]
+
+
+def _case_name(benchmark: str, params: Dict[str, Any]) -> str:
+    """Stable identifier of a case, used to match results between reports."""
+    return f"{benchmark}[{','.join(f'{k}={v}' for k, v in params.items())}]"
+
+
+def _make_array(size: int, dtype: str, layout: str, rng: np.random.Generator) -> np.ndarray:
+    """
+    Random input of size elements in the given layout.
+    
+    "strided" is every other element of a buffer twice as large, and
+    "fortran" is a 2-D column-major array.
+    """
+    count = 2 * size if layout == "strided" else size
+    values = rng.random(count) * 100
+    arr = values.astype(dtype)
+    if layout == "strided":
+        return arr[::2]
+    if layout == "fortran":
+        rows = 64 if size >= 64 else 1
+        return np.asfortranarray(arr.reshape(rows, size // rows))
+    return arr
+
+
+def _result_bytes(arr: np.ndarray) -> int:
+    """Bytes read and written when scaling arr to the default float64 result."""
+    return arr.nbytes + arr.size * 8
+
+
+def _cases(suite: str, backend: str, threads: Optional[int], seed: int) -> List[_Case]:
+    """List the cases of a suite; inputs are only built for cases that run."""
+    rng = np.random.default_rng(seed)
+    cases: List[_Case] = []
+    
+    def scale_case(size: int, dtype: str, layout: str):
+        arr = _make_array(size, dtype, layout, rng)
+        return (lambda: scale_array(arr, threads=threads, backend=backend)), _result_bytes(arr), size
+    
+    def transform_case(keys: int, size: int):
+        input_dict = {f"key_{i}": rng.random(size) for i in range(keys)}
+        nbytes = sum(_result_bytes(arr) for arr in input_dict.values())
+        return (lambda: transform(input_dict, threads=threads, backend=backend)), nbytes, keys * size
+    
+    def key_case(keys: int, batched: bool):
+        names = [f"feature_{i}" for i in range(keys)]
+        if batched:
+            return (lambda: create_new_keys(names)), None, keys
+        return (lambda: [create_new_key(name) for name in names]), None, keys
+    
+    for size in _SCALE_SIZES[suite]:
+        for dtype in _SCALE_DTYPES[suite]:
+            for layout in _SCALE_LAYOUTS:
+                cases.append(("scale_array", {"size": size, "dtype": dtype, "layout": layout},
+                              functools.partial(scale_case, size, dtype, layout)))
+    for keys, size in _TRANSFORM_SHAPES[suite]:
+        cases.append(("transform", {"keys": keys, "size": size, "dtype": "float64"},
+                      functools.partial(transform_case, keys, size)))
+    for keys in _KEY_COUNTS[suite]:
+        cases.append(("create_new_key", {"keys": keys}, functools.partial(key_case, keys, False)))
+        cases.append(("create_new_keys", {"keys": keys}, functools.partial(key_case, keys, True)))
+    return cases
+
+
+def _calibrate(func: Callable[[], Any], min_sample_time: float) -> int:
+    """Number of calls per sample so that one sample lasts min_sample_time."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_sample_time or number >= 1 << 20:
+            return number
+        # Aim a little past the target so the loop usually ends next round
+        number = max(number * 2, int(number * 1.2 * min_sample_time / max(elapsed, 1e-9)))
+
+
+def _time_case(func: Callable[[], Any], warmup: int, repeat: int,
+               min_sample_time: float) -> Tuple[int, List[float]]:
+    """
+    Time func() after warm-up calls.
+    
+    Returns:
+        (calls per sample, time per call of each of the repeat samples)
+    """
+    for _ in range(warmup):
+        func()
+    number = _calibrate(func, min_sample_time)
+    
+    # As in timeit, keep the collector from firing inside a sample
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return number, samples
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    """Statistics of the time per call, in seconds."""
+    values = np.asarray(samples)
+    summary = {
+        "min": float(values.min()),
+        "mean": float(values.mean()),
+        "stdev": float(values.std(ddof=1)) if values.size > 1 else 0.0,
+    }
+    for q in PERCENTILES:
+        summary[f"p{q}"] = float(np.percentile(values, q))
+    return summary
+
+
+def host_info() -> Dict[str, Any]:
+    """Describe the host and library versions a report was measured with."""
+    return {
+        "pybase": _transform_module.get_version(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "cpp": _transform_module.get_cpp_availability(),
+        "simd": _transform_module.get_simd_backend(),
+        "threads": _transform_module.get_num_threads(),
+    }
+
+
+def run(suite: str = "quick",
+        repeat: int = 20,
+        warmup: int = 3,
+        min_sample_time: float = DEFAULT_MIN_SAMPLE_TIME,
+        backend: str = "auto",
+        threads: Optional[int] = None,
+        match: Optional[str] = None,
+        seed: int = 0,
+        callback: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Run a benchmark suite.
+    
+    Each case is called warmup times, then calibrated so that one sample
+    lasts at least min_sample_time (fast cases run several calls per
+    sample), then sampled repeat times with the garbage collector paused.
+    Inputs are generated from a fixed seed, so runs with the same arguments
+    time the same data.
+    
+    Args:
+        suite: "quick" (seconds) or "full" (adds larger arrays, more dtypes
+            and more keys)
+        repeat: Number of timed samples per case
+        warmup: Number of untimed calls per case
+        min_sample_time: Minimum duration of one sample, in seconds
+        backend: Passed to transform() and scale_array()
+        threads: Passed to transform() and scale_array()
+        match: If given, only run cases whose name contains this string
+        seed: Seed of the random inputs
+        callback: Called with the name of each case before it runs
+        
+    Returns:
+        JSON-serializable report with "version", "created", "host",
+        "config" and "results". Each result has the case "name",
+        "benchmark" and "params", the calls per sample ("number"), the
+        time per call in seconds ("seconds": min, mean, stdev and
+        percentiles), the bytes read plus written per call and the
+        bandwidth achieved at the median ("bytes", "gbps"; None for the key
+        benchmarks), and the items handled per call and per second
+        ("items", "items_per_second").
+        
+    Raises:
+        ValueError: If suite is unknown, repeat or warmup is out of range,
+            or min_sample_time is not positive
+    """
+    if suite not in SUITES:
+        raise ValueError(f"suite must be one of {SUITES}, got {suite!r}")
+    if isinstance(repeat, bool) or not isinstance(repeat, int) or repeat < 1:
+        raise ValueError(f"repeat must be a positive integer, got {repeat!r}")
+    if isinstance(warmup, bool) or not isinstance(warmup, int) or warmup < 0:
+        raise ValueError(f"warmup must be a non-negative integer, got {warmup!r}")
+    if not min_sample_time > 0:
+        raise ValueError(f"min_sample_time must be positive, got {min_sample_time!r}")
+    
+    results = []
+    for benchmark, params, build in _cases(suite, backend, threads, seed):
+        name = _case_name(benchmark, params)
+        if match is not None and match not in name:
+            continue
+        if callback is not None:
+            callback(name)
+        
+        func, nbytes, items = build()
+        number, samples = _time_case(func, warmup, repeat, min_sample_time)
+        seconds = _summarize(samples)
+        median = seconds["p50"]
+        results.append({
+            "name": name,
+            "benchmark": benchmark,
+            "params": params,
+            "number": number,
+            "repeat": repeat,
+            "seconds": seconds,
+            "bytes": nbytes,
+            "gbps": nbytes / median / 1e9 if nbytes is not None and median > 0 else None,
+            "items": items,
+            "items_per_second": items / median if median > 0 else None,
+        })
+    
+    return {
+        "version": REPORT_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "host": host_info(),
+        "config": {
+            "suite": suite,
+            "repeat": repeat,
+            "warmup": warmup,
+            "min_sample_time": min_sample_time,
+            "backend": backend,
+            "threads": threads,
+            "match": match,
+            "seed": seed,
+            # A non-zero budget lets repeated calls hit the result cache
+            "cache_max_bytes": _transform_module.get_cache_info().max_bytes,
+        },
+        "results": results,
+    }
+
+
+def save(report: Dict[str, Any], path: PathLike) -> Path:
+    """
+    Write a report as JSON.
+    
+    Args:
+        report: Report returned by run()
+        path: Destination file (created or overwritten)
+        
+    Returns:
+        Path of the written file
+    """
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    return path
+
+
+def load(path: PathLike) -> Dict[str, Any]:
+    """
+    Read a report written by save().
+    
+    Args:
+        path: Report file
+        
+    Returns:
+        The report
+        
+    Raises:
+        ValueError: If the file is not a report of this version
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    if not isinstance(report, dict) or report.get("version") != REPORT_VERSION:
+        raise ValueError(f"{path} is not a version {REPORT_VERSION} benchmark report")
+    return report
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Compare the median time per call of two reports case by case.
+    
+    Args:
+        baseline: Earlier report
+        current: Report to check against the baseline
+        threshold: Relative change of the median below which a case counts
+            as unchanged (default: 10%)
+            
+    Returns:
+        One entry per case name in either report, in the order of current
+        followed by cases only in baseline, with "name", "baseline" and
+        "current" medians in seconds (None when the case is missing from
+        that report), "ratio" (current / baseline) and "status": one of
+        "regression", "improvement", "unchanged", "added" or "removed".
+        
+    Raises:
+        ValueError: If threshold is negative
+    """
+    if threshold < 0:
+        raise ValueError(f"threshold must be non-negative, got {threshold!r}")
+    
+    before = {result["name"]: result["seconds"]["p50"] for result in baseline["results"]}
+    after = {result["name"]: result["seconds"]["p50"] for result in current["results"]}
+    
+    rows = []
+    for name in list(after) + [name for name in before if name not in after]:
+        old, new = before.get(name), after.get(name)
+        ratio = None
+        if old is None:
+            status = "added"
+        elif new is None:
+            status = "removed"
+        else:
+            ratio = new / old if old > 0 else float("inf")
+            if ratio > 1 + threshold:
+                status = "regression"
+            elif ratio < 1 / (1 + threshold):
+                status = "improvement"
+            else:
+                status = "unchanged"
+        rows.append({"name": name, "baseline": old, "current": new, "ratio": ratio, "status": status})
+    return rows
@@ -6,6 +6,7 @@ CLI 模块示例
 
 import click
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
 from rich.progress import track
 import time
@@ -49,5 +50,98 @@ def progress():
     
     console.print("[bold green]处理完成！[/bold green]")
 
+def _format_seconds(seconds):
+    """以合适的单位格式化耗时"""
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+@cli.command()
+@click.option('--suite', type=click.Choice(['quick', 'full']), default='quick', help='基准套件（默认：quick）')
+@click.option('--repeat', default=20, type=click.IntRange(min=1), help='每个用例的计时次数')
+@click.option('--warmup', default=3, type=click.IntRange(min=0), help='每个用例的预热次数')
+@click.option('--backend', type=click.Choice(['auto', 'cpp', 'numpy']), default='auto', help='计算后端')
+@click.option('--threads', default=None, type=click.IntRange(min=1), help='原生线程数（默认：模块默认值）')
+@click.option('--match', 'match', default=None, help='只运行名称包含该字符串的用例')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), default=None, help='将 JSON 报告写入文件')
+@click.option('--json', 'as_json', is_flag=True, help='将 JSON 报告输出到标准输出，而不是表格')
+@click.option('--compare', 'baseline', type=click.Path(exists=True, dir_okay=False), default=None,
+              help='与之前保存的 JSON 报告对比')
+@click.option('--threshold', default=0.1, type=click.FloatRange(min=0), help='判定为回归的相对变化（默认：0.1）')
+@click.pass_context
+def bench(ctx, suite, repeat, warmup, backend, threads, match, output, as_json, baseline, threshold):
+    """运行性能基准测试"""
+    # 延迟导入，避免其它命令加载 NumPy
+    import json
+    from pybase import bench as benchmarks
+    
+    previous = benchmarks.load(baseline) if baseline else None
+    
+    if as_json:
+        report = benchmarks.run(suite=suite, repeat=repeat, warmup=warmup, backend=backend,
+                                threads=threads, match=match)
+    else:
+        with console.status("运行基准测试...") as status:
+            report = benchmarks.run(suite=suite, repeat=repeat, warmup=warmup, backend=backend,
+                                    threads=threads, match=match,
+                                    callback=lambda name: status.update(f"运行 {name}"))
+    
+    if output:
+        benchmarks.save(report, output)
+    
+    rows = benchmarks.compare(previous, report, threshold) if previous else []
+    regressions = [row for row in rows if row["status"] == "regression"]
+    
+    if as_json:
+        click.echo(json.dumps(report, indent=2))
+    else:
+        host = report["host"]
+        console.print(f"[bold]PyBase {host['pybase']}[/bold]  Python {host['python']}  NumPy {host['numpy']}  "
+                      f"{host['machine']}  CPU {host['cpu_count']}  SIMD {host['simd'] or '-'}")
+        
+        table = Table(title="基准测试结果")
+        table.add_column("用例", style="cyan")
+        table.add_column("p50", justify="right")
+        table.add_column("p90", justify="right")
+        table.add_column("p99", justify="right")
+        table.add_column("GB/s", justify="right", style="green")
+        table.add_column("项/秒", justify="right", style="magenta")
+        for result in report["results"]:
+            seconds = result["seconds"]
+            gbps = result["gbps"]
+            table.add_row(escape(result["name"]), _format_seconds(seconds["p50"]), _format_seconds(seconds["p90"]),
+                          _format_seconds(seconds["p99"]), "-" if gbps is None else f"{gbps:.2f}",
+                          f"{result['items_per_second']:.3g}")
+        console.print(table)
+        
+        if previous:
+            if previous["host"] != host:
+                console.print("[yellow]注意：基线报告来自不同的主机或版本[/yellow]")
+            styles = {"regression": "red", "improvement": "green"}
+            diff = Table(title="与基线对比")
+            diff.add_column("用例", style="cyan")
+            diff.add_column("基线 p50", justify="right")
+            diff.add_column("当前 p50", justify="right")
+            diff.add_column("比值", justify="right")
+            diff.add_column("状态")
+            for row in rows:
+                ratio = "-" if row["ratio"] is None else f"{row['ratio']:.2f}"
+                status = row["status"]
+                if status in styles:
+                    status = f"[{styles[status]}]{status}[/{styles[status]}]"
+                diff.add_row(escape(row["name"]), _format_seconds(row["baseline"]),
+                             _format_seconds(row["current"]), ratio, status)
+            console.print(diff)
+        
+        if output:
+            console.print(f"报告已写入 {output}", style="blue")
+    
+    if regressions:
+        click.echo(f"{len(regressions)} 个用例出现性能回归", err=True)
+        ctx.exit(1)
+
 if __name__ == '__main__':
     cli() 
\ No newline at end of file
@@ -0,0 +1,284 @@
+"""
+PyBase NPY I/O Module
+
+Out-of-core transforms of arrays stored on disk in NumPy's .npy and .npz
+formats. .npy inputs are memory-mapped and results are written straight
+into a memory-mapped destination file, one chunk at a time, so files larger
+than RAM can be processed with a small resident set. .npz archives are
+streamed member by member.
+"""
+
+import mmap
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+import numpy as np
+
+from .transform import _resolve_output_dtype, _result_dtype, create_new_key, scale_array
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+# Default chunk size in bytes of output
+DEFAULT_CHUNK_BYTES = 64 << 20
+
+
+def transform_npy(src: PathLike, dst: PathLike, factor: float = 0.3,
+                  chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                  threads: Optional[int] = None,
+                  backend: str = "auto",
+                  output_dtype: Any = None) -> Path:
+    """
+    Scale a .npy file into a new .npy file without loading it.
+    
+    Both files are memory-mapped. The input is read sequentially with
+    read-ahead hints for the next chunk, each chunk is scaled by
+    scale_array() directly into the destination mapping, and finished
+    ranges of both files are flushed and released so the resident set stays
+    around a couple of chunks. The output keeps the input's shape and
+    memory order (C or Fortran).
+    
+    Args:
+        src: Path of the input .npy file (any numeric dtype)
+        dst: Path of the output .npy file (created or overwritten)
+        factor: Scaling factor (default: 0.3)
+        chunk_bytes: Amount of output processed per chunk, in bytes
+        threads: Passed to scale_array() for every chunk
+        backend: Passed to scale_array() for every chunk
+        output_dtype: Dtype of the output file, with the rules of
+            transform() (default: float64)
+            
+    Returns:
+        Path of the output file
+        
+    Raises:
+        ValueError: If src and dst are the same file, src is not a valid
+            .npy file, chunk_bytes is not positive, or output_dtype is not
+            supported
+        TypeError: If the input array is not numeric, or output_dtype is an
+            integer dtype and the input is not
+    """
+    if isinstance(chunk_bytes, bool) or not isinstance(chunk_bytes, int) or chunk_bytes < 1:
+        raise ValueError(f"chunk_bytes must be a positive integer, got {chunk_bytes!r}")
+    output_dtype = _resolve_output_dtype(output_dtype)
+    
+    src_path, dst_path = Path(src), Path(dst)
+    if dst_path.exists() and os.path.samefile(src_path, dst_path):
+        raise ValueError("src and dst must be different files")
+    
+    with open(src_path, "rb") as src_file:
+        shape, fortran_order, dtype = _read_header(src_file)
+        src_offset = src_file.tell()
+        
+        if dtype.hasobject or not np.issubdtype(dtype, np.number):
+            raise TypeError(f"Array must be numeric, got {dtype}")
+        out_dtype = _result_dtype(dtype, output_dtype)
+        
+        with open(dst_path, "wb+") as dst_file:
+            _write_header(dst_file, shape, fortran_order, out_dtype)
+            dst_offset = dst_file.tell()
+            
+            count = int(np.prod(shape, dtype=np.int64))
+            dst_file.truncate(dst_offset + count * out_dtype.itemsize)
+            if count == 0:
+                return dst_path
+            
+            src_map = mmap.mmap(src_file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                dst_map = mmap.mmap(dst_file.fileno(), 0, access=mmap.ACCESS_WRITE)
+                try:
+                    _scale_mapped(src_map, src_offset, dtype, dst_map, dst_offset, out_dtype,
+                                  output_dtype, count, factor, max(1, chunk_bytes // out_dtype.itemsize),
+                                  threads, backend)
+                    dst_map.flush()
+                finally:
+                    _close_mapping(dst_map)
+            finally:
+                _close_mapping(src_map)
+    
+    return dst_path
+
+
+def transform_npz(src: PathLike, dst: PathLike, factor: float = 0.3,
+                  threads: Optional[int] = None,
+                  backend: str = "auto",
+                  output_dtype: Any = None) -> Path:
+    """
+    Scale every array of a .npz archive into a new .npz archive.
+    
+    The streaming equivalent of loading the archive, calling transform()
+    and saving the result: members are read one at a time, and the next
+    member is read and decompressed on a background thread while the
+    current one is scaled and written, so peak memory stays around two
+    members instead of the whole archive. Output members are named with
+    create_new_key() ("x" becomes "x_new"), keep the input's order, shape
+    and memory order, and use the same compression as the input member.
+    
+    Args:
+        src: Path of the input .npz archive (numeric arrays only)
+        dst: Path of the output .npz archive (created or overwritten)
+        factor: Scaling factor (default: 0.3)
+        threads: Passed to scale_array() for every member
+        backend: Passed to scale_array() for every member
+        output_dtype: Dtype of the output members, with the rules of
+            transform() (default: float64)
+            
+    Returns:
+        Path of the output archive
+        
+    Raises:
+        ValueError: If src and dst are the same file, src contains a
+            member that is not a .npy array, or output_dtype is not
+            supported
+        TypeError: If an array is not numeric, or output_dtype is an
+            integer dtype and an array is not
+    """
+    output_dtype = _resolve_output_dtype(output_dtype)
+    src_path, dst_path = Path(src), Path(dst)
+    if dst_path.exists() and os.path.samefile(src_path, dst_path):
+        raise ValueError("src and dst must be different files")
+    
+    with zipfile.ZipFile(src_path, "r") as src_zip:
+        members = src_zip.infolist()
+        for member in members:
+            if not member.filename.endswith(".npy"):
+                raise ValueError(f"Archive member '{member.filename}' is not a .npy array")
+        
+        with zipfile.ZipFile(dst_path, "w", allowZip64=True) as dst_zip, \
+                ThreadPoolExecutor(max_workers=1) as reader:
+            pending = reader.submit(_read_member, src_zip, members[0]) if members else None
+            for i, member in enumerate(members):
+                arr = pending.result()
+                # Decompress the next member while this one is scaled
+                pending = reader.submit(_read_member, src_zip, members[i + 1]) if i + 1 < len(members) else None
+                
+                key = member.filename[:-len(".npy")]
+                if not np.issubdtype(arr.dtype, np.number):
+                    raise TypeError(f"Array for key '{key}' must be numeric, got {arr.dtype}")
+                
+                # Freshly read arrays of the result dtype are scaled in place
+                inplace = arr.dtype == _result_dtype(arr.dtype, output_dtype)
+                result = scale_array(arr, factor, inplace=inplace, threads=threads, backend=backend,
+                                     output_dtype=output_dtype)
+                del arr
+                
+                info = zipfile.ZipInfo(create_new_key(key) + ".npy", date_time=member.date_time)
+                info.compress_type = member.compress_type
+                with dst_zip.open(info, "w", force_zip64=True) as f:
+                    np.lib.format.write_array(f, result, allow_pickle=False)
+                del result
+    
+    return dst_path
+
+
+def _read_member(archive: zipfile.ZipFile, member: zipfile.ZipInfo) -> np.ndarray:
+    """Read one .npy member of an open archive into memory."""
+    with archive.open(member) as f:
+        return np.lib.format.read_array(f, allow_pickle=False)
+
+
+def _scale_mapped(src_map: mmap.mmap, src_offset: int, dtype: np.dtype,
+                  dst_map: mmap.mmap, dst_offset: int, out_dtype: np.dtype,
+                  output_dtype: Any, count: int, factor: float, chunk: int,
+                  threads: Optional[int], backend: str) -> None:
+    """
+    Scale count elements from src_map into dst_map, chunk elements at a time.
+    
+    Both arrays are stored in the same memory order, so they are processed
+    as flat 1-D buffers. dst_map holds out_dtype elements, the result dtype
+    of the resolved output_dtype. The arrays created here must not outlive
+    the call, since the mappings cannot be closed while they are referenced.
+    """
+    flat_in = np.frombuffer(src_map, dtype=dtype, count=count, offset=src_offset)
+    flat_out = np.frombuffer(dst_map, dtype=out_dtype, count=count, offset=dst_offset)
+    itemsize = dtype.itemsize
+    out_itemsize = out_dtype.itemsize
+    
+    _advise(src_map, "MADV_SEQUENTIAL", src_offset, src_offset + count * itemsize)
+    
+    for start in range(0, count, chunk):
+        stop = min(count, start + chunk)
+        
+        # Ask the kernel to start reading the next chunk while this one runs
+        _advise(src_map, "MADV_WILLNEED", src_offset + stop * itemsize,
+                src_offset + min(count, stop + chunk) * itemsize)
+        
+        scale_array(flat_in[start:stop], factor, out=flat_out[start:stop],
+                    threads=threads, backend=backend, output_dtype=output_dtype)
+        
+        # Write back and release the finished range of both mappings
+        out_begin, out_end = _page_range(dst_offset + start * out_itemsize,
+                                         dst_offset + stop * out_itemsize)
+        if out_end > out_begin:
+            dst_map.flush(out_begin, out_end - out_begin)
+            _advise(dst_map, "MADV_DONTNEED", out_begin, out_end)
+        _advise(src_map, "MADV_DONTNEED", *_page_range(src_offset + start * itemsize,
+                                                       src_offset + stop * itemsize))
+
+
+def _close_mapping(mapping: mmap.mmap) -> None:
+    """Close a mapping unless arrays still reference it."""
+    try:
+        mapping.close()
+    except BufferError:
+        # Views are kept alive by the traceback of an error being raised;
+        # the mapping is closed when they are collected
+        pass
+
+
+def _page_range(begin: int, end: int) -> Tuple[int, int]:
+    """Align begin down to a page boundary, as required by msync/madvise."""
+    page = mmap.PAGESIZE
+    return begin - begin % page, end
+
+
+def _advise(mapping: mmap.mmap, advice_name: str, begin: int, end: int) -> None:
+    """Give the kernel a paging hint for [begin, end) if the platform supports it."""
+    advice = getattr(mmap, advice_name, None)
+    if advice is None or not hasattr(mapping, "madvise"):
+        return
+    
+    begin -= begin % mmap.PAGESIZE
+    end = min(end, len(mapping))
+    if end <= begin:
+        return
+    
+    try:
+        mapping.madvise(advice, begin, end - begin)
+    except OSError:
+        # Hints are best effort
+        pass
+
+
+def _read_header(fp) -> Tuple[tuple, bool, np.dtype]:
+    """
+    Read the header of an open .npy file.
+    
+    Returns:
+        (shape, fortran_order, dtype), with fp positioned at the array data
+        
+    Raises:
+        ValueError: If the file is not a supported .npy file
+    """
+    version = np.lib.format.read_magic(fp)
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(fp)
+    if version == (2, 0):
+        return np.lib.format.read_array_header_2_0(fp)
+    raise ValueError(f"Unsupported .npy format version {version}")
+
+
+def _write_header(fp, shape: tuple, fortran_order: bool, dtype: np.dtype) -> None:
+    """Write a .npy header, using format 2.0 only if 1.0 is too small."""
+    header = {
+        "descr": np.lib.format.dtype_to_descr(dtype),
+        "fortran_order": fortran_order,
+        "shape": tuple(shape),
+    }
+    try:
+        np.lib.format.write_array_header_1_0(fp, header)
+    except ValueError:
+        fp.seek(0)
+        np.lib.format.write_array_header_2_0(fp, header)
@@ -7,68 +7,1257 @@
 #include <vector>
 #include <algorithm>
 #include <stdexcept>
+#include <cstdint>
+#include <atomic>
+#include <cmath>
+#include <cstdlib>
+#include <cstring>
+#include <limits>
+#include <memory>
+#include <system_error>
+#include <thread>
+#include <type_traits>
+
+#if (defined(__x86_64__) || defined(__i386__)) && (defined(__GNUC__) || defined(__clang__))
+#define PYBASE_X86_DISPATCH 1
+#include <immintrin.h>
+#endif
 
 namespace py = pybind11;
 
 namespace pybase {
 
-std::map<std::string, py::array_t<double>> transform(
-    const std::map<std::string, py::array_t<double>>& input_dict
-) {
-    std::map<std::string, py::array_t<double>> output_dict;
+namespace {
+
+/**
+ * IEEE 754 binary16 conversions. The narrowing conversion rounds a double
+ * to nearest-even directly, like NumPy's, so there is no double rounding
+ * through float.
+ */
+double half_to_double(uint16_t h) {
+    uint64_t sign = static_cast<uint64_t>(h & 0x8000) << 48;
+    uint32_t exponent = (h >> 10) & 0x1f;
+    uint64_t mantissa = h & 0x3ff;
+    uint64_t bits;
+    if (exponent == 0) {
+        // Zero or subnormal: mantissa * 2^-24 is exact in double
+        double value = static_cast<double>(mantissa) * 5.9604644775390625e-08;
+        return sign ? -value : value;
+    }
+    if (exponent == 0x1f) {
+        bits = sign | 0x7ff0000000000000ULL | (mantissa << 42);
+    } else {
+        bits = sign | (static_cast<uint64_t>(exponent + 1008) << 52) | (mantissa << 42);
+    }
+    double value;
+    std::memcpy(&value, &bits, sizeof(value));
+    return value;
+}
+
+uint16_t double_to_half(double value) {
+    uint64_t bits;
+    std::memcpy(&bits, &value, sizeof(bits));
+    uint16_t sign = static_cast<uint16_t>((bits >> 48) & 0x8000);
+    int exponent = static_cast<int>((bits >> 52) & 0x7ff);
+    uint64_t mantissa = bits & 0xfffffffffffffULL;
     
-    for (const auto& pair : input_dict) {
-        const std::string& key = pair.first;
-        const py::array_t<double>& arr = pair.second;
+    if (exponent == 0x7ff) {
+        return sign | (mantissa ? 0x7e00 : 0x7c00);
+    }
+    exponent -= 1023;
+    if (exponent >= 16) {
+        return sign | 0x7c00;
+    }
+    if (exponent < -25) {
+        return sign;
+    }
+    
+    // Keep the top bits of the significand, rounding the dropped ones to
+    // nearest-even; a carry correctly bumps the exponent (or gives inf)
+    uint64_t significand;
+    int shift;
+    uint16_t base;
+    if (exponent < -14) {
+        significand = mantissa | (1ULL << 52);
+        shift = 28 - exponent;
+        base = 0;
+    } else {
+        significand = mantissa;
+        shift = 42;
+        base = static_cast<uint16_t>((exponent + 15) << 10);
+    }
+    uint64_t kept = significand >> shift;
+    uint64_t rest = significand & ((1ULL << shift) - 1);
+    uint64_t half = 1ULL << (shift - 1);
+    if (rest > half || (rest == half && (kept & 1))) {
+        ++kept;
+    }
+    return sign | static_cast<uint16_t>(base + kept);
+}
+
+/**
+ * float16 element as stored by NumPy.
+ */
+struct Half {
+    uint16_t bits;
+    
+    explicit operator double() const {
+        return half_to_double(bits);
+    }
+};
+
+/**
+ * Kernel signature used after dtype dispatch: reads n elements of the input
+ * type from a contiguous buffer and writes n scaled doubles.
+ */
+using ScaleKernel = void (*)(const void* input, double* output, size_t n, double factor);
+
+template <typename T>
+void scale_kernel(const void* input, double* output, size_t n, double factor) {
+    const T* input_ptr = static_cast<const T*>(input);
+    for (size_t i = 0; i < n; ++i) {
+        output[i] = static_cast<double>(input_ptr[i]) * factor;
+    }
+}
+
+/**
+ * Kernel signature for one strided run: input and output advance by the
+ * given byte strides, which may be zero or negative.
+ */
+using StridedKernel = void (*)(const char* input, py::ssize_t input_stride,
+                               char* output, py::ssize_t output_stride,
+                               size_t n, double factor);
+
+template <typename T>
+void scale_strided_kernel(const char* input, py::ssize_t input_stride,
+                          char* output, py::ssize_t output_stride,
+                          size_t n, double factor) {
+    for (size_t i = 0; i < n; ++i) {
+        *reinterpret_cast<double*>(output) = static_cast<double>(*reinterpret_cast<const T*>(input)) * factor;
+        input += input_stride;
+        output += output_stride;
+    }
+}
+
+/**
+ * Instruction sets with explicit float64/float32 kernels, ordered from
+ * weakest to strongest. "baseline" is the portable loop above.
+ */
+enum class SimdLevel : int { Baseline = 0, SSE2 = 1, AVX2 = 2, AVX512 = 3 };
+
+const char* const kSimdNames[] = {"baseline", "sse2", "avx2", "avx512"};
+
+#ifdef PYBASE_X86_DISPATCH
+
+__attribute__((target("sse2")))
+void scale_double_sse2(const void* input, double* output, size_t n, double factor) {
+    const double* in = static_cast<const double*>(input);
+    const __m128d f = _mm_set1_pd(factor);
+    size_t i = 0;
+    for (; i + 4 <= n; i += 4) {
+        _mm_storeu_pd(output + i, _mm_mul_pd(_mm_loadu_pd(in + i), f));
+        _mm_storeu_pd(output + i + 2, _mm_mul_pd(_mm_loadu_pd(in + i + 2), f));
+    }
+    for (; i < n; ++i) {
+        output[i] = in[i] * factor;
+    }
+}
+
+__attribute__((target("sse2")))
+void scale_float_sse2(const void* input, double* output, size_t n, double factor) {
+    const float* in = static_cast<const float*>(input);
+    const __m128d f = _mm_set1_pd(factor);
+    size_t i = 0;
+    for (; i + 4 <= n; i += 4) {
+        __m128 v = _mm_loadu_ps(in + i);
+        _mm_storeu_pd(output + i, _mm_mul_pd(_mm_cvtps_pd(v), f));
+        _mm_storeu_pd(output + i + 2, _mm_mul_pd(_mm_cvtps_pd(_mm_movehl_ps(v, v)), f));
+    }
+    for (; i < n; ++i) {
+        output[i] = static_cast<double>(in[i]) * factor;
+    }
+}
+
+__attribute__((target("avx2")))
+void scale_double_avx2(const void* input, double* output, size_t n, double factor) {
+    const double* in = static_cast<const double*>(input);
+    const __m256d f = _mm256_set1_pd(factor);
+    size_t i = 0;
+    for (; i + 8 <= n; i += 8) {
+        _mm256_storeu_pd(output + i, _mm256_mul_pd(_mm256_loadu_pd(in + i), f));
+        _mm256_storeu_pd(output + i + 4, _mm256_mul_pd(_mm256_loadu_pd(in + i + 4), f));
+    }
+    for (; i < n; ++i) {
+        output[i] = in[i] * factor;
+    }
+}
+
+__attribute__((target("avx2")))
+void scale_float_avx2(const void* input, double* output, size_t n, double factor) {
+    const float* in = static_cast<const float*>(input);
+    const __m256d f = _mm256_set1_pd(factor);
+    size_t i = 0;
+    for (; i + 8 <= n; i += 8) {
+        _mm256_storeu_pd(output + i, _mm256_mul_pd(_mm256_cvtps_pd(_mm_loadu_ps(in + i)), f));
+        _mm256_storeu_pd(output + i + 4, _mm256_mul_pd(_mm256_cvtps_pd(_mm_loadu_ps(in + i + 4)), f));
+    }
+    for (; i < n; ++i) {
+        output[i] = static_cast<double>(in[i]) * factor;
+    }
+}
+
+__attribute__((target("avx512f")))
+void scale_double_avx512(const void* input, double* output, size_t n, double factor) {
+    const double* in = static_cast<const double*>(input);
+    const __m512d f = _mm512_set1_pd(factor);
+    size_t i = 0;
+    for (; i + 16 <= n; i += 16) {
+        _mm512_storeu_pd(output + i, _mm512_mul_pd(_mm512_loadu_pd(in + i), f));
+        _mm512_storeu_pd(output + i + 8, _mm512_mul_pd(_mm512_loadu_pd(in + i + 8), f));
+    }
+    for (; i < n; ++i) {
+        output[i] = in[i] * factor;
+    }
+}
+
+// The maskz conversion is used because GCC warns about the undefined
+// passthrough operand in the unmasked _mm512_cvtps_pd
+__attribute__((target("avx512f")))
+void scale_float_avx512(const void* input, double* output, size_t n, double factor) {
+    const float* in = static_cast<const float*>(input);
+    const __m512d f = _mm512_set1_pd(factor);
+    size_t i = 0;
+    for (; i + 16 <= n; i += 16) {
+        _mm512_storeu_pd(output + i, _mm512_mul_pd(_mm512_maskz_cvtps_pd(0xFF, _mm256_loadu_ps(in + i)), f));
+        _mm512_storeu_pd(output + i + 8, _mm512_mul_pd(_mm512_maskz_cvtps_pd(0xFF, _mm256_loadu_ps(in + i + 8)), f));
+    }
+    for (; i < n; ++i) {
+        output[i] = static_cast<double>(in[i]) * factor;
+    }
+}
+
+#endif // PYBASE_X86_DISPATCH
+
+/**
+ * Strongest instruction set the running CPU (and OS) supports.
+ */
+SimdLevel detect_simd_level() {
+#ifdef PYBASE_X86_DISPATCH
+    __builtin_cpu_init();
+    if (__builtin_cpu_supports("avx512f")) return SimdLevel::AVX512;
+    if (__builtin_cpu_supports("avx2")) return SimdLevel::AVX2;
+    if (__builtin_cpu_supports("sse2")) return SimdLevel::SSE2;
+#endif
+    return SimdLevel::Baseline;
+}
+
+// Selected once at import time; set_simd_backend may lower it
+std::atomic<int> g_simd_level{static_cast<int>(detect_simd_level())};
+
+ScaleKernel double_kernel() {
+    switch (static_cast<SimdLevel>(g_simd_level.load())) {
+#ifdef PYBASE_X86_DISPATCH
+        case SimdLevel::AVX512: return &scale_double_avx512;
+        case SimdLevel::AVX2: return &scale_double_avx2;
+        case SimdLevel::SSE2: return &scale_double_sse2;
+#endif
+        default: return &scale_kernel<double>;
+    }
+}
+
+ScaleKernel float_kernel() {
+    switch (static_cast<SimdLevel>(g_simd_level.load())) {
+#ifdef PYBASE_X86_DISPATCH
+        case SimdLevel::AVX512: return &scale_float_avx512;
+        case SimdLevel::AVX2: return &scale_float_avx2;
+        case SimdLevel::SSE2: return &scale_float_sse2;
+#endif
+        default: return &scale_kernel<float>;
+    }
+}
+
+/**
+ * Contiguous and strided kernels for one input dtype.
+ */
+struct ScaleKernels {
+    ScaleKernel contiguous;
+    StridedKernel strided;
+};
+
+/**
+ * Select the kernels matching the array dtype, or nullptr kernels if the
+ * dtype has no fused cast and must be converted to float64 first.
+ */
+ScaleKernels select_kernels(const py::array& arr) {
+    // Dispatch on kind and size instead of trying each dtype in turn; only
+    // native byte order can be read directly
+    py::dtype dt = arr.dtype();
+    char byteorder = dt.byteorder();
+    if (byteorder != '=' && byteorder != '|') {
+        return {nullptr, nullptr};
+    }
+    switch (dt.kind()) {
+        case 'f':
+            if (dt.itemsize() == 8) return {double_kernel(), &scale_strided_kernel<double>};
+            if (dt.itemsize() == 4) return {float_kernel(), &scale_strided_kernel<float>};
+            if (dt.itemsize() == 2) return {&scale_kernel<Half>, &scale_strided_kernel<Half>};
+            break;
+        case 'i':
+            switch (dt.itemsize()) {
+                case 8: return {&scale_kernel<int64_t>, &scale_strided_kernel<int64_t>};
+                case 4: return {&scale_kernel<int32_t>, &scale_strided_kernel<int32_t>};
+                case 2: return {&scale_kernel<int16_t>, &scale_strided_kernel<int16_t>};
+                case 1: return {&scale_kernel<int8_t>, &scale_strided_kernel<int8_t>};
+            }
+            break;
+        case 'u':
+            switch (dt.itemsize()) {
+                case 8: return {&scale_kernel<uint64_t>, &scale_strided_kernel<uint64_t>};
+                case 4: return {&scale_kernel<uint32_t>, &scale_strided_kernel<uint32_t>};
+                case 2: return {&scale_kernel<uint16_t>, &scale_strided_kernel<uint16_t>};
+                case 1: return {&scale_kernel<uint8_t>, &scale_strided_kernel<uint8_t>};
+            }
+            break;
+    }
+    return {nullptr, nullptr};
+}
+
+/**
+ * Kernel signature for writing n computed doubles to an output of another
+ * dtype, advancing by output_stride bytes.
+ */
+using StoreKernel = void (*)(const double* values, char* output,
+                             py::ssize_t output_stride, size_t n);
+
+template <typename T>
+T narrow(double value) {
+    if constexpr (std::is_same_v<T, Half>) {
+        return Half{double_to_half(value)};
+    } else if constexpr (std::is_floating_point_v<T>) {
+        return static_cast<T>(value);
+    } else {
+        // Round half to even like np.rint, then saturate; NaN becomes 0
+        if (std::isnan(value)) {
+            return 0;
+        }
+        value = std::nearbyint(value);
+        if (value >= static_cast<double>(std::numeric_limits<T>::max())) {
+            return std::numeric_limits<T>::max();
+        }
+        if (value <= static_cast<double>(std::numeric_limits<T>::min())) {
+            return std::numeric_limits<T>::min();
+        }
+        return static_cast<T>(value);
+    }
+}
+
+template <typename T>
+void store_kernel(const double* values, char* output, py::ssize_t output_stride, size_t n) {
+    if (output_stride == static_cast<py::ssize_t>(sizeof(T))) {
+        T* out = reinterpret_cast<T*>(output);
+        for (size_t i = 0; i < n; ++i) {
+            out[i] = narrow<T>(values[i]);
+        }
+        return;
+    }
+    for (size_t i = 0; i < n; ++i) {
+        *reinterpret_cast<T*>(output) = narrow<T>(values[i]);
+        output += output_stride;
+    }
+}
+
+/**
+ * Whether results can be written as dtype: native-order float16/32/64 or
+ * integers of 1 to 8 bytes.
+ */
+bool is_output_dtype(const py::dtype& dt) {
+    char byteorder = dt.byteorder();
+    if (byteorder != '=' && byteorder != '|') {
+        return false;
+    }
+    switch (dt.kind()) {
+        case 'f':
+            return dt.itemsize() == 2 || dt.itemsize() == 4 || dt.itemsize() == 8;
+        case 'i':
+        case 'u':
+            return dt.itemsize() == 1 || dt.itemsize() == 2 || dt.itemsize() == 4 || dt.itemsize() == 8;
+    }
+    return false;
+}
+
+/**
+ * Store kernel for an output dtype accepted by is_output_dtype, or nullptr
+ * for float64, which the scale kernels write directly.
+ */
+StoreKernel select_store(const py::dtype& dt) {
+    switch (dt.kind()) {
+        case 'f':
+            if (dt.itemsize() == 4) return &store_kernel<float>;
+            if (dt.itemsize() == 2) return &store_kernel<Half>;
+            return nullptr;
+        case 'i':
+            switch (dt.itemsize()) {
+                case 8: return &store_kernel<int64_t>;
+                case 4: return &store_kernel<int32_t>;
+                case 2: return &store_kernel<int16_t>;
+                default: return &store_kernel<int8_t>;
+            }
+        default:
+            switch (dt.itemsize()) {
+                case 8: return &store_kernel<uint64_t>;
+                case 4: return &store_kernel<uint32_t>;
+                case 2: return &store_kernel<uint16_t>;
+                default: return &store_kernel<uint8_t>;
+            }
+    }
+}
+
+/**
+ * Output dtype for an input dtype under an output_dtype specification:
+ * None gives float64, "same" keeps every dtype that can be written as-is,
+ * "float" keeps floating dtypes only, and anything else is converted with
+ * numpy.dtype() and used for every input. Inputs that cannot be kept give
+ * float64.
+ */
+py::dtype resolve_output_dtype(const py::dtype& input, const py::object& spec) {
+    if (spec.is_none()) {
+        return py::dtype::of<double>();
+    }
+    if (py::isinstance<py::str>(spec)) {
+        std::string rule = spec.cast<std::string>();
+        if (rule == "same" || rule == "float") {
+            py::dtype native = input.attr("newbyteorder")("=");
+            bool keep = is_output_dtype(native) && (rule == "same" || native.kind() == 'f');
+            return keep ? native : py::dtype::of<double>();
+        }
+    }
+    
+    py::dtype dt = py::dtype::from_args(spec);
+    if (!is_output_dtype(dt)) {
+        throw py::value_error("Unsupported output dtype " + std::string(py::str(dt)));
+    }
+    if ((dt.kind() == 'i' || dt.kind() == 'u') && input.kind() != 'i' && input.kind() != 'u') {
+        throw py::type_error("Integer output dtype " + std::string(py::str(dt)) +
+                             " requires integer input, got " + std::string(py::str(input)));
+    }
+    return dt;
+}
+
+/**
+ * Joint iteration order for an input/output pair, outermost dimension
+ * first. Unit dimensions are dropped, dimensions are ordered by input
+ * stride, and dimensions that are contiguous in both arrays are merged, so
+ * any pair of contiguous arrays (C or Fortran) becomes a single 1-D run.
+ */
+struct StridedLayout {
+    std::vector<py::ssize_t> shape;
+    std::vector<py::ssize_t> input_strides;
+    std::vector<py::ssize_t> output_strides;
+};
+
+StridedLayout make_layout(const py::array& input, const py::array& output) {
+    std::vector<py::ssize_t> axes;
+    for (py::ssize_t d = 0; d < input.ndim(); ++d) {
+        if (input.shape(d) != 1) {
+            axes.push_back(d);
+        }
+    }
+    std::stable_sort(axes.begin(), axes.end(), [&input](py::ssize_t a, py::ssize_t b) {
+        return std::abs(input.strides(a)) > std::abs(input.strides(b));
+    });
+    
+    StridedLayout layout;
+    for (py::ssize_t d : axes) {
+        size_t last = layout.shape.size();
+        if (last > 0 &&
+            layout.input_strides[last - 1] == input.strides(d) * input.shape(d) &&
+            layout.output_strides[last - 1] == output.strides(d) * input.shape(d)) {
+            layout.shape[last - 1] *= input.shape(d);
+            layout.input_strides[last - 1] = input.strides(d);
+            layout.output_strides[last - 1] = output.strides(d);
+            continue;
+        }
+        layout.shape.push_back(input.shape(d));
+        layout.input_strides.push_back(input.strides(d));
+        layout.output_strides.push_back(output.strides(d));
+    }
+    
+    if (layout.shape.empty()) {
+        layout.shape.push_back(1);
+        layout.input_strides.push_back(input.itemsize());
+        layout.output_strides.push_back(output.itemsize());
+    }
+    return layout;
+}
+
+/**
+ * One validated pipeline step.
+ */
+struct PipelineStep {
+    PipelineOp op;
+    double a;
+    double b;
+};
+
+using PipelineSteps = std::vector<PipelineStep>;
+
+/**
+ * Elements per pipeline block: 16 KiB of doubles, so a block stays in L1
+ * cache while every step runs over it.
+ */
+constexpr size_t kPipelineBlock = 2048;
+
+void apply_steps(double* data, size_t n, const PipelineSteps& steps) {
+    for (const auto& step : steps) {
+        switch (step.op) {
+            case PipelineOp::Scale:
+                for (size_t i = 0; i < n; ++i) data[i] *= step.a;
+                break;
+            case PipelineOp::Offset:
+                for (size_t i = 0; i < n; ++i) data[i] += step.a;
+                break;
+            case PipelineOp::Clip:
+                // Same argument order as np.clip, so NaN propagates
+                for (size_t i = 0; i < n; ++i) data[i] = std::min(std::max(data[i], step.a), step.b);
+                break;
+            case PipelineOp::Abs:
+                for (size_t i = 0; i < n; ++i) data[i] = std::fabs(data[i]);
+                break;
+            case PipelineOp::Log:
+                for (size_t i = 0; i < n; ++i) data[i] = std::log(data[i]);
+                break;
+        }
+    }
+}
+
+/**
+ * One unit of native work: scale elements [begin, begin + size) of an
+ * array, counted in layout iteration order, and apply the pipeline steps
+ * if there are any. A null layout means input and output share a
+ * contiguous layout and are scaled as one flat run. Outputs other than
+ * float64 are written through a store kernel. Tasks hold raw pointers
+ * only, so they can run without the GIL.
+ */
+struct ScaleTask {
+    ScaleKernels kernels;
+    const char* input;
+    size_t itemsize;
+    char* output;
+    size_t output_itemsize;
+    StoreKernel store;
+    std::shared_ptr<const StridedLayout> layout;
+    size_t begin;
+    size_t size;
+    double factor;
+    std::shared_ptr<const PipelineSteps> steps;
+    
+    void run() const {
+        if (size == 0) {
+            return;
+        }
+        if (!layout) {
+            process(input + begin * itemsize, static_cast<py::ssize_t>(itemsize),
+                    output + begin * output_itemsize, static_cast<py::ssize_t>(output_itemsize),
+                    size, true);
+            return;
+        }
+        const StridedLayout& l = *layout;
+        size_t ndim = l.shape.size();
+        size_t inner = static_cast<size_t>(l.shape[ndim - 1]);
+        py::ssize_t input_stride = l.input_strides[ndim - 1];
+        py::ssize_t output_stride = l.output_strides[ndim - 1];
+        bool contiguous = input_stride == static_cast<py::ssize_t>(itemsize) &&
+                          output_stride == static_cast<py::ssize_t>(output_itemsize);
+        
+        // Position of `begin` as an outer multi-index plus inner offset
+        std::vector<py::ssize_t> index(ndim, 0);
+        size_t column = begin % inner;
+        size_t row = begin / inner;
+        for (size_t d = ndim - 1; d-- > 0;) {
+            index[d] = static_cast<py::ssize_t>(row % l.shape[d]);
+            row /= l.shape[d];
+        }
         
-        // Create new key by appending "_new"
-        std::string new_key = create_new_key(key);
+        size_t remaining = size;
+        while (remaining > 0) {
+            const char* in = input + static_cast<py::ssize_t>(column) * input_stride;
+            char* out = output + static_cast<py::ssize_t>(column) * output_stride;
+            for (size_t d = 0; d + 1 < ndim; ++d) {
+                in += index[d] * l.input_strides[d];
+                out += index[d] * l.output_strides[d];
+            }
+            
+            size_t n = std::min(remaining, inner - column);
+            process(in, input_stride, out, output_stride, n, contiguous);
+            remaining -= n;
+            column = 0;
+            
+            for (size_t d = ndim - 1; d-- > 0;) {
+                if (++index[d] < l.shape[d]) {
+                    break;
+                }
+                index[d] = 0;
+            }
+        }
+    }
+    
+    /**
+     * Scale one run of n elements. With pipeline steps the run is cut into
+     * blocks that are scaled, transformed by every step while in L1 cache,
+     * and written once; strided and narrower outputs go through a scratch
+     * block of doubles.
+     */
+    void process(const char* in, py::ssize_t input_stride, char* out,
+                 py::ssize_t output_stride, size_t n, bool contiguous) const {
+        if (!steps && !store) {
+            if (contiguous) {
+                kernels.contiguous(in, reinterpret_cast<double*>(out), n, factor);
+            } else {
+                kernels.strided(in, input_stride, out, output_stride, n, factor);
+            }
+            return;
+        }
+        
+        double scratch[kPipelineBlock];
+        for (size_t done = 0; done < n; done += kPipelineBlock) {
+            size_t m = std::min(kPipelineBlock, n - done);
+            const char* block_in = in + static_cast<py::ssize_t>(done) * input_stride;
+            char* block_out = out + static_cast<py::ssize_t>(done) * output_stride;
+            if (contiguous && !store) {
+                double* block = reinterpret_cast<double*>(block_out);
+                kernels.contiguous(block_in, block, m, factor);
+                apply_steps(block, m, *steps);
+                continue;
+            }
+            if (input_stride == static_cast<py::ssize_t>(itemsize)) {
+                kernels.contiguous(block_in, scratch, m, factor);
+            } else {
+                kernels.strided(block_in, input_stride, reinterpret_cast<char*>(scratch),
+                                sizeof(double), m, factor);
+            }
+            if (steps) {
+                apply_steps(scratch, m, *steps);
+            }
+            if (store) {
+                store(scratch, block_out, output_stride, m);
+                continue;
+            }
+            for (size_t i = 0; i < m; ++i) {
+                *reinterpret_cast<double*>(block_out + static_cast<py::ssize_t>(i) * output_stride) = scratch[i];
+            }
+        }
+    }
+};
+
+/**
+ * Run tasks on up to `threads` native threads from a shared work queue.
+ * 
+ * Calls whose total size gives fewer than kParallelThreshold elements per
+ * thread stay serial, so small calls never pay for thread startup.
+ * Otherwise tasks larger than an even share are split into blocks (rounded
+ * to 64 elements, whole cache lines of output for any output dtype, to
+ * avoid false sharing) and the queue is
+ * ordered largest first, so a big array never starts last and becomes the
+ * tail of the schedule.
+ */
+void run_tasks(const std::vector<ScaleTask>& tasks, size_t threads) {
+    size_t total_size = 0;
+    for (const auto& task : tasks) {
+        total_size += task.size;
+    }
+    
+    size_t workers = std::min(threads, total_size / kParallelThreshold);
+    if (workers <= 1) {
+        for (const auto& task : tasks) {
+            task.run();
+        }
+        return;
+    }
+    
+    size_t chunk = (total_size + workers - 1) / workers;
+    chunk = (chunk + 63) & ~static_cast<size_t>(63);
+    
+    std::vector<ScaleTask> queue;
+    for (const auto& task : tasks) {
+        for (size_t begin = 0; begin < task.size; begin += chunk) {
+            ScaleTask block = task;
+            block.begin = task.begin + begin;
+            block.size = std::min(chunk, task.size - begin);
+            queue.push_back(block);
+        }
+    }
+    std::stable_sort(queue.begin(), queue.end(), [](const ScaleTask& a, const ScaleTask& b) {
+        return a.size > b.size;
+    });
+    workers = std::min(workers, queue.size());
+    
+    std::atomic<size_t> next{0};
+    auto worker = [&queue, &next]() {
+        for (size_t i = next++; i < queue.size(); i = next++) {
+            queue[i].run();
+        }
+    };
+    
+    std::vector<std::thread> pool;
+    pool.reserve(workers - 1);
+    for (size_t i = 1; i < workers; ++i) {
+        try {
+            pool.emplace_back(worker);
+        } catch (const std::system_error&) {
+            // Could not start another thread: the running ones drain the queue
+            break;
+        }
+    }
+    worker();
+    
+    for (auto& thread : pool) {
+        thread.join();
+    }
+}
+
+/**
+ * Strides of a contiguous array of itemsize-byte elements shaped like
+ * input whose memory order follows the input's strides (like numpy's
+ * order="K").
+ */
+std::vector<py::ssize_t> output_strides(const py::array& input, py::ssize_t itemsize) {
+    py::ssize_t ndim = input.ndim();
+    std::vector<py::ssize_t> axes(ndim);
+    for (py::ssize_t d = 0; d < ndim; ++d) {
+        axes[d] = d;
+    }
+    std::stable_sort(axes.begin(), axes.end(), [&input](py::ssize_t a, py::ssize_t b) {
+        return std::abs(input.strides(a)) > std::abs(input.strides(b));
+    });
+    
+    std::vector<py::ssize_t> strides(ndim);
+    py::ssize_t stride = itemsize;
+    for (py::ssize_t i = ndim; i-- > 0;) {
+        strides[axes[i]] = stride;
+        stride *= input.shape(axes[i]);
+    }
+    return strides;
+}
+
+/**
+ * Return out as a destination of the given dtype for input, or allocate a
+ * new one with output_strides(), so C- and Fortran-ordered inputs both get
+ * a matching contiguous output.
+ */
+py::array prepare_output(const py::object& out, const py::array& input, const py::dtype& dtype) {
+    if (out.is_none()) {
+        std::vector<py::ssize_t> shape(input.shape(), input.shape() + input.ndim());
+        return py::array(dtype, shape, output_strides(input, dtype.itemsize()));
+    }
+    if (!py::isinstance<py::array>(out) || !py::reinterpret_borrow<py::array>(out).dtype().equal(dtype)) {
+        throw py::type_error("out must be a " + std::string(py::str(dtype)) + " numpy array");
+    }
+    py::array result = py::reinterpret_borrow<py::array>(out);
+    if (result.ndim() != input.ndim() ||
+        !std::equal(input.shape(), input.shape() + input.ndim(), result.shape())) {
+        throw py::value_error("out must have the same shape as the input array");
+    }
+    if (!result.writeable()) {
+        throw py::value_error("out must be writeable");
+    }
+    return result;
+}
+
+/**
+ * Input/output arrays of one scale operation, kept alive while its task
+ * runs with the GIL released.
+ */
+struct PreparedScale {
+    py::array input;
+    py::array result;
+    ScaleTask task;
+};
+
+/**
+ * Validate arr, pick kernels and a destination of dtype (see
+ * resolve_output_dtype), and describe the work as a ScaleTask. Views are
+ * read through their strides without copying. Must be called with the GIL
+ * held.
+ */
+PreparedScale prepare_scale(const py::array& arr, double factor, const py::object& out,
+                            const py::dtype& dtype) {
+    if (arr.ndim() == 0) {
+        throw std::runtime_error("Zero-dimensional arrays are not supported");
+    }
+    
+    // Pick fused-cast kernels; only unsupported dtypes pay for a conversion copy
+    ScaleKernels kernels = select_kernels(arr);
+    py::array input = arr;
+    if (kernels.contiguous == nullptr) {
+        input = py::array_t<double, py::array::c_style | py::array::forcecast>::ensure(arr);
+        if (!input) {
+            throw py::error_already_set();
+        }
+        kernels = {double_kernel(), &scale_strided_kernel<double>};
+    }
+    
+    // Write into the caller's buffer or a new array with the same shape
+    py::array result = prepare_output(out, input, dtype);
+    
+    // Only views need an iteration layout; matching contiguous arrays are
+    // scaled as one flat run
+    std::shared_ptr<const StridedLayout> layout;
+    bool flat = ((input.flags() & py::array::c_style) && (result.flags() & py::array::c_style)) ||
+                ((input.flags() & py::array::f_style) && (result.flags() & py::array::f_style));
+    if (!flat) {
+        layout = std::make_shared<const StridedLayout>(make_layout(input, result));
+    }
+    
+    ScaleTask task{
+        kernels,
+        static_cast<const char*>(input.data()),
+        static_cast<size_t>(input.itemsize()),
+        static_cast<char*>(result.mutable_data()),
+        static_cast<size_t>(result.itemsize()),
+        select_store(dtype),
+        std::move(layout),
+        0,
+        static_cast<size_t>(input.size()),
+        factor,
+        nullptr,
+    };
+    return PreparedScale{input, result, task};
+}
+
+/**
+ * XXH64 primes and helpers.
+ */
+constexpr uint64_t kPrime64_1 = 0x9E3779B185EBCA87ULL;
+constexpr uint64_t kPrime64_2 = 0xC2B2AE3D27D4EB4FULL;
+constexpr uint64_t kPrime64_3 = 0x165667B19E3779F9ULL;
+constexpr uint64_t kPrime64_4 = 0x85EBCA77C2B2AE63ULL;
+constexpr uint64_t kPrime64_5 = 0x27D4EB2F165667C5ULL;
+
+inline uint64_t rotl64(uint64_t x, int r) {
+    return (x << r) | (x >> (64 - r));
+}
+
+inline uint64_t read64(const unsigned char* p) {
+    uint64_t v;
+    std::memcpy(&v, p, sizeof(v));
+    return v;
+}
+
+inline uint32_t read32(const unsigned char* p) {
+    uint32_t v;
+    std::memcpy(&v, p, sizeof(v));
+    return v;
+}
+
+inline uint64_t xxh64_round(uint64_t acc, uint64_t input) {
+    acc += input * kPrime64_2;
+    acc = rotl64(acc, 31);
+    return acc * kPrime64_1;
+}
+
+inline uint64_t xxh64_merge(uint64_t acc, uint64_t value) {
+    acc ^= xxh64_round(0, value);
+    return acc * kPrime64_1 + kPrime64_4;
+}
+
+uint64_t xxh64(const unsigned char* p, size_t len, uint64_t seed) {
+    const unsigned char* end = p + len;
+    uint64_t h;
+    if (len >= 32) {
+        uint64_t v1 = seed + kPrime64_1 + kPrime64_2;
+        uint64_t v2 = seed + kPrime64_2;
+        uint64_t v3 = seed;
+        uint64_t v4 = seed - kPrime64_1;
+        const unsigned char* limit = end - 32;
+        do {
+            v1 = xxh64_round(v1, read64(p));
+            v2 = xxh64_round(v2, read64(p + 8));
+            v3 = xxh64_round(v3, read64(p + 16));
+            v4 = xxh64_round(v4, read64(p + 24));
+            p += 32;
+        } while (p <= limit);
+        h = rotl64(v1, 1) + rotl64(v2, 7) + rotl64(v3, 12) + rotl64(v4, 18);
+        h = xxh64_merge(h, v1);
+        h = xxh64_merge(h, v2);
+        h = xxh64_merge(h, v3);
+        h = xxh64_merge(h, v4);
+    } else {
+        h = seed + kPrime64_5;
+    }
+    h += static_cast<uint64_t>(len);
+    
+    for (; p + 8 <= end; p += 8) {
+        h ^= xxh64_round(0, read64(p));
+        h = rotl64(h, 27) * kPrime64_1 + kPrime64_4;
+    }
+    if (p + 4 <= end) {
+        h ^= static_cast<uint64_t>(read32(p)) * kPrime64_1;
+        h = rotl64(h, 23) * kPrime64_2 + kPrime64_3;
+        p += 4;
+    }
+    for (; p < end; ++p) {
+        h ^= static_cast<uint64_t>(*p) * kPrime64_5;
+        h = rotl64(h, 11) * kPrime64_1;
+    }
+    
+    h ^= h >> 33;
+    h *= kPrime64_2;
+    h ^= h >> 29;
+    h *= kPrime64_3;
+    h ^= h >> 32;
+    return h;
+}
+
+/**
+ * Return key + suffix as a new reference, looked up in cache (input key ->
+ * new key) when cache is not null, and stored to it on a miss while it
+ * holds fewer than cache_size entries.
+ */
+PyObject* make_new_key(PyObject* key, PyObject* suffix, PyObject* cache, size_t cache_size) {
+    if (cache != nullptr) {
+        PyObject* found = PyDict_GetItemWithError(cache, key);
+        if (found != nullptr) {
+            Py_INCREF(found);
+            return found;
+        }
+        if (PyErr_Occurred()) {
+            throw py::error_already_set();
+        }
+    }
+    
+    PyObject* new_key = PyUnicode_Concat(key, suffix);
+    if (new_key == nullptr) {
+        throw py::error_already_set();
+    }
+    if (cache != nullptr && static_cast<size_t>(PyDict_GET_SIZE(cache)) < cache_size
+        && PyDict_SetItem(cache, key, new_key) != 0) {
+        Py_DECREF(new_key);
+        throw py::error_already_set();
+    }
+    return new_key;
+}
+
+PyObject* key_cache_dict(const py::object& cache) {
+    if (cache.is_none()) {
+        return nullptr;
+    }
+    if (!PyDict_CheckExact(cache.ptr())) {
+        throw py::type_error("key cache must be a dict");
+    }
+    return cache.ptr();
+}
+
+// Memory spanned by one array of a list: [low, high) in bytes
+struct ByteRange {
+    uintptr_t low;
+    uintptr_t high;
+    size_t index;
+};
+
+/**
+ * Byte ranges of the non-empty arrays in list, tagged with their positions;
+ * None entries are skipped.
+ */
+std::vector<ByteRange> byte_ranges(const py::list& arrays) {
+    std::vector<ByteRange> ranges;
+    ranges.reserve(arrays.size());
+    for (size_t i = 0; i < arrays.size(); ++i) {
+        PyObject* item = PyList_GET_ITEM(arrays.ptr(), static_cast<Py_ssize_t>(i));
+        if (item == Py_None) {
+            continue;
+        }
+        if (!py::isinstance<py::array>(item)) {
+            throw py::type_error("overlapping_ranges requires numpy arrays");
+        }
+        auto arr = py::reinterpret_borrow<py::array>(item);
+        if (arr.size() == 0) {
+            continue;
+        }
+        uintptr_t low = reinterpret_cast<uintptr_t>(arr.data());
+        uintptr_t high = low + static_cast<uintptr_t>(arr.itemsize());
+        for (py::ssize_t dim = 0; dim < arr.ndim(); ++dim) {
+            py::ssize_t extent = (arr.shape(dim) - 1) * arr.strides(dim);
+            if (extent < 0) {
+                low -= static_cast<uintptr_t>(-extent);
+            } else {
+                high += static_cast<uintptr_t>(extent);
+            }
+        }
+        ranges.push_back({low, high, i});
+    }
+    return ranges;
+}
+
+} // namespace
+
+py::dict transform(
+    const py::dict& input_dict,
+    const py::object& out,
+    size_t threads,
+    const py::object& key_cache,
+    double factor,
+    const py::str& suffix,
+    bool arena,
+    const py::object& output_dtype,
+    size_t key_cache_size
+) {
+    if (!out.is_none() && !py::isinstance<py::dict>(out)) {
+        throw py::type_error("out must be a dict");
+    }
+    PyObject* out_dict = out.is_none() ? nullptr : out.ptr();
+    PyObject* cache = key_cache_dict(key_cache);
+    
+    // Resolve keys, inputs and destinations while holding the GIL. Keys stay
+    // Python strings throughout, so no std::string copies are made
+    size_t n_keys = static_cast<size_t>(py::len(input_dict));
+    std::vector<py::str> new_keys;
+    std::vector<py::array> inputs;
+    std::vector<py::object> dests;
+    std::vector<py::dtype> dtypes;
+    new_keys.reserve(n_keys);
+    inputs.reserve(n_keys);
+    dests.reserve(n_keys);
+    dtypes.reserve(n_keys);
+    
+    for (auto item : input_dict) {
+        if (!PyUnicode_Check(item.first.ptr())) {
+            throw py::type_error("All keys must be strings");
+        }
         
-        // Scale the array by 0.3
-        py::array_t<double> scaled_arr = scale_array(arr, 0.3);
+        // Create new key by appending the suffix, reusing cached key objects
+        py::str new_key = py::reinterpret_steal<py::str>(
+            make_new_key(item.first.ptr(), suffix.ptr(), cache, key_cache_size));
         
-        // Add to output dictionary
-        output_dict[new_key] = scaled_arr;
+        // Scale the array, into the caller's buffer when provided
+        py::object dest = py::none();
+        if (out_dict != nullptr) {
+            PyObject* found = PyDict_GetItemWithError(out_dict, new_key.ptr());
+            if (found != nullptr) {
+                dest = py::reinterpret_borrow<py::object>(found);
+            } else if (PyErr_Occurred()) {
+                throw py::error_already_set();
+            }
+        }
+        py::array arr = py::isinstance<py::array>(item.second)
+            ? py::reinterpret_borrow<py::array>(item.second)
+            : py::array::ensure(item.second);
+        if (!arr) {
+            throw py::error_already_set();
+        }
+        dtypes.push_back(resolve_output_dtype(arr.dtype(), output_dtype));
+        inputs.push_back(std::move(arr));
+        dests.push_back(std::move(dest));
+        new_keys.push_back(std::move(new_key));
+    }
+    
+    // Carve the missing destinations out of one allocation, each starting
+    // on a kArenaAlignment boundary
+    if (arena) {
+        constexpr size_t align = kArenaAlignment;
+        size_t total = 0;
+        for (size_t i = 0; i < n_keys; ++i) {
+            if (dests[i].is_none()) {
+                size_t nbytes = static_cast<size_t>(inputs[i].size() * dtypes[i].itemsize());
+                total += (nbytes + align - 1) / align * align;
+            }
+        }
+        py::array_t<uint8_t> buffer(static_cast<py::ssize_t>(total + align));
+        char* data = reinterpret_cast<char*>(buffer.mutable_data());
+        data += (align - reinterpret_cast<uintptr_t>(data) % align) % align;
+        for (size_t i = 0; i < n_keys; ++i) {
+            if (dests[i].is_none()) {
+                const py::array& input = inputs[i];
+                py::ssize_t itemsize = dtypes[i].itemsize();
+                std::vector<py::ssize_t> shape(input.shape(), input.shape() + input.ndim());
+                dests[i] = py::array(dtypes[i], shape, output_strides(input, itemsize), data, buffer);
+                size_t nbytes = static_cast<size_t>(input.size() * itemsize);
+                data += (nbytes + align - 1) / align * align;
+            }
+        }
+    }
+    
+    std::vector<PreparedScale> prepared;
+    std::vector<ScaleTask> tasks;
+    prepared.reserve(n_keys);
+    tasks.reserve(n_keys);
+    for (size_t i = 0; i < n_keys; ++i) {
+        prepared.push_back(prepare_scale(inputs[i], factor, dests[i], dtypes[i]));
+        tasks.push_back(prepared.back().task);
+    }
+    
+    // Scale every entry, spreading keys across threads
+    {
+        py::gil_scoped_release release;
+        run_tasks(tasks, std::max<size_t>(threads, 1));
+    }
+    
+    // Build the output dict directly, in input order
+    py::dict output_dict;
+    for (size_t i = 0; i < prepared.size(); ++i) {
+        if (PyDict_SetItem(output_dict.ptr(), new_keys[i].ptr(), prepared[i].result.ptr()) != 0) {
+            throw py::error_already_set();
+        }
     }
     
     return output_dict;
 }
 
-py::array_t<double> scale_array(
-    const py::array_t<double>& arr,
-    double factor
+py::array scale_array(
+    const py::array& arr,
+    double factor,
+    const py::object& out,
+    size_t threads,
+    const py::object& output_dtype
 ) {
-    // Get array info
-    py::buffer_info buf = arr.request();
+    PreparedScale prepared = prepare_scale(arr, factor, out, resolve_output_dtype(arr.dtype(), output_dtype));
     
-    if (buf.ndim == 0) {
-        throw std::runtime_error("Zero-dimensional arrays are not supported");
+    // The buffers stay referenced by `prepared`, so the GIL can be dropped
+    // while the element loop runs
+    {
+        py::gil_scoped_release release;
+        run_tasks({prepared.task}, std::max<size_t>(threads, 1));
+    }
+    
+    return prepared.result;
+}
+
+py::array apply_pipeline(
+    const py::array& arr,
+    double factor,
+    const std::vector<std::tuple<int, double, double>>& steps,
+    const py::object& out,
+    size_t threads,
+    const py::object& output_dtype
+) {
+    auto validated = std::make_shared<PipelineSteps>();
+    validated->reserve(steps.size());
+    for (const auto& step : steps) {
+        int op = std::get<0>(step);
+        if (op < static_cast<int>(PipelineOp::Scale) || op > static_cast<int>(PipelineOp::Log)) {
+            throw py::value_error("Unknown pipeline operation " + std::to_string(op));
+        }
+        validated->push_back({static_cast<PipelineOp>(op), std::get<1>(step), std::get<2>(step)});
+    }
+    
+    PreparedScale prepared = prepare_scale(arr, factor, out, resolve_output_dtype(arr.dtype(), output_dtype));
+    if (!validated->empty()) {
+        prepared.task.steps = std::move(validated);
+    }
+    
+    {
+        py::gil_scoped_release release;
+        run_tasks({prepared.task}, std::max<size_t>(threads, 1));
+    }
+    
+    return prepared.result;
+}
+
+uint64_t content_hash(const py::array& arr, uint64_t seed) {
+    if (!(arr.flags() & (py::array::c_style | py::array::f_style))) {
+        throw py::value_error("content_hash requires a contiguous array");
     }
+    const unsigned char* data = static_cast<const unsigned char*>(arr.data());
+    size_t nbytes = static_cast<size_t>(arr.nbytes());
     
-    // Create output array with same shape
-    py::array_t<double> result(buf.shape);
-    py::buffer_info result_buf = result.request();
+    py::gil_scoped_release release;
+    return xxh64(data, nbytes, seed);
+}
+
+std::pair<std::vector<std::pair<size_t, size_t>>, std::vector<std::pair<size_t, size_t>>>
+overlapping_ranges(const py::list& inputs, const py::list& outputs) {
+    std::vector<ByteRange> dests = byte_ranges(outputs);
+    std::sort(dests.begin(), dests.end(),
+              [](const ByteRange& a, const ByteRange& b) { return a.low < b.low; });
     
-    // Get pointers to data
-    double* input_ptr = static_cast<double*>(buf.ptr);
-    double* output_ptr = static_cast<double*>(result_buf.ptr);
+    // Destinations against each other: only the ones still open at a start
+    // address can overlap it
+    std::vector<std::pair<size_t, size_t>> output_pairs;
+    std::vector<ByteRange> open;
+    for (const ByteRange& dest : dests) {
+        open.erase(std::remove_if(open.begin(), open.end(),
+                                  [&](const ByteRange& other) { return other.high <= dest.low; }),
+                   open.end());
+        for (const ByteRange& other : open) {
+            output_pairs.emplace_back(other.index, dest.index);
+        }
+        open.push_back(dest);
+    }
     
-    // Get total size
-    size_t total_size = 1;
-    for (size_t i = 0; i < buf.ndim; ++i) {
-        total_size *= buf.shape[i];
+    // Largest end address among the destinations up to each position, so
+    // the backward scan from an input's end stops at the first gap
+    std::vector<uintptr_t> reach(dests.size());
+    for (size_t i = 0; i < dests.size(); ++i) {
+        reach[i] = i == 0 ? dests[i].high : std::max(reach[i - 1], dests[i].high);
     }
     
-    // Scale each element
-    for (size_t i = 0; i < total_size; ++i) {
-        output_ptr[i] = input_ptr[i] * factor;
+    std::vector<std::pair<size_t, size_t>> input_pairs;
+    for (const ByteRange& input : byte_ranges(inputs)) {
+        auto end = std::lower_bound(dests.begin(), dests.end(), input.high,
+                                    [](const ByteRange& dest, uintptr_t high) { return dest.low < high; });
+        for (size_t i = static_cast<size_t>(end - dests.begin()); i > 0 && reach[i - 1] > input.low; --i) {
+            const ByteRange& dest = dests[i - 1];
+            // An array that is its own destination is elementwise safe
+            bool same = dest.index == input.index
+                && PyList_GET_ITEM(outputs.ptr(), static_cast<Py_ssize_t>(dest.index))
+                   == PyList_GET_ITEM(inputs.ptr(), static_cast<Py_ssize_t>(input.index));
+            if (dest.high > input.low && !same) {
+                input_pairs.emplace_back(input.index, dest.index);
+            }
+        }
     }
     
-    return result;
+    return {std::move(output_pairs), std::move(input_pairs)};
 }
 
 std::string create_new_key(const std::string& key, const std::string& suffix) {
     return key + suffix;
 }
 
+py::list create_new_keys(
+    const py::object& keys,
+    const py::str& suffix,
+    const py::object& cache,
+    size_t cache_size
+) {
+    PyObject* cache_dict = key_cache_dict(cache);
+    py::object sequence = py::reinterpret_steal<py::object>(
+        PySequence_Fast(keys.ptr(), "keys must be an iterable of strings"));
+    if (!sequence) {
+        throw py::error_already_set();
+    }
+    
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(sequence.ptr());
+    PyObject** items = PySequence_Fast_ITEMS(sequence.ptr());
+    py::list result(n);
+    for (Py_ssize_t i = 0; i < n; ++i) {
+        if (!PyUnicode_Check(items[i])) {
+            throw py::value_error(std::string("Key must be a string, got ") + Py_TYPE(items[i])->tp_name);
+        }
+        PyList_SET_ITEM(result.ptr(), i, make_new_key(items[i], suffix.ptr(), cache_dict, cache_size));
+    }
+    return result;
+}
+
+std::string simd_backend() {
+    return kSimdNames[g_simd_level.load()];
+}
+
+std::vector<std::string> supported_simd_backends() {
+    int detected = static_cast<int>(detect_simd_level());
+    std::vector<std::string> names;
+    for (int level = 0; level <= detected; ++level) {
+        names.emplace_back(kSimdNames[level]);
+    }
+    return names;
+}
+
+void set_simd_backend(const std::string& name) {
+    std::vector<std::string> names = supported_simd_backends();
+    auto it = std::find(names.begin(), names.end(), name);
+    if (it == names.end()) {
+        throw py::value_error("SIMD backend '" + name + "' is not supported on this CPU");
+    }
+    g_simd_level.store(static_cast<int>(it - names.begin()));
+}
+
 } // namespace pybase 
\ No newline at end of file
@@ -4,36 +4,175 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/numpy.h>
 #include <pybind11/stl.h>
+#include <cstdint>
+#include <limits>
 #include <string>
 #include <map>
+#include <tuple>
+#include <utility>
 #include <vector>
 
 namespace py = pybind11;
 
 namespace pybase {
 
+/**
+ * Minimum number of elements each native thread must receive before an
+ * array is split across threads; smaller arrays are scaled serially.
+ */
+constexpr size_t kParallelThreshold = 1 << 16;
+
+/**
+ * Alignment in bytes of every array placed in a transform() arena.
+ */
+constexpr size_t kArenaAlignment = 64;
+
 /**
  * Transform function that processes numpy arrays
  * 
+ * Arrays are taken as-is: float64, float32, float16 and integer inputs are
+ * cast to double inside the scale kernel, so no intermediate float64 copy
+ * is made.
+ * The Python dicts are used directly: keys are never converted to
+ * std::string, and the output preserves the input's insertion order.
+ * 
  * @param input_dict Input dictionary with string keys and numpy array values
+ * @param out Optional dict mapping output keys to preallocated destination
+ *            arrays of the output dtype; keys without a destination are
+ *            allocated
+ * @param threads Number of native threads; keys are scheduled across them
+ *                largest array first, with the GIL released
+ * @param key_cache Optional dict mapping input keys to cached output keys,
+ *                  as for create_new_keys; filled on misses
+ * @param factor Scaling factor
+ * @param suffix Suffix appended to every key
+ * @param arena If true, outputs without a destination in out are views
+ *              into one shared allocation, each aligned to
+ *              kArenaAlignment bytes, instead of separate arrays
+ * @param output_dtype Output dtype specification, as for scale_array
+ * @param key_cache_size Maximum number of entries in key_cache, as for
+ *                       create_new_keys
  * @return Output dictionary with modified keys and scaled arrays
  */
-std::map<std::string, py::array_t<double>> transform(
-    const std::map<std::string, py::array_t<double>>& input_dict
+py::dict transform(
+    const py::dict& input_dict,
+    const py::object& out = py::none(),
+    size_t threads = 1,
+    const py::object& key_cache = py::none(),
+    double factor = 0.3,
+    const py::str& suffix = py::str("_new"),
+    bool arena = false,
+    const py::object& output_dtype = py::none(),
+    size_t key_cache_size = std::numeric_limits<size_t>::max()
 );
 
 /**
  * Scale a numpy array by a factor
  * 
+ * Supported input dtypes (float64, float32, float16, signed and unsigned
+ * integers) are read directly and converted element by element; any other
+ * numeric dtype is converted to a contiguous float64 array first. Inputs and
+ * outputs may have arbitrary strides (views, slices, Fortran order), with
+ * a vectorized path for runs that are contiguous in both.
+ * 
  * @param arr Input numpy array
  * @param factor Scaling factor
- * @return Scaled numpy array
+ * Values are always computed in double precision and rounded once to the
+ * output dtype: to nearest-even for float32 and float16, and for integer
+ * outputs to the nearest integer (half to even), saturated to the range
+ * of the type, with NaN stored as 0.
+ * 
+ * @param out Optional writeable array of the output dtype with the same
+ *            shape as arr; may be arr itself to scale in place
+ * @param threads Maximum number of native threads; the GIL is released
+ *                while the element loop runs
+ * @param output_dtype None for float64; "same" to keep the input dtype
+ *                     when it is float16/32/64 or an integer type;
+ *                     "float" to keep floating input dtypes only; or a
+ *                     dtype for the result (integer dtypes require integer
+ *                     input). Inputs that cannot be kept give float64.
+ * @return Scaled numpy array, which is out when given; new arrays follow
+ *         the memory order of the input
  */
-py::array_t<double> scale_array(
-    const py::array_t<double>& arr,
-    double factor = 0.3
+py::array scale_array(
+    const py::array& arr,
+    double factor = 0.3,
+    const py::object& out = py::none(),
+    size_t threads = 1,
+    const py::object& output_dtype = py::none()
 );
 
+/**
+ * Elementwise operations that can follow the scale in a fused pipeline
+ */
+enum class PipelineOp : int {
+    Scale = 0,   ///< x * a
+    Offset = 1,  ///< x + a
+    Clip = 2,    ///< min(max(x, a), b)
+    Abs = 3,     ///< |x|
+    Log = 4,     ///< natural logarithm of x
+};
+
+/**
+ * Scale a numpy array and apply further elementwise steps in one pass
+ * 
+ * The array is processed in cache-sized blocks: each block is read and
+ * scaled like scale_array() does, every step is applied to it while it is
+ * still in L1 cache, and it is written once, so a pipeline of any length
+ * costs one read of the input and one write of the output.
+ * 
+ * @param arr Input numpy array (same dtypes and layouts as scale_array)
+ * @param factor Scaling factor applied while reading the input
+ * @param steps (PipelineOp, a, b) triples applied in order after scaling
+ * @param out Optional writeable array of the output dtype with the same
+ *            shape as arr
+ * @param threads Maximum number of native threads; the GIL is released
+ *                while the element loop runs
+ * @param output_dtype Output dtype specification, as for scale_array; the
+ *                     steps run in double precision before rounding
+ * @return Result array, which is out when given
+ */
+py::array apply_pipeline(
+    const py::array& arr,
+    double factor,
+    const std::vector<std::tuple<int, double, double>>& steps,
+    const py::object& out = py::none(),
+    size_t threads = 1,
+    const py::object& output_dtype = py::none()
+);
+
+/**
+ * 64-bit hash of the raw bytes of a contiguous array
+ * 
+ * Uses the XXH64 algorithm, which runs at close to memory bandwidth, so
+ * hashing an input costs less than scaling it. Only the bytes are hashed;
+ * callers add shape, dtype and memory order to their keys.
+ * 
+ * @param arr C- or Fortran-contiguous numpy array
+ * @param seed Hash seed
+ * @return Hash value
+ */
+uint64_t content_hash(const py::array& arr, uint64_t seed = 0);
+
+/**
+ * Find arrays whose memory ranges overlap, for checking transform()
+ * destinations before any of them is written
+ * 
+ * Ranges are compared by address only (like numpy.may_share_memory), with
+ * the destinations sorted so each array is only compared with its
+ * neighbours; empty arrays are skipped.
+ * 
+ * @param inputs List of input arrays
+ * @param outputs List of destination arrays (or None), outputs[i] being
+ *                the destination of inputs[i]
+ * @return Pairs of positions (i, j) in outputs whose ranges overlap, and
+ *         pairs (input position, output position) whose ranges overlap,
+ *         leaving out inputs that are the same object as their own
+ *         destination
+ */
+std::pair<std::vector<std::pair<size_t, size_t>>, std::vector<std::pair<size_t, size_t>>>
+overlapping_ranges(const py::list& inputs, const py::list& outputs);
+
 /**
  * Create a new key by appending suffix
  * 
@@ -43,6 +182,53 @@ py::array_t<double> scale_array(
  */
 std::string create_new_key(const std::string& key, const std::string& suffix = "_new");
 
+/**
+ * Create new keys for a whole sequence of keys in one call
+ * 
+ * With a cache dict (input key -> new key, one per suffix) repeated keys
+ * return the cached object instead of a new string, so dicts built from the
+ * same schema share their key objects. Once the cache holds cache_size
+ * entries it is only read: the keys already in it stay, and new keys are
+ * created without being stored. Keys are not interned, so dropping the
+ * cache frees them.
+ * 
+ * @param keys Sequence or iterable of str keys
+ * @param suffix Suffix to append
+ * @param cache Optional dict used and filled as described above
+ * @param cache_size Maximum number of entries stored to cache
+ * @return List of new keys, in input order
+ */
+py::list create_new_keys(
+    const py::object& keys,
+    const py::str& suffix,
+    const py::object& cache = py::none(),
+    size_t cache_size = std::numeric_limits<size_t>::max()
+);
+
+/**
+ * Name of the active float64/float32 scale kernel
+ * 
+ * The strongest instruction set supported by the running CPU ("avx512",
+ * "avx2", "sse2", or "baseline" off x86) is selected at import time.
+ * 
+ * @return Backend name
+ */
+std::string simd_backend();
+
+/**
+ * Names of the kernels the running CPU can execute, weakest first
+ * 
+ * @return Backend names
+ */
+std::vector<std::string> supported_simd_backends();
+
+/**
+ * Switch to another supported kernel (e.g. to compare code paths)
+ * 
+ * @param name One of supported_simd_backends()
+ */
+void set_simd_backend(const std::string& name);
+
 } // namespace pybase
 
 #endif // PYBASE_TRANSFORM_H 
\ No newline at end of file
@@ -1,49 +1,364 @@
 """
 PyBase Transform Module
 
-Provides high-level interface for transforming numpy arrays using C++ backend.
+Provides high-level interface for transforming numpy arrays using C++ backend,
+with a pure NumPy backend for hosts where the extension is not available.
+
+Importing this module is kept cheap for short-lived processes: the native
+extension is loaded on first use (see _load_extension), and asyncio, the
+process pool and the autotuner are imported by the functions that need
+them.
 """
 
+import bisect
+import functools
+import os
+import queue
+import threading
 import numpy as np
-from typing import Dict, Union, Any
+from typing import Dict, List, Union, Any, Optional, Tuple, Iterable, Iterator, Mapping, TYPE_CHECKING
 import warnings
 
-try:
-    from . import _transform
-    _CPP_AVAILABLE = True
-except ImportError:
-    _CPP_AVAILABLE = False
-    warnings.warn("C++ transform module not available. Using Python fallback.")
+from . import _cache
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+# The native extension is bound to _transform, and its availability to
+# _CPP_AVAILABLE, by _load_extension() on first use
+_extension_lock = threading.Lock()
+
+
+def _available_cpus() -> int:
+    """
+    Number of CPUs this process may run on.
+    
+    Uses the scheduler affinity mask where the platform has one (Linux), so
+    taskset and cgroup cpusets are honoured, and os.cpu_count() elsewhere.
+    """
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+# Default number of native threads used by the C++ kernels
+_num_threads = _available_cpus()
+
+# Backends accepted by the backend= argument
+_BACKENDS = ("auto", "cpp", "numpy")
+
+# Elements per block in the NumPy backend (512 KiB of float64 output, so a
+# block of input and output stays in L2 cache)
+_NUMPY_CHUNK_SIZE = 1 << 16
+
+# Results of the numeric dtype check, keyed by dtype
+_NUMERIC_DTYPES: Dict[np.dtype, bool] = {}
+
+_FLOAT64 = np.dtype(np.float64)
+
+# Dtypes results can be written as with output_dtype=
+_OUTPUT_DTYPES = frozenset(np.dtype(t) for t in (
+    np.float16, np.float32, np.float64,
+    np.int8, np.int16, np.int32, np.int64,
+    np.uint8, np.uint16, np.uint32, np.uint64,
+))
 
+# Dispatch thresholds for backend="auto", loaded on first use
+_thresholds: Optional[Dict[str, Any]] = None
 
-def transform(input_dict: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+# Maximum number of atransform()/ascale_array() steps running at once
+_async_concurrency = 1
+
+# Executor running the async steps, created on first use
+_async_executor: "Optional[ThreadPoolExecutor]" = None
+
+# Output keys by suffix, then by input key, so repeated schemas reuse the
+# same key objects. The keys are not interned, and the tables are bounded:
+# together they hold at most _KEY_CACHE_MAX_ENTRIES keys (10-20 MB), enough
+# for a 100k-key schema. A table that reaches the bound only stops taking
+# new keys, so the keys already in it keep being reused, and past
+# _KEY_CACHE_MAX_SUFFIXES suffixes the least recently used suffix's table
+# is dropped
+_new_key_cache: Dict[str, Dict[str, str]] = {}
+_KEY_CACHE_MAX_ENTRIES = 1 << 17
+_KEY_CACHE_MAX_SUFFIXES = 4
+
+# Content-addressed result cache; disabled while its budget is 0
+_result_cache = _cache.ResultCache()
+
+# Maximum number of schemas a Transformer keeps compiled plans for
+_PLAN_CACHE_SIZE = 32
+
+# Pipeline operation codes, matching pybase::PipelineOp in the extension
+_PIPELINE_OPS = {"scale": 0, "offset": 1, "clip": 2, "abs": 3, "log": 4}
+
+# Elements processed per async step; bounds how long a cancelled coroutine
+# keeps a worker busy and lets concurrent coroutines interleave
+_ASYNC_STEP_SIZE = 1 << 22
+
+
+def transform(input_dict: Dict[str, np.ndarray],
+              out: Optional[Dict[str, np.ndarray]] = None,
+              inplace: bool = False,
+              threads: Optional[int] = None,
+              backend: str = "auto",
+              processes: Optional[int] = None,
+              lazy: bool = False,
+              pool: Optional["BufferPool"] = None,
+              arena: bool = False,
+              stack: bool = False,
+              output_dtype: Any = None) -> Any:
     """
     Transform input dictionary by scaling numpy arrays by 0.3.
     
     Args:
         input_dict: Dictionary with string keys and numpy array values
-        
+        out: Optional dictionary mapping output keys (original + "_new") to
+            preallocated arrays of the result dtype that receive the
+            results. Output keys without an entry get a freshly allocated
+            array, so passing the previous result back in avoids all
+            allocation. Destinations must not overlap each other.
+        inplace: If True, overwrite the input arrays with the scaled values
+            (inputs must be writeable arrays of the result dtype that do
+            not overlap each other)
+        threads: Number of native threads (default: the module default, see
+            set_num_threads). Keys are scheduled across the threads largest
+            array first, and arrays bigger than an even share are split, with
+            the GIL released while the native work runs.
+        backend: "cpp" for the C++ extension, "numpy" for the NumPy backend,
+            or "auto" (default) to choose per array by element count using
+            the thresholds measured by autotune(), falling back to NumPy if
+            the extension is missing or fails
+        processes: If greater than 1, shard the keys (and chunks of arrays
+            larger than an even share) across a pool of that many worker
+            processes. Data is passed through shared memory instead of being
+            pickled, and the returned arrays are views over one shared
+            segment that is freed when the last of them is garbage
+            collected. Each worker uses threads native threads (default:
+            get_num_threads() divided among the processes). Cannot be
+            combined with out or inplace.
+        lazy: If True, validate now but return a LazyTransformResult that
+            scales each array on first access (see its docstring). Cannot
+            be combined with inplace or processes.
+        pool: Optional BufferPool that supplies the output arrays of keys
+            without an entry in out; release the results back to it once
+            they are no longer used. Cannot be combined with inplace or
+            processes.
+        arena: If True, place all results in one contiguous arena
+            (each array aligned to 64 bytes) and return views into it,
+            instead of allocating every output separately
+        stack: If True, all arrays must have the same shape, and the
+            results are written into the rows of one (n_keys, *shape) array
+            (of the common type of the result dtypes)
+        output_dtype: Dtype of the results. None (default) gives float64;
+            "same" keeps each input's dtype when it is float16/32/64 or an
+            integer type; "float" keeps floating input dtypes and gives
+            float64 for integers; a dtype is used for every result, and
+            integer dtypes require integer inputs. Values are computed in
+            float64 and rounded once; integer results are rounded half to
+            even and saturated. out and inplace arrays must have the result
+            dtype. Cannot be combined with processes.
+            
     Returns:
         Dictionary with modified keys (original + "_new") and scaled arrays
+        (a LazyTransformResult mapping if lazy=True). With stack=True, a
+        tuple (stacked, index) of the stacked array and a dict mapping each
+        output key to its row.
         
     Raises:
-        ValueError: If input is not a dictionary or contains invalid arrays
-        TypeError: If arrays are not numeric
+        ValueError: If input is not a dictionary or contains invalid arrays,
+            if a destination array has the wrong shape or is read-only, if
+            backend is unknown, if processes is invalid or combined with
+            out or inplace, if lazy or pool is combined with inplace or
+            processes, if arena or stack is combined with another output
+            option, if stack=True is given arrays of different shapes, if
+            output_dtype is not supported or combined with processes, or if
+            destination arrays overlap
+        TypeError: If arrays are not numeric, or output_dtype is an integer
+            dtype and an array is not
+        RuntimeError: If backend="cpp" but the C++ implementation is not
+            available
     """
     # Input validation
     if not isinstance(input_dict, dict):
         raise ValueError("Input must be a dictionary")
     
+    if out is not None and inplace:
+        raise ValueError("out and inplace=True are mutually exclusive")
+    
+    if out is not None and not isinstance(out, dict):
+        raise ValueError("out must be a dictionary")
+    
+    if lazy and (inplace or processes is not None):
+        raise ValueError("lazy=True cannot be combined with inplace=True or processes")
+    
+    if pool is not None and (inplace or processes is not None):
+        raise ValueError("pool cannot be combined with inplace=True or processes")
+    
+    if arena or stack:
+        if arena and stack:
+            raise ValueError("arena and stack are mutually exclusive")
+        if out is not None or inplace or lazy or pool is not None or processes is not None:
+            raise ValueError("arena and stack cannot be combined with out, inplace, lazy, pool or processes")
+    
+    output_dtype = _resolve_output_dtype(output_dtype)
+    
+    if processes is not None:
+        if isinstance(processes, bool) or not isinstance(processes, int) or processes < 1:
+            raise ValueError(f"processes must be a positive integer, got {processes!r}")
+        if output_dtype is not None:
+            raise ValueError("output_dtype cannot be combined with processes")
+        if out is not None or inplace:
+            raise ValueError("processes cannot be combined with out or inplace=True")
+        if threads is None:
+            threads = max(1, _num_threads // processes)
+    
+    threads = _resolve_threads(threads)
+    use_cpp = _resolve_backend(backend) == "cpp"
+    
     if not input_dict:
-        return {}
+        if stack:
+            # Only an explicit dtype is known without any inputs
+            dtype = output_dtype if isinstance(output_dtype, np.dtype) else _FLOAT64
+            return np.empty((0,), dtype=dtype), {}
+        return LazyTransformResult({}, {}, threads, backend, output_dtype) if lazy else {}
+    
+    validated_dict = _validate_dict(input_dict)
+    
+    # Result dtype per key; also rejects integer outputs for float inputs
+    dtypes = {}
+    if output_dtype is not None:
+        dtypes = {key: _result_dtype(value.dtype, output_dtype) for key, value in validated_dict.items()}
+    
+    if processes is not None and processes > 1 and any(v.size for v in validated_dict.values()):
+        from . import _sharding
+        return _sharding.transform_sharded(validated_dict, processes, threads, backend)
+    
+    out_dict = _resolve_destinations(input_dict, validated_dict, out, inplace, dtypes)
+    
+    if arena:
+        return _dispatch_transform(validated_dict, {}, use_cpp, threads, backend,
+                                   arena=True, output_dtype=output_dtype)
+    if stack:
+        # One dtype for all rows, used as an explicit output dtype
+        dtype = np.result_type(*dtypes.values()) if dtypes else _FLOAT64
+        stacked, out_dict = _stacked_outputs(validated_dict, dtype)
+        _dispatch_transform(validated_dict, out_dict, use_cpp, threads, backend,
+                            output_dtype=_resolve_output_dtype(dtype))
+        return stacked, {new_key: row for row, new_key in enumerate(out_dict)}
+    
+    # Draw the remaining destinations from the pool
+    if pool is not None:
+        for key, value in validated_dict.items():
+            new_key = key + "_new"
+            if new_key not in out_dict:
+                out_dict[new_key] = pool.acquire(value.shape, dtypes.get(key, _FLOAT64), _output_order(value))
+    
+    # Before any kernel runs, so no key reads another key's results
+    _unalias_outputs(validated_dict, out_dict)
+    
+    if lazy:
+        return LazyTransformResult({key + "_new": value for key, value in validated_dict.items()},
+                                   out_dict, threads, backend, output_dtype)
+    
+    if not out_dict and _result_cache.max_bytes > 0:
+        return _cached_transform(validated_dict, use_cpp, threads, backend, output_dtype)
+    
+    return _dispatch_transform(validated_dict, out_dict, use_cpp, threads, backend,
+                               output_dtype=output_dtype)
+
+
+# Alignment of each array in a transform(arena=True) arena, in bytes
+_ARENA_ALIGNMENT = 64
+
+
+def _resolve_destinations(input_dict: Dict[str, Any], validated_dict: Dict[str, np.ndarray],
+                          out: Optional[Dict[str, np.ndarray]], inplace: bool,
+                          dtypes: Dict[str, np.dtype]) -> Dict[str, np.ndarray]:
+    """
+    Check the destinations given through out or inplace=True.
+    
+    Returns:
+        Dictionary mapping output keys to their destination arrays; keys
+        without one are left out
+        
+    Raises:
+        TypeError: If a destination is not a numpy array of the result dtype
+        ValueError: If an inplace input is not a numpy array, or a
+            destination has the wrong shape or is read-only
+    """
+    # Error names are only formatted for destinations that fail the check
+    out_dict = {}
+    for key, value in (validated_dict.items() if inplace or out else ()):
+        new_key = key + "_new"
+        dtype = dtypes.get(key, _FLOAT64)
+        if inplace:
+            if input_dict[key] is not value:
+                raise ValueError(f"inplace=True requires numpy arrays, got {type(input_dict[key])} for key '{key}'")
+            if not _is_valid_out(value, value.shape, dtype):
+                _validate_out(value, value.shape, f"Array for key '{key}'", dtype)
+            out_dict[new_key] = value
+        elif out is not None and new_key in out:
+            dest = out[new_key]
+            if not _is_valid_out(dest, value.shape, dtype):
+                _validate_out(dest, value.shape, f"out['{new_key}']", dtype)
+            out_dict[new_key] = dest
+    return out_dict
+
+
+def _arena_outputs(validated_dict: Dict[str, np.ndarray],
+                   output_dtype: Any = None) -> Dict[str, np.ndarray]:
+    """Carve one output per key out of a single allocation."""
+    dtypes = [_result_dtype(value.dtype, output_dtype) for value in validated_dict.values()]
+    offsets = []
+    total = 0
+    for value, dtype in zip(validated_dict.values(), dtypes):
+        offsets.append(total)
+        total += -(-value.size * dtype.itemsize // _ARENA_ALIGNMENT) * _ARENA_ALIGNMENT
+    
+    # Over-allocate so the first array can start on an aligned boundary
+    raw = np.empty(total + _ARENA_ALIGNMENT, dtype=np.uint8)
+    start = -raw.ctypes.data % _ARENA_ALIGNMENT
+    arena = raw[start:start + total]
+    
+    out_dict = {}
+    for (key, value), dtype, offset in zip(validated_dict.items(), dtypes, offsets):
+        view = arena[offset:offset + value.size * dtype.itemsize].view(dtype)
+        out_dict[key + "_new"] = view.reshape(value.shape, order=_output_order(value))
+    return out_dict
+
+
+def _stacked_outputs(validated_dict: Dict[str, np.ndarray],
+                     dtype: np.dtype = _FLOAT64) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Allocate one (n_keys, *shape) array and use its rows as outputs."""
+    shapes = {value.shape for value in validated_dict.values()}
+    if len(shapes) != 1:
+        raise ValueError(f"stack=True requires arrays of the same shape, got {sorted(shapes)}")
+    
+    stacked = np.empty((len(validated_dict),) + shapes.pop(), dtype=dtype)
+    # stacked[row, ...] stays an array for 0-d inputs, where stacked[row] is a scalar
+    out_dict = {key + "_new": stacked[row, ...] for row, key in enumerate(validated_dict)}
+    return stacked, out_dict
+
+
+def _validate_dict(input_dict: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Check the keys and values of a transform() input.
     
-    # Validate and convert arrays
+    Returns:
+        Dictionary with the same keys whose values are numeric numpy arrays
+        
+    Raises:
+        ValueError: If a key is not a string
+        TypeError: If a value is not numeric
+    """
     validated_dict = {}
     for key, value in input_dict.items():
         if not isinstance(key, str):
             raise ValueError(f"All keys must be strings, got {type(key)}")
         
-        # Convert to numpy array if needed
+        # Convert to numpy array if needed (a single float64 conversion)
         if not isinstance(value, np.ndarray):
             try:
                 value = np.asarray(value, dtype=np.float64)
@@ -51,63 +366,943 @@ def transform(input_dict: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
                 raise TypeError(f"Value for key '{key}' cannot be converted to numeric array: {e}")
         
         # Ensure array is numeric
-        if not np.issubdtype(value.dtype, np.number):
+        if not _is_numeric(value.dtype):
             raise TypeError(f"Array for key '{key}' must be numeric, got {value.dtype}")
         
-        # Convert to double precision
-        validated_dict[key] = value.astype(np.float64)
+        # Arrays are passed through without a copy; the C++ kernel casts
+        # int/float32 elements to float64 while scaling
+        validated_dict[key] = value
     
-    # Use C++ implementation if available
-    if _CPP_AVAILABLE:
+    return validated_dict
+
+
+def _dispatch_transform(validated_dict: Dict[str, np.ndarray], out_dict: Dict[str, np.ndarray],
+                        use_cpp: bool, threads: int, backend: str,
+                        arena: bool = False, output_dtype: Any = None) -> Dict[str, np.ndarray]:
+    """Run a validated transform() call on the selected backends."""
+    # Use C++ implementation if selected; in auto mode only for arrays large
+    # enough to benefit, threaded only if the native share is large enough.
+    # An arena is always filled by one native call, since it targets many
+    # small arrays
+    native_dict = validated_dict if use_cpp else {}
+    if use_cpp and backend == "auto":
+        native_min_size, parallel_min_size = _get_thresholds()
+        if native_min_size > 0 and not arena:
+            native_dict = {key: value for key, value in validated_dict.items()
+                           if value.size >= native_min_size}
+        if parallel_min_size is None or sum(v.size for v in native_dict.values()) < parallel_min_size:
+            threads = 1
+    
+    result = {}
+    if native_dict:
         try:
-            return _transform.transform(validated_dict)
+            key_cache, key_cache_size = _key_cache("_new")
+            result = _transform.transform(native_dict, out_dict, threads, key_cache,
+                                          arena=arena, output_dtype=output_dtype,
+                                          key_cache_size=key_cache_size)
         except Exception as e:
+            if backend == "cpp":
+                raise
             warnings.warn(f"C++ transform failed, falling back to Python: {e}")
-            return _python_transform(validated_dict)
-    else:
-        return _python_transform(validated_dict)
+            native_dict = {}
+    
+    # The native result already follows input order; merge in the rest
+    if len(native_dict) == len(validated_dict):
+        return result
+    
+    if arena:
+        out_dict = _arena_outputs(validated_dict, output_dtype)
+    remaining = {key: value for key, value in validated_dict.items() if key not in native_dict}
+    result.update(_python_transform(remaining, out_dict, output_dtype=output_dtype))
+    return {key + "_new": result[key + "_new"] for key in validated_dict}
+
+
+def _cached_transform(validated_dict: Dict[str, np.ndarray], use_cpp: bool,
+                      threads: int, backend: str, output_dtype: Any = None) -> Dict[str, np.ndarray]:
+    """transform() through the result cache; only misses are computed."""
+    keys = {}
+    hits = {}
+    missing = {}
+    for key, value in validated_dict.items():
+        keys[key] = _cache_key(value, 0.3, (), _result_dtype(value.dtype, output_dtype))
+        cached = _result_cache.get(keys[key]) if keys[key] is not None else None
+        if cached is None:
+            missing[key] = value
+        else:
+            hits[key + "_new"] = cached
+    
+    computed = {}
+    if missing:
+        computed = _dispatch_transform(missing, {}, use_cpp, threads, backend, output_dtype=output_dtype)
+    for key in missing:
+        if keys[key] is not None:
+            computed[key + "_new"] = _result_cache.put(keys[key], computed[key + "_new"])
+    
+    return {key + "_new": hits.get(key + "_new", computed.get(key + "_new")) for key in validated_dict}
+
+
+def _cache_key(arr: np.ndarray, factor: float, steps: tuple,
+               dtype: np.dtype = _FLOAT64) -> Optional[tuple]:
+    """Result cache key for arr, hashed natively when possible."""
+    hasher = _transform.content_hash if _cpp_available() else None
+    return _cache.content_key(arr, factor, steps, hasher, dtype)
+
+
+class Transformer:
+    """
+    Reusable transform with fixed parameters and cached validation plans.
+    
+    The first call with a given schema (keys, dtypes and, when the
+    autotuned dispatch depends on sizes, shapes) validates the input like
+    transform() does and compiles a plan: the output keys, which keys go to
+    the native kernel and whether to thread. Later calls with the same
+    schema only compare keys and dtypes against the plan and hand the dict
+    and the plan's output keys straight to the native kernel::
+    
+        scale = Transformer(factor=0.5, suffix="_scaled")
+        for batch in batches:
+            result = scale(batch)
+            
+    Inputs whose values are not all numpy arrays are validated on every
+    call. Up to _PLAN_CACHE_SIZE schemas are cached per transformer.
+    """
+    
+    __slots__ = ("factor", "suffix", "dtype", "threads", "backend", "_output_dtype", "_plans")
+    
+    def __init__(self, factor: float = 0.3, suffix: str = "_new",
+                 dtype: Any = np.float64, threads: Optional[int] = None,
+                 backend: str = "auto"):
+        """
+        Args:
+            factor: Scaling factor (default: 0.3)
+            suffix: Suffix appended to every key (default: "_new")
+            dtype: Output dtype, with the rules of transform()'s
+                output_dtype ("same", "float" or a dtype; default: float64)
+            threads: As for transform()
+            backend: As for transform()
+            
+        Raises:
+            ValueError: If suffix is not a string, dtype is not supported,
+                or threads or backend are invalid
+        """
+        if not isinstance(suffix, str):
+            raise ValueError(f"Suffix must be a string, got {type(suffix)}")
+        output_dtype = _resolve_output_dtype(_FLOAT64 if dtype is None else dtype)
+        _resolve_threads(threads)
+        _resolve_backend(backend)
+        self.factor = float(factor)
+        self.suffix = suffix
+        self.dtype = _FLOAT64 if output_dtype is None else output_dtype
+        self.threads = threads
+        self.backend = backend
+        self._output_dtype = output_dtype
+        self._plans: Dict[tuple, _TransformPlan] = {}
+    
+    def __repr__(self) -> str:
+        dtype = repr(self.dtype) if isinstance(self.dtype, str) else self.dtype.name
+        return (f"Transformer(factor={self.factor!r}, suffix={self.suffix!r}, "
+                f"dtype={dtype}, threads={self.threads!r}, backend={self.backend!r})")
+    
+    def __call__(self, input_dict: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Transform a dictionary.
+        
+        Args:
+            input_dict: Dictionary with string keys and numeric array values
+            
+        Returns:
+            Dictionary with modified keys (original + suffix) and scaled
+            arrays of the transformer's dtype, in input order
+            
+        Raises:
+            ValueError: If input is not a dictionary or has non-string keys
+            TypeError: If arrays are not numeric, or dtype is an integer
+                dtype and an array is not
+        """
+        if not isinstance(input_dict, dict):
+            raise ValueError("Input must be a dictionary")
+        
+        keys = tuple(input_dict)
+        plan = self._plans.get(keys)
+        if plan is None or not plan.matches(input_dict):
+            input_dict = _validate_dict(input_dict)
+            if self._output_dtype is not None:
+                for value in input_dict.values():
+                    _result_dtype(value.dtype, self._output_dtype)
+            plan = self._compile(input_dict)
+            if plan.dtypes is not None:
+                self._plans.pop(keys, None)
+                if len(self._plans) >= _PLAN_CACHE_SIZE:
+                    del self._plans[next(iter(self._plans))]
+                self._plans[keys] = plan
+        
+        return plan.run(self, input_dict)
+    
+    def _compile(self, validated_dict: Dict[str, np.ndarray]) -> "_TransformPlan":
+        """Decide how to run validated inputs with this schema."""
+        use_cpp = _resolve_backend(self.backend) == "cpp"
+        native_keys = None if use_cpp else frozenset()
+        parallel = True
+        size_sensitive = False
+        if use_cpp and self.backend == "auto":
+            native_min_size, parallel_min_size = _get_thresholds()
+            sizes = {key: value.size for key, value in validated_dict.items()}
+            if native_min_size > 0 and min(sizes.values(), default=0) < native_min_size:
+                native_keys = frozenset(key for key, size in sizes.items() if size >= native_min_size)
+            native_size = sum(size for key, size in sizes.items()
+                              if native_keys is None or key in native_keys)
+            parallel = parallel_min_size is not None and native_size >= parallel_min_size
+            size_sensitive = native_min_size > 0 or bool(parallel_min_size)
+        
+        # Plans are only cached for dicts of arrays (lists are converted)
+        dtypes = shapes = None
+        if all(type(value) is np.ndarray for value in validated_dict.values()):
+            dtypes = [value.dtype for value in validated_dict.values()]
+            if size_sensitive:
+                shapes = [value.shape for value in validated_dict.values()]
+        new_keys = dict(zip(validated_dict, create_new_keys(validated_dict, self.suffix)))
+        return _TransformPlan(native_keys, parallel, new_keys, dtypes, shapes)
+    
+    def clear_plans(self) -> None:
+        """Drop the compiled plans, e.g. after autotune() or set_num_threads()."""
+        self._plans.clear()
+
+
+class _TransformPlan:
+    """Compiled dispatch decisions for one Transformer schema."""
+    
+    __slots__ = ("native_keys", "parallel", "new_keys", "dtypes", "shapes")
+    
+    def __init__(self, native_keys: Optional[frozenset], parallel: bool, new_keys: Dict[str, str],
+                 dtypes: Optional[List[np.dtype]], shapes: Optional[List[tuple]]):
+        # None means every key is scaled natively
+        self.native_keys = native_keys
+        self.parallel = parallel
+        # Output key by input key, in input order; the native kernel reads
+        # its keys from here instead of the module-wide key cache
+        self.new_keys = new_keys
+        # Schema the plan was compiled for; shapes only matter when the
+        # autotuned thresholds depend on array sizes
+        self.dtypes = dtypes
+        self.shapes = shapes
+    
+    def matches(self, input_dict: Dict[str, Any]) -> bool:
+        """Cheap check that input_dict (with the plan's keys) fits the plan."""
+        try:
+            if self.dtypes != [value.dtype for value in input_dict.values()]:
+                return False
+            return self.shapes is None or self.shapes == [value.shape for value in input_dict.values()]
+        except AttributeError:
+            return False
+    
+    def run(self, transformer: Transformer, input_dict: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        factor, suffix, output_dtype = transformer.factor, transformer.suffix, transformer._output_dtype
+        threads = _resolve_threads(transformer.threads) if self.parallel else 1
+        
+        native_dict = input_dict
+        if self.native_keys is not None:
+            native_dict = {key: value for key, value in input_dict.items() if key in self.native_keys}
+        
+        result = {}
+        if native_dict:
+            try:
+                result = _transform.transform(native_dict, None, threads, self.new_keys, factor, suffix,
+                                              output_dtype=output_dtype, key_cache_size=0)
+            except Exception as e:
+                if transformer.backend == "cpp":
+                    raise
+                warnings.warn(f"C++ transform failed, falling back to Python: {e}")
+                native_dict = {}
+        
+        if len(native_dict) == len(input_dict):
+            return result
+        
+        remaining = {key: value for key, value in input_dict.items() if key not in native_dict}
+        result.update(_python_transform(remaining, None, factor, suffix, output_dtype))
+        return {new_key: result[new_key] for new_key in self.new_keys.values()}
 
 
-def _python_transform(input_dict: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+class LazyTransformResult(Mapping):
+    """
+    Read-only mapping returned by transform(lazy=True).
+    
+    Holds references to the validated input arrays and scales an entry with
+    scale_array() the first time it is looked up, memoizing the result, so
+    outputs that are never read cost nothing. region() computes only part
+    of an entry. Inputs are read when an entry is computed, not when the
+    mapping is created, so they must not be modified in between.
     """
-    Python fallback implementation of transform function.
+    
+    def __init__(self, inputs: Dict[str, np.ndarray], out: Dict[str, np.ndarray],
+                 threads: int, backend: str, output_dtype: Any = None):
+        self._inputs = inputs
+        self._out = out
+        self._threads = threads
+        self._backend = backend
+        self._output_dtype = output_dtype
+        self._results: Dict[str, np.ndarray] = {}
+        self._regions: Dict[str, Dict[tuple, np.ndarray]] = {}
+        self._lock = threading.Lock()
+    
+    def __getitem__(self, key: str) -> np.ndarray:
+        result = self._results.get(key)
+        if result is None:
+            arr = self._inputs[key]
+            with self._lock:
+                result = self._results.get(key)
+                if result is None:
+                    result = scale_array(arr, 0.3, out=self._out.get(key), threads=self._threads,
+                                         backend=self._backend, output_dtype=self._output_dtype)
+                    self._results[key] = result
+                    self._regions.pop(key, None)
+        return result
+    
+    def __contains__(self, key: Any) -> bool:
+        # Mapping's default would compute the entry
+        return key in self._inputs
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._inputs)
+    
+    def __len__(self) -> int:
+        return len(self._inputs)
+    
+    def __repr__(self) -> str:
+        return f"LazyTransformResult({list(self._inputs)}, computed={list(self._results)})"
+    
+    def is_computed(self, key: str) -> bool:
+        """Whether the full entry for key has been computed."""
+        if key not in self._inputs:
+            raise KeyError(key)
+        return key in self._results
+    
+    def region(self, key: str, index: Any) -> np.ndarray:
+        """
+        Compute only result[key][index].
+        
+        If the full entry has been computed it is indexed directly.
+        Otherwise only the selected elements of the input are scaled; basic
+        indices (integers, slices, Ellipsis, None) are memoized per key and
+        written into the destination array when out= was given.
+        
+        Args:
+            key: Output key (original + "_new")
+            index: Any numpy index
+            
+        Returns:
+            Scaled values of the selected region
+            
+        Raises:
+            KeyError: If key is not in the mapping
+        """
+        result = self._results.get(key)
+        if result is not None:
+            return result[index]
+        
+        arr = self._inputs[key]
+        memo_key = _basic_index_key(index)
+        regions = self._regions.setdefault(key, {})
+        if memo_key is not None and memo_key in regions:
+            return regions[memo_key]
+        
+        selected = arr[index]
+        if not isinstance(selected, np.ndarray):
+            dtype = _result_dtype(arr.dtype, self._output_dtype)
+            return _numpy_scale(np.asarray(selected), 0.3, None, (), dtype)[()]
+        
+        out = self._out.get(key)
+        region_out = out[index] if out is not None and memo_key is not None else None
+        region = scale_array(selected, 0.3, out=region_out, threads=self._threads,
+                             backend=self._backend, output_dtype=self._output_dtype)
+        if memo_key is not None:
+            regions[memo_key] = region
+        return region
+
+
+def _basic_index_key(index: Any) -> Optional[tuple]:
+    """Hashable form of a basic numpy index, or None for advanced indexing."""
+    key = []
+    for item in index if isinstance(index, tuple) else (index,):
+        if isinstance(item, slice):
+            key.append(("slice", item.start, item.stop, item.step))
+        elif item is Ellipsis or item is None:
+            key.append(item)
+        elif isinstance(item, (int, np.integer)) and not isinstance(item, bool):
+            key.append(int(item))
+        else:
+            return None
+    return tuple(key)
+
+
+def _python_transform(input_dict: Dict[str, np.ndarray],
+                      out: Optional[Dict[str, np.ndarray]] = None,
+                      factor: float = 0.3,
+                      suffix: str = "_new",
+                      output_dtype: Any = None) -> Dict[str, np.ndarray]:
+    """
+    NumPy backend implementation of transform function.
+    
+    Mirrors the C++ semantics: outputs have the dtype given by
+    output_dtype, new arrays follow the memory order of their input, and
+    destinations in out are filled in place.
     
     Args:
         input_dict: Validated dictionary with numpy arrays
+        out: Validated destination arrays keyed by output key
+        factor: Scaling factor
+        suffix: Suffix appended to every key
+        output_dtype: Resolved output_dtype specification
         
     Returns:
         Transformed dictionary
     """
-    raise NotImplementedError("Python transform is not implemented")
     output_dict = {}
+    out = out or {}
     
     for key, arr in input_dict.items():
         # Create new key
-        new_key = key + "_new"
+        new_key = key + suffix
         
-        # Scale array by 0.3
-        scaled_arr = arr * 0.3
+        # Scale array by the factor
+        scaled_arr = _numpy_scale(arr, factor, out.get(new_key), (),
+                                  _result_dtype(arr.dtype, output_dtype))
         
         output_dict[new_key] = scaled_arr
     
     return output_dict
 
 
-def scale_array(arr: np.ndarray, factor: float = 0.3) -> np.ndarray:
+def _numpy_scale(arr: np.ndarray, factor: float,
+                 out: Optional[np.ndarray] = None,
+                 steps: Tuple[Tuple[int, float, float], ...] = (),
+                 dtype: np.dtype = _FLOAT64) -> np.ndarray:
+    """
+    Scale arr with NumPy, without full-size temporaries.
+    
+    Arrays that share a contiguous layout with the destination are processed
+    in blocks of _NUMPY_CHUNK_SIZE elements so each block stays in cache.
+    Other layouts are handed to a single ufunc call, which iterates the
+    strides directly, when the result is float64; for other result dtypes,
+    which need a float64 temporary, they are split into slabs of about
+    _NUMPY_CHUNK_SIZE elements by _numpy_slabs().
+    
+    Args:
+        arr: Numeric input array
+        factor: Scaling factor
+        out: Optional validated destination
+        steps: Pipeline steps applied in place to each scaled block
+        dtype: Result dtype when out is not given
+        
+    Returns:
+        Scaled array (out when given)
+    """
+    if out is None:
+        out = np.empty_like(arr, dtype=dtype)
+    
+    if arr.size <= _NUMPY_CHUNK_SIZE:
+        _numpy_block(arr, factor, out, steps)
+        return out
+    
+    if arr.flags.c_contiguous and out.flags.c_contiguous:
+        order = "C"
+    elif arr.flags.f_contiguous and out.flags.f_contiguous:
+        order = "F"
+    elif out.dtype == _FLOAT64:
+        _numpy_block(arr, factor, out, steps)
+        return out
+    else:
+        # Walk out's memory in order: its largest stride first
+        axes = sorted(range(out.ndim), key=lambda axis: -abs(out.strides[axis]))
+        _numpy_slabs(arr.transpose(axes), factor, out.transpose(axes), steps)
+        return out
+    
+    flat_in = arr.ravel(order=order)
+    flat_out = out.ravel(order=order)
+    for start in range(0, flat_in.size, _NUMPY_CHUNK_SIZE):
+        stop = start + _NUMPY_CHUNK_SIZE
+        _numpy_block(flat_in[start:stop], factor, flat_out[start:stop], steps)
+    
+    return out
+
+
+def _numpy_slabs(arr: np.ndarray, factor: float, out: np.ndarray,
+                 steps: Tuple[Tuple[int, float, float], ...]) -> None:
+    """
+    Scale arr into out in slabs along the first axis of about
+    _NUMPY_CHUNK_SIZE elements, so the float64 temporary of _numpy_block()
+    stays block sized for any layout. Subarrays larger than a block are
+    split recursively.
+    """
+    if arr.size <= _NUMPY_CHUNK_SIZE:
+        _numpy_block(arr, factor, out, steps)
+        return
+    
+    row = arr.size // arr.shape[0]
+    if row > _NUMPY_CHUNK_SIZE:
+        for i in range(arr.shape[0]):
+            _numpy_slabs(arr[i], factor, out[i], steps)
+        return
+    
+    rows = _NUMPY_CHUNK_SIZE // row
+    for start in range(0, arr.shape[0], rows):
+        stop = start + rows
+        _numpy_block(arr[start:stop], factor, out[start:stop], steps)
+
+
+def _numpy_block(arr: np.ndarray, factor: float, out: np.ndarray,
+                 steps: Tuple[Tuple[int, float, float], ...]) -> None:
+    """
+    Scale arr into out and apply steps, computing in float64 and rounding
+    once to out's dtype like the native store kernels: integers are
+    rounded half to even and saturated, and NaN is stored as 0.
+    """
+    if out.dtype == _FLOAT64:
+        # dtype= picks the float64 loop; float32/float16 inputs would
+        # otherwise be multiplied at their own precision
+        np.multiply(arr, factor, out=out, dtype=np.float64, casting="unsafe")
+        _numpy_steps(out, steps)
+        return
+    
+    block = np.multiply(arr, factor, dtype=np.float64)
+    _numpy_steps(block, steps)
+    if out.dtype.kind == "f":
+        # Values beyond the range of out's dtype become inf, as natively
+        with np.errstate(over="ignore"):
+            np.copyto(out, block, casting="unsafe")
+        return
+    
+    info = np.iinfo(out.dtype)
+    np.rint(block, out=block)
+    block[np.isnan(block)] = 0
+    # float(info.max) rounds up for 64-bit types, so saturate separately
+    high = block >= info.max
+    np.clip(block, info.min, info.max, out=block)
+    block[high] = 0
+    np.copyto(out, block, casting="unsafe")
+    out[high] = info.max
+
+
+def _numpy_steps(block: np.ndarray, steps: Tuple[Tuple[int, float, float], ...]) -> None:
+    """Apply pipeline steps to a float64 block in place."""
+    for op, a, b in steps:
+        if op == _PIPELINE_OPS["scale"]:
+            np.multiply(block, a, out=block)
+        elif op == _PIPELINE_OPS["offset"]:
+            np.add(block, a, out=block)
+        elif op == _PIPELINE_OPS["clip"]:
+            np.minimum(np.maximum(block, a, out=block), b, out=block)
+        elif op == _PIPELINE_OPS["abs"]:
+            np.abs(block, out=block)
+        elif op == _PIPELINE_OPS["log"]:
+            np.log(block, out=block)
+
+
+def _host_signature() -> Dict[str, Any]:
+    """Describe the host and library versions that autotune results depend on."""
+    import platform
+    
+    return {
+        "pybase": __version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "simd": get_simd_backend(),
+        "threads": _num_threads,
+    }
+
+
+def _get_thresholds() -> Tuple[int, Optional[int]]:
+    """
+    Return (native_min_size, parallel_min_size) for backend="auto".
+    
+    Thresholds come from the autotune cache when it matches this host, and
+    otherwise default to always using the native kernel.
+    """
+    global _thresholds
+    if _thresholds is None:
+        from . import _autotune
+        _thresholds = _autotune.load(_host_signature()) or dict(_autotune.DEFAULT_THRESHOLDS)
+    return _thresholds["native_min_size"], _thresholds["parallel_min_size"]
+
+
+def autotune(save: bool = True) -> Dict[str, Any]:
+    """
+    Measure the backend dispatch thresholds on this host.
+    
+    Compares the NumPy backend with the serial native kernel, and the serial
+    with the threaded native kernel, over a range of array sizes. The result
+    is used by backend="auto" from then on and, if save is True, cached on
+    disk (see PYBASE_CACHE_DIR) for later processes on the same host. The
+    cache is ignored if the host, library versions or default thread count
+    change.
+    
+    Args:
+        save: Whether to write the result to the cache file
+        
+    Returns:
+        Dictionary with "native_min_size" (smallest element count sent to
+        the native kernel) and "parallel_min_size" (smallest element count
+        that is threaded, or None if threading never helped)
+        
+    Raises:
+        RuntimeError: If the C++ implementation is not available
+    """
+    from . import _autotune
+    
+    global _thresholds
+    if not _cpp_available():
+        raise RuntimeError("C++ transform module not available")
+    
+    thresholds = _autotune.measure(
+        lambda arr, out, threads: _transform.scale_array(arr, 0.3, out, threads),
+        lambda arr, out: _numpy_scale(arr, 0.3, out),
+        _num_threads,
+    )
+    if save:
+        _autotune.save(_host_signature(), thresholds)
+    _thresholds = thresholds
+    return dict(thresholds)
+
+
+def _resolve_backend(backend: str) -> str:
+    """
+    Map a backend= argument to the implementation to run ("cpp" or "numpy").
+    
+    Raises:
+        ValueError: If backend is not one of "auto", "cpp" or "numpy"
+        RuntimeError: If backend="cpp" but the extension is not available
+    """
+    if backend not in _BACKENDS:
+        raise ValueError(f"backend must be one of {_BACKENDS}, got {backend!r}")
+    
+    if backend == "cpp" and not _cpp_available():
+        raise RuntimeError("C++ transform module not available")
+    
+    if backend == "auto":
+        return "cpp" if _cpp_available() else "numpy"
+    
+    return backend
+
+
+def _cpp_available() -> bool:
+    """Whether the native extension can be used, loading it on first use."""
+    try:
+        return _CPP_AVAILABLE
+    except NameError:
+        return _load_extension()
+
+
+def _load_extension() -> bool:
+    """
+    Import the native extension into the module globals.
+    
+    Deferred from module import so that importing pybase.transform does not
+    pay for loading the shared library. If the extension is missing, a
+    warning is emitted once, here, instead of at import time.
+    
+    Returns:
+        Whether the extension is available
+    """
+    global _transform, _CPP_AVAILABLE
+    with _extension_lock:
+        if "_CPP_AVAILABLE" in globals():
+            return _CPP_AVAILABLE
+        try:
+            from . import _transform
+            available = True
+        except ImportError:
+            _transform = None
+            available = False
+            warnings.warn("C++ transform module not available. Using Python fallback.", stacklevel=3)
+        _CPP_AVAILABLE = available
+        return available
+
+
+def __getattr__(name: str) -> Any:
+    # _transform and _CPP_AVAILABLE only exist once the extension is loaded
+    if name in ("_transform", "_CPP_AVAILABLE"):
+        _load_extension()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _is_numeric(dtype: np.dtype) -> bool:
+    """Check whether dtype is numeric, memoized per dtype."""
+    numeric = _NUMERIC_DTYPES.get(dtype)
+    if numeric is None:
+        numeric = _NUMERIC_DTYPES[dtype] = bool(np.issubdtype(dtype, np.number))
+    return numeric
+
+
+def _resolve_output_dtype(output_dtype: Any) -> Any:
+    """
+    Validate an output_dtype= argument.
+    
+    Returns:
+        None for float64 (the default), "same" or "float", or the numpy
+        dtype every result is written as
+        
+    Raises:
+        ValueError: If output_dtype is not a supported dtype
+    """
+    if output_dtype is None or (isinstance(output_dtype, str) and output_dtype in ("same", "float")):
+        return output_dtype
+    
+    dtype = np.dtype(output_dtype)
+    if dtype not in _OUTPUT_DTYPES:
+        raise ValueError(f"Unsupported output_dtype {dtype}; expected None, 'same', 'float' "
+                         f"or a native float16/32/64 or integer dtype")
+    return None if dtype == _FLOAT64 else dtype
+
+
+def _result_dtype(dtype: np.dtype, output_dtype: Any) -> np.dtype:
+    """
+    Result dtype for an input dtype under a resolved output_dtype, as
+    described in transform().
+    
+    Raises:
+        TypeError: If output_dtype is an integer dtype and dtype is not
+    """
+    if output_dtype is None:
+        return _FLOAT64
+    
+    if isinstance(output_dtype, str):
+        native = dtype.newbyteorder("=")
+        if native in _OUTPUT_DTYPES and (output_dtype == "same" or native.kind == "f"):
+            return native
+        return _FLOAT64
+    
+    if output_dtype.kind in "iu" and dtype.kind not in "iu":
+        raise TypeError(f"Integer output dtype {output_dtype} requires integer input, got {dtype}")
+    return output_dtype
+
+
+def _is_valid_out(out: Any, shape: tuple, dtype: np.dtype) -> bool:
+    """Fast check for the common case of a valid destination array."""
+    return (isinstance(out, np.ndarray) and out.dtype is dtype
+            and out.shape == shape and out.flags.writeable)
+
+
+def _validate_out(out: Any, shape: tuple, name: str, dtype: np.dtype = _FLOAT64) -> None:
+    """
+    Check that an array can be used as a destination for scaled values.
+    
+    Args:
+        out: Candidate destination array
+        shape: Required shape
+        name: Description used in error messages
+        dtype: Required dtype
+        
+    Raises:
+        TypeError: If out is not a numpy array of the required dtype
+        ValueError: If out has the wrong shape or is read-only
+    """
+    if _is_valid_out(out, shape, dtype):
+        return
+    
+    if not isinstance(out, np.ndarray):
+        raise TypeError(f"{name} must be a numpy array, got {type(out)}")
+    
+    if out.dtype != dtype:
+        raise TypeError(f"{name} must have dtype {dtype}, got {out.dtype}")
+    
+    if out.shape != shape:
+        raise ValueError(f"{name} has shape {out.shape}, expected {shape}")
+    
+    if not out.flags.writeable:
+        raise ValueError(f"{name} must be writeable")
+
+
+def _resolve_threads(threads: Optional[int]) -> int:
+    """
+    Return the thread count to use for a call, validating explicit values.
+    
+    Raises:
+        ValueError: If threads is not a positive integer
+    """
+    if threads is None:
+        return _num_threads
+    
+    if isinstance(threads, bool) or not isinstance(threads, int) or threads < 1:
+        raise ValueError(f"threads must be a positive integer, got {threads!r}")
+    
+    return threads
+
+
+def _unalias(arr: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Copy arr if it partially overlaps out, so the elementwise kernel never
+    reads a value it has already overwritten. Exact aliasing is safe.
+    """
+    if out is arr or not np.may_share_memory(arr, out):
+        return arr
+    
+    same_buffer = (arr.dtype == out.dtype and arr.strides == out.strides
+                   and arr.ctypes.data == out.ctypes.data)
+    return arr if same_buffer else arr.copy()
+
+
+def _byte_bounds(arr: np.ndarray) -> Tuple[int, int]:
+    """First byte and one past the last byte of memory spanned by arr."""
+    low = high = arr.ctypes.data
+    if arr.size:
+        for dim, stride in zip(arr.shape, arr.strides):
+            if stride < 0:
+                low += (dim - 1) * stride
+            else:
+                high += (dim - 1) * stride
+        high += arr.itemsize
+    return low, high
+
+
+def _unalias_outputs(validated_dict: Dict[str, np.ndarray], out_dict: Dict[str, np.ndarray]) -> None:
+    """
+    Make the destinations of transform() safe to write in any order.
+    
+    Every input is checked against every destination, not just its own:
+    an input that may overlap another key's destination is copied, since
+    that key can be written first (or concurrently by another thread), and
+    an input overlapping its own destination is handled by _unalias().
+    The address ranges are compared by _overlapping_ranges(), so only the
+    rare overlapping pairs are examined here.
+    
+    Args:
+        validated_dict: Validated inputs; entries are replaced by copies
+            where needed
+        out_dict: Destination arrays keyed by output key (key + "_new")
+        
+    Raises:
+        ValueError: If two destinations share memory
+    """
+    if not out_dict:
+        return
+    
+    keys = list(validated_dict)
+    inputs = list(validated_dict.values())
+    outputs = [out_dict.get(key + "_new") for key in keys]
+    output_pairs, input_pairs = _overlapping_ranges(inputs, outputs)
+    
+    # Destinations overlapping each other would clobber one another's results
+    for first, second in output_pairs:
+        if np.shares_memory(outputs[first], outputs[second]):
+            raise ValueError(f"Destination arrays for '{keys[first]}_new' and '{keys[second]}_new' overlap")
+    
+    for index, dest_index in input_pairs:
+        key = keys[index]
+        if validated_dict[key] is not inputs[index]:
+            continue  # already copied
+        if dest_index == index:
+            validated_dict[key] = _unalias(inputs[index], outputs[index])
+        else:
+            validated_dict[key] = inputs[index].copy()
+
+
+def _overlapping_ranges(inputs: List[np.ndarray],
+                        outputs: List[Optional[np.ndarray]]) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """
+    Positions of outputs, and of inputs and outputs, whose memory ranges
+    overlap (natively when available; see _transform.overlapping_ranges).
+    outputs[i] is the destination of inputs[i] or None; inputs that are
+    their own destination are left out.
+    """
+    if _cpp_available():
+        return _transform.overlapping_ranges(inputs, outputs)
+    
+    destinations = sorted((_byte_bounds(arr) + (index,) for index, arr in enumerate(outputs)
+                           if arr is not None and arr.size), key=lambda bounds: bounds[0])
+    
+    output_pairs = []
+    active: List[Tuple[int, int, int]] = []
+    for low, high, index in destinations:
+        active = [entry for entry in active if entry[1] > low]
+        output_pairs.extend((entry[2], index) for entry in active)
+        active.append((low, high, index))
+    
+    starts = [low for low, _, _ in destinations]
+    reach = []  # largest end address among the destinations up to each position
+    for _, high, _ in destinations:
+        reach.append(max(high, reach[-1]) if reach else high)
+    
+    input_pairs = []
+    for index, value in enumerate(inputs):
+        if not value.size:
+            continue
+        low, high = _byte_bounds(value)
+        position = bisect.bisect_left(starts, high) - 1
+        while position >= 0 and reach[position] > low:
+            _, dest_high, dest_index = destinations[position]
+            position -= 1
+            if dest_high > low and not (dest_index == index and outputs[index] is value):
+                input_pairs.append((index, dest_index))
+    return output_pairs, input_pairs
+
+
+def scale_array(arr: np.ndarray, factor: float = 0.3,
+                out: Optional[np.ndarray] = None,
+                inplace: bool = False,
+                threads: Optional[int] = None,
+                backend: str = "auto",
+                pool: Optional["BufferPool"] = None,
+                output_dtype: Any = None) -> np.ndarray:
     """
     Scale a numpy array by a factor.
     
     Args:
         arr: Input numpy array
         factor: Scaling factor (default: 0.3)
-        
+        out: Optional preallocated array of the result dtype with the same
+            shape as arr that receives the result
+        inplace: If True, overwrite arr with the scaled values (arr must be a
+            writeable array of the result dtype)
+        threads: Number of native threads (default: the module default, see
+            set_num_threads). Arrays below the native parallel threshold are
+            always scaled serially; the GIL is released either way.
+        backend: "cpp", "numpy" or "auto" (default), as for transform();
+            in auto mode the element count decides between NumPy and the
+            serial or threaded native kernel
+        pool: Optional BufferPool that supplies the result array when
+            neither out nor inplace is given
+        output_dtype: Dtype of the result, as for transform() (default:
+            float64)
+            
     Returns:
-        Scaled numpy array
+        Scaled numpy array (out or arr itself when given/inplace)
         
     Raises:
-        ValueError: If input is not a valid array
-        TypeError: If array is not numeric
+        ValueError: If input is not a valid array, out has the wrong shape
+            or is read-only, backend is unknown, or output_dtype is not
+            supported
+        TypeError: If array is not numeric, out has the wrong dtype, or
+            output_dtype is an integer dtype and the array is not
+        RuntimeError: If backend="cpp" but the C++ implementation is not
+            available
+    """
+    return _scale(arr, factor, (), out, inplace, threads, backend, pool, output_dtype)
+
+
+def _scale(arr: np.ndarray, factor: float, steps: Tuple[Tuple[int, float, float], ...],
+           out: Optional[np.ndarray], inplace: bool, threads: Optional[int],
+           backend: str, pool: Optional["BufferPool"] = None,
+           output_dtype: Any = None) -> np.ndarray:
     """
+    Validate and dispatch scale_array() and Pipeline calls.
+    
+    Args:
+        steps: Pipeline steps applied after scaling, as (op, a, b) triples
+            with the op codes of _PIPELINE_OPS; empty for a plain scale
+            
+    See scale_array() for the other arguments, return value and errors.
+    """
+    if out is not None and inplace:
+        raise ValueError("out and inplace=True are mutually exclusive")
+    
+    if inplace and not isinstance(arr, np.ndarray):
+        raise ValueError(f"inplace=True requires a numpy array, got {type(arr)}")
+    
+    threads = _resolve_threads(threads)
+    use_cpp = _resolve_backend(backend) == "cpp"
+    output_dtype = _resolve_output_dtype(output_dtype)
+    
     # Input validation
     if not isinstance(arr, np.ndarray):
         try:
@@ -115,18 +1310,384 @@ def scale_array(arr: np.ndarray, factor: float = 0.3) -> np.ndarray:
         except (ValueError, TypeError) as e:
             raise TypeError(f"Cannot convert input to numeric array: {e}")
     
-    if not np.issubdtype(arr.dtype, np.number):
+    if not _is_numeric(arr.dtype):
         raise TypeError(f"Array must be numeric, got {arr.dtype}")
     
-    # Use C++ implementation if available
-    if _CPP_AVAILABLE:
+    dtype = _result_dtype(arr.dtype, output_dtype)
+    if inplace:
+        _validate_out(arr, arr.shape, "Array", dtype)
+        out = arr
+    elif out is not None:
+        _validate_out(out, arr.shape, "out", dtype)
+        arr = _unalias(arr, out)
+    elif pool is not None:
+        out = pool.acquire(arr.shape, dtype, _output_order(arr))
+        arr = _unalias(arr, out)
+    
+    # Serve repeated inputs from the result cache (new outputs only)
+    key = None
+    if out is None and _result_cache.max_bytes > 0:
+        key = _cache_key(arr, factor, steps, dtype)
+        cached = _result_cache.get(key) if key is not None else None
+        if cached is not None:
+            return cached
+    
+    result = _dispatch_scale(arr, factor, steps, out, use_cpp, threads, backend, output_dtype)
+    return result if key is None else _result_cache.put(key, result)
+
+
+def _dispatch_scale(arr: np.ndarray, factor: float, steps: Tuple[Tuple[int, float, float], ...],
+                    out: Optional[np.ndarray], use_cpp: bool, threads: int,
+                    backend: str, output_dtype: Any = None) -> np.ndarray:
+    """Run a validated _scale() call on the selected backend."""
+    if use_cpp and backend == "auto":
+        native_min_size, parallel_min_size = _get_thresholds()
+        use_cpp = arr.size >= native_min_size
+        if parallel_min_size is None or arr.size < parallel_min_size:
+            threads = 1
+    
+    # Use C++ implementation if selected (casting is fused into the kernel)
+    if use_cpp:
         try:
-            return _transform.scale_array(arr.astype(np.float64), factor)
+            if steps:
+                return _transform.apply_pipeline(arr, factor, steps, out, threads,
+                                                 output_dtype=output_dtype)
+            return _transform.scale_array(arr, factor, out, threads, output_dtype=output_dtype)
         except Exception as e:
+            if backend == "cpp":
+                raise
             warnings.warn(f"C++ scale_array failed, falling back to Python: {e}")
-            return arr * factor
-    else:
-        return arr * factor
+    
+    return _numpy_scale(arr, factor, out, steps, _result_dtype(arr.dtype, output_dtype))
+
+
+class BufferPool:
+    """
+    Pool of reusable output arrays, of any result dtype.
+    
+    Large outputs are returned to the OS by the allocator when freed, so a
+    loop that allocates them anew pays for mapping and first-touch page
+    faults on every iteration. Passing a pool to transform() or
+    scale_array() draws the outputs from it instead, and releasing the
+    results back once they are no longer needed makes a steady-state loop
+    allocation free::
+    
+        pool = BufferPool(max_bytes=2 << 30)
+        for batch in batches:
+            result = transform(batch, pool=pool)
+            consume(result)
+            pool.release(result)
+            
+    Buffers are kept per (shape, dtype, order); idle buffers beyond
+    max_bytes are dropped instead of kept. Released arrays must not be used
+    afterwards, since the next call may overwrite them.
+    """
+    
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Maximum total size of idle buffers kept in the pool
+            
+        Raises:
+            ValueError: If max_bytes is not a non-negative integer
+        """
+        if isinstance(max_bytes, bool) or not isinstance(max_bytes, int) or max_bytes < 0:
+            raise ValueError(f"max_bytes must be a non-negative integer, got {max_bytes!r}")
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._free: Dict[tuple, List[np.ndarray]] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, shape: Tuple[int, ...], dtype: Any = np.float64,
+                order: str = "C") -> np.ndarray:
+        """
+        Take an idle buffer, or allocate one if none matches.
+        
+        Args:
+            shape: Array shape
+            dtype: Array dtype (default: float64)
+            order: "C" or "F" memory order
+            
+        Returns:
+            Uninitialized writeable array
+        """
+        key = (tuple(shape), np.dtype(dtype), order)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                buffer = free.pop()
+                self.nbytes -= buffer.nbytes
+                self.hits += 1
+                return buffer
+            self.misses += 1
+        return np.empty(key[0], dtype=key[1], order=order)
+    
+    def release(self, arrays: Any) -> None:
+        """
+        Return arrays to the pool.
+        
+        Args:
+            arrays: An array, a dict of arrays (e.g. a transform() result) or
+                an iterable of arrays. Arrays that do not own their memory
+                (views) or are read-only are ignored, as are arrays that no
+                longer fit under max_bytes.
+        """
+        if isinstance(arrays, np.ndarray):
+            arrays = (arrays,)
+        elif isinstance(arrays, Mapping):
+            arrays = arrays.values()
+        
+        with self._lock:
+            for arr in arrays:
+                if not isinstance(arr, np.ndarray) or not arr.flags.owndata or not arr.flags.writeable:
+                    continue
+                if self.nbytes + arr.nbytes > self.max_bytes:
+                    continue
+                free = self._free.setdefault((arr.shape, arr.dtype, _output_order(arr)), [])
+                if any(buffer is arr for buffer in free):
+                    continue
+                free.append(arr)
+                self.nbytes += arr.nbytes
+    
+    def clear(self) -> None:
+        """Drop all idle buffers."""
+        with self._lock:
+            self._free.clear()
+            self.nbytes = 0
+    
+    def __repr__(self) -> str:
+        return (f"BufferPool(max_bytes={self.max_bytes}, nbytes={self.nbytes}, "
+                f"hits={self.hits}, misses={self.misses})")
+
+
+def _output_order(arr: np.ndarray) -> str:
+    """Memory order of a new output for arr: "F" for Fortran arrays, else "C"."""
+    return "F" if arr.flags.f_contiguous and not arr.flags.c_contiguous else "C"
+
+
+class Pipeline:
+    """
+    Chain of elementwise operations applied to an array in one fused pass.
+    
+    Pipelines are immutable; each builder method returns a new pipeline
+    with the step appended, so common prefixes can be shared::
+    
+        normalize = Pipeline().scale(0.3).offset(1.0).clip(0.0, 10.0)
+        result = normalize(arr)
+        
+    Calling a pipeline runs every step over cache-sized blocks of the
+    array, so the whole chain costs one read of the input and one write of
+    the output instead of a pass and a temporary per step. The steps run in
+    float64 and the result has the output_dtype of scale_array() (float64
+    by default).
+    """
+    
+    __slots__ = ("_steps",)
+    
+    def __init__(self, steps: Tuple[Tuple[int, float, float], ...] = ()):
+        self._steps = tuple(steps)
+    
+    def _then(self, name: str, a: float = 0.0, b: float = 0.0) -> "Pipeline":
+        return Pipeline(self._steps + ((_PIPELINE_OPS[name], float(a), float(b)),))
+    
+    def scale(self, factor: float) -> "Pipeline":
+        """Multiply by factor."""
+        return self._then("scale", factor)
+    
+    def offset(self, value: float) -> "Pipeline":
+        """Add value."""
+        return self._then("offset", value)
+    
+    def clip(self, lo: Optional[float] = None, hi: Optional[float] = None) -> "Pipeline":
+        """
+        Limit values to [lo, hi], like np.clip; None leaves a side open.
+        
+        Raises:
+            ValueError: If both bounds are None
+        """
+        if lo is None and hi is None:
+            raise ValueError("clip requires at least one of lo and hi")
+        return self._then("clip", -np.inf if lo is None else lo, np.inf if hi is None else hi)
+    
+    def abs(self) -> "Pipeline":
+        """Take the absolute value."""
+        return self._then("abs")
+    
+    def log(self) -> "Pipeline":
+        """Take the natural logarithm (NaN/-inf for values <= 0)."""
+        return self._then("log")
+    
+    def __len__(self) -> int:
+        return len(self._steps)
+    
+    def __repr__(self) -> str:
+        names = {code: name for name, code in _PIPELINE_OPS.items()}
+        steps = []
+        for op, a, b in self._steps:
+            name = names[op]
+            if name in ("scale", "offset"):
+                steps.append(f".{name}({a!r})")
+            elif name == "clip":
+                steps.append(f".clip({a!r}, {b!r})")
+            else:
+                steps.append(f".{name}()")
+        return "Pipeline()" + "".join(steps)
+    
+    def __call__(self, arr: np.ndarray,
+                 out: Optional[np.ndarray] = None,
+                 inplace: bool = False,
+                 threads: Optional[int] = None,
+                 backend: str = "auto",
+                 output_dtype: Any = None) -> np.ndarray:
+        """
+        Apply the pipeline to an array.
+        
+        Args:
+            arr: Input numpy array (any numeric dtype)
+            out: As for scale_array()
+            inplace: As for scale_array()
+            threads: As for scale_array()
+            backend: As for scale_array(); the NumPy backend applies the
+                steps block by block as well
+            output_dtype: As for scale_array()
+            
+        Returns:
+            Result array (out or arr itself when given/inplace)
+            
+        Raises:
+            The same exceptions as scale_array()
+        """
+        # A leading scale is fused into the read of the input
+        factor, steps = 1.0, self._steps
+        if steps and steps[0][0] == _PIPELINE_OPS["scale"]:
+            factor, steps = steps[0][1], steps[1:]
+        return _scale(arr, factor, steps, out, inplace, threads, backend, output_dtype=output_dtype)
+
+
+class IncrementalTransformer:
+    """
+    Scale append-only arrays, processing only what was appended since the
+    previous call.
+    
+    For every key the transformer remembers how many rows (elements along
+    the first axis) it has already scaled and keeps the results in a
+    growing buffer of the result dtype whose capacity doubles when full, so
+    each call costs O(new rows) amortized instead of O(total rows)::
+    
+        incremental = IncrementalTransformer()
+        while running:
+            buffers["ticks"] = np.append(buffers["ticks"], new_ticks)
+            scaled = incremental.update(buffers)["ticks_new"]
+            
+    The arrays returned by update() are views of the internal buffers. Rows
+    already returned never change, but a view taken before the buffer grew
+    does not see rows added afterwards, so use the latest result.
+    """
+    
+    def __init__(self, factor: float = 0.3, threads: Optional[int] = None,
+                 backend: str = "auto", output_dtype: Any = None):
+        """
+        Args:
+            factor: Scaling factor (default: 0.3)
+            threads: Passed to scale_array() for the new rows
+            backend: Passed to scale_array() for the new rows
+            output_dtype: Dtype of the results, with the rules of
+                transform() (default: float64)
+                
+        Raises:
+            ValueError: If threads, backend or output_dtype are invalid
+        """
+        _resolve_threads(threads)
+        _resolve_backend(backend)
+        self.factor = factor
+        self.threads = threads
+        self.backend = backend
+        self.output_dtype = output_dtype
+        self._output_dtype = _resolve_output_dtype(output_dtype)
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._lengths: Dict[str, int] = {}
+    
+    def update(self, input_dict: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Scale the rows appended to each array since the last call.
+        
+        Args:
+            input_dict: Dictionary with string keys and numeric numpy arrays
+                of at least one dimension; each array must start with the
+                rows passed in earlier calls
+                
+        Returns:
+            Dictionary with modified keys (original + "_new") and the scaled
+            arrays, with the same shape as the inputs
+            
+        Raises:
+            ValueError: If input is not a dictionary, an array has no
+                dimensions, shrank, or changed its trailing shape or result
+                dtype
+            TypeError: If arrays are not numeric, or output_dtype is an
+                integer dtype and an array is not
+        """
+        if not isinstance(input_dict, dict):
+            raise ValueError("Input must be a dictionary")
+        
+        result = {}
+        for key, arr in input_dict.items():
+            if not isinstance(key, str):
+                raise ValueError(f"All keys must be strings, got {type(key)}")
+            if not isinstance(arr, np.ndarray) or arr.ndim == 0:
+                raise ValueError(f"Value for key '{key}' must be a numpy array with at least one dimension")
+            
+            done = self._lengths.get(key, 0)
+            buffer = self._buffers.get(key)
+            if buffer is not None and buffer.shape[1:] != arr.shape[1:]:
+                raise ValueError(f"Array for key '{key}' changed its trailing shape from "
+                                 f"{buffer.shape[1:]} to {arr.shape[1:]}")
+            if len(arr) < done:
+                raise ValueError(f"Array for key '{key}' shrank from {done} to {len(arr)} rows; "
+                                 f"call reset('{key}') to start over")
+            if not _is_numeric(arr.dtype):
+                raise TypeError(f"Array for key '{key}' must be numeric, got {arr.dtype}")
+            dtype = _result_dtype(arr.dtype, self._output_dtype)
+            if buffer is not None and buffer.dtype != dtype:
+                raise ValueError(f"Array for key '{key}' changed its result dtype from "
+                                 f"{buffer.dtype} to {dtype}; call reset('{key}') to start over")
+            
+            if buffer is None or len(arr) > len(buffer):
+                buffer = self._grow(key, arr, done, dtype)
+            if len(arr) > done:
+                scale_array(arr[done:], self.factor, out=buffer[done:len(arr)],
+                            threads=self.threads, backend=self.backend,
+                            output_dtype=self._output_dtype)
+                self._lengths[key] = len(arr)
+            
+            result[key + "_new"] = buffer[:len(arr)]
+        
+        return result
+    
+    def _grow(self, key: str, arr: np.ndarray, done: int, dtype: np.dtype) -> np.ndarray:
+        """Reallocate the buffer for key to hold arr, doubling its capacity."""
+        old = self._buffers.get(key)
+        capacity = max(len(arr), 2 * len(old) if old is not None else 0)
+        buffer = np.empty((capacity,) + arr.shape[1:], dtype=dtype)
+        if done:
+            buffer[:done] = old[:done]
+        self._buffers[key] = buffer
+        return buffer
+    
+    def processed(self, key: str) -> int:
+        """Number of rows of key scaled so far (0 for unknown keys)."""
+        return self._lengths.get(key, 0)
+    
+    def reset(self, key: Optional[str] = None) -> None:
+        """Forget the state of key, or of all keys if key is None."""
+        if key is None:
+            self._buffers.clear()
+            self._lengths.clear()
+        else:
+            self._buffers.pop(key, None)
+            self._lengths.pop(key, None)
 
 
 def create_new_key(key: str, suffix: str = "_new") -> str:
@@ -150,7 +1711,7 @@ def create_new_key(key: str, suffix: str = "_new") -> str:
         raise ValueError(f"Suffix must be a string, got {type(suffix)}")
     
     # Use C++ implementation if available
-    if _CPP_AVAILABLE:
+    if _cpp_available():
         try:
             return _transform.create_new_key(key, suffix)
         except Exception as e:
@@ -160,13 +1721,457 @@ def create_new_key(key: str, suffix: str = "_new") -> str:
         return key + suffix
 
 
+def create_new_keys(keys: Iterable[str], suffix: str = "_new") -> List[str]:
+    """
+    Create new keys for many keys at once.
+    
+    The whole sequence is handled in one native call. New keys are cached
+    per suffix (up to _KEY_CACHE_MAX_ENTRIES keys over all suffixes), so
+    calling this (or transform()) again with the same keys returns the same
+    string objects instead of allocating new ones, and dicts built from them
+    share their keys. They are not interned, so keys dropped from the cache
+    are freed.
+    
+    Args:
+        keys: Iterable of original keys
+        suffix: Suffix to append (default: "_new")
+        
+    Returns:
+        List of new keys, in input order
+        
+    Raises:
+        ValueError: If a key or the suffix is not a string
+    """
+    if not isinstance(suffix, str):
+        raise ValueError(f"Suffix must be a string, got {type(suffix)}")
+    
+    cache, cache_size = _key_cache(suffix)
+    if _cpp_available():
+        return _transform.create_new_keys(keys, suffix, cache, cache_size)
+    
+    result = []
+    for key in keys:
+        new_key = cache.get(key) if isinstance(key, str) else None
+        if new_key is None:
+            new_key = create_new_key(key, suffix)
+            if len(cache) < cache_size:
+                cache[key] = new_key
+        result.append(new_key)
+    return result
+
+
+def _key_cache(suffix: str) -> Tuple[Dict[str, str], int]:
+    """
+    Key table for suffix, evicting the least recently used suffix's table.
+    
+    Returns:
+        The table and the number of entries it may grow to, the share of
+        _KEY_CACHE_MAX_ENTRIES not held by the other suffixes
+    """
+    # Reinserted on every use, so the dict stays ordered by last use
+    cache = _new_key_cache.pop(suffix, None)
+    if cache is None:
+        cache = {}
+        while len(_new_key_cache) >= _KEY_CACHE_MAX_SUFFIXES:
+            _new_key_cache.pop(next(iter(_new_key_cache)), None)
+    others = sum(len(table) for table in _new_key_cache.values())
+    _new_key_cache[suffix] = cache
+    return cache, max(_KEY_CACHE_MAX_ENTRIES - others, 0)
+
+
+def transform_stream(batches: Iterable[Dict[str, np.ndarray]],
+                     max_in_flight: int = 4,
+                     inplace: bool = False,
+                     threads: Optional[int] = None,
+                     backend: str = "auto",
+                     output_dtype: Any = None) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Transform an iterable of dictionaries, overlapping production,
+    transformation and consumption.
+    
+    One background thread pulls batches from the iterable while a second
+    one transforms them, so the caller's loop, the producer and the
+    transform run concurrently (the native kernels release the GIL) and
+    throughput is set by the slowest stage. At most max_in_flight batches
+    are held between being pulled from the iterable and being handed to the
+    caller, which bounds memory use.
+    
+    Args:
+        batches: Iterable yielding input dictionaries for transform()
+        max_in_flight: Maximum number of batches read ahead of the caller
+        inplace: Passed to transform() for every batch
+        threads: Passed to transform() for every batch
+        backend: Passed to transform() for every batch
+        output_dtype: Passed to transform() for every batch
+        
+    Returns:
+        Iterator over the transformed dictionaries, in input order
+        
+    Raises:
+        ValueError: If max_in_flight is not a positive integer, or threads,
+            backend or output_dtype are invalid
+        Exception: Errors raised by the iterable or by transform() are
+            re-raised from the iterator at the position of the failing batch
+    """
+    if isinstance(max_in_flight, bool) or not isinstance(max_in_flight, int) or max_in_flight < 1:
+        raise ValueError(f"max_in_flight must be a positive integer, got {max_in_flight!r}")
+    
+    # Fail on bad arguments now rather than on the first batch
+    _resolve_threads(threads)
+    _resolve_backend(backend)
+    _resolve_output_dtype(output_dtype)
+    
+    return _stream(iter(batches), max_in_flight,
+                   dict(inplace=inplace, threads=threads, backend=backend, output_dtype=output_dtype))
+
+
+# Marks the end of a stream in the transform_stream queues
+_STREAM_END = object()
+
+# Seconds between checks for a closed stream while a stage is blocked
+_STREAM_POLL_INTERVAL = 0.05
+
+
+def _stream(batches: Iterator[Dict[str, np.ndarray]], max_in_flight: int,
+            options: Dict[str, Any]) -> Iterator[Dict[str, np.ndarray]]:
+    """Generator behind transform_stream(); see its docstring."""
+    slots = threading.Semaphore(max_in_flight)
+    pending: "queue.Queue" = queue.Queue()
+    done: "queue.Queue" = queue.Queue()
+    stop = threading.Event()
+    
+    def produce():
+        try:
+            while True:
+                # Wait for room before reading ahead
+                while not slots.acquire(timeout=_STREAM_POLL_INTERVAL):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                batch = next(batches, _STREAM_END)
+                pending.put((batch, None))
+                if batch is _STREAM_END:
+                    return
+        except BaseException as e:
+            pending.put((None, e))
+    
+    def work():
+        while not stop.is_set():
+            try:
+                batch, error = pending.get(timeout=_STREAM_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if error is None and batch is not _STREAM_END:
+                try:
+                    batch = transform(batch, **options)
+                except BaseException as e:
+                    batch, error = None, e
+            done.put((batch, error))
+            if error is not None or batch is _STREAM_END:
+                return
+    
+    workers = [
+        threading.Thread(target=produce, name="pybase-stream-producer", daemon=True),
+        threading.Thread(target=work, name="pybase-stream-worker", daemon=True),
+    ]
+    for worker in workers:
+        worker.start()
+    
+    try:
+        while True:
+            result, error = done.get()
+            if error is not None:
+                raise error
+            if result is _STREAM_END:
+                return
+            slots.release()
+            yield result
+    finally:
+        # Also reached when the caller stops iterating early
+        stop.set()
+
+
+async def atransform(input_dict: Dict[str, np.ndarray],
+                     out: Optional[Dict[str, np.ndarray]] = None,
+                     inplace: bool = False,
+                     threads: Optional[int] = None,
+                     backend: str = "auto",
+                     output_dtype: Any = None) -> Dict[str, np.ndarray]:
+    """
+    Coroutine version of transform() that does not block the event loop.
+    
+    The keys are transformed in steps of about _ASYNC_STEP_SIZE elements on
+    a worker thread (the native kernels release the GIL), so the event loop
+    keeps running meanwhile. At most get_async_concurrency() steps run at
+    once per process, and steps of concurrent calls interleave. Cancelling
+    the coroutine stops it after the step in progress; keys of later steps
+    are left untouched (or, with out/inplace, unwritten).
+    
+    Args:
+        input_dict: Dictionary with string keys and numpy array values
+        out: As for transform()
+        inplace: As for transform()
+        threads: As for transform()
+        backend: As for transform()
+        output_dtype: As for transform()
+        
+    Returns:
+        Dictionary with modified keys (original + "_new") and scaled arrays,
+        in input order
+        
+    Raises:
+        The same exceptions as transform(), before any step runs
+        asyncio.CancelledError: If the coroutine is cancelled
+    """
+    if not isinstance(input_dict, dict):
+        raise ValueError("Input must be a dictionary")
+    if out is not None and inplace:
+        raise ValueError("out and inplace=True are mutually exclusive")
+    if out is not None and not isinstance(out, dict):
+        raise ValueError("out must be a dictionary")
+    _resolve_threads(threads)
+    _resolve_backend(backend)
+    resolved_dtype = _resolve_output_dtype(output_dtype)
+    
+    validated_dict = _validate_dict(input_dict)
+    dtypes = {}
+    if resolved_dtype is not None:
+        dtypes = {key: _result_dtype(value.dtype, resolved_dtype) for key, value in validated_dict.items()}
+    
+    # Destinations are resolved over the whole dict, since an input may
+    # overlap the destination of a key in another step; every step then
+    # writes to them through out
+    out_dict = _resolve_destinations(input_dict, validated_dict, out, inplace, dtypes)
+    _unalias_outputs(validated_dict, out_dict)
+    
+    options = dict(out=out_dict, threads=threads, backend=backend, output_dtype=output_dtype)
+    result = {}
+    step: Dict[str, Any] = {}
+    step_size = 0
+    for key, value in validated_dict.items():
+        step[key] = value
+        step_size += value.size
+        if step_size >= _ASYNC_STEP_SIZE:
+            result.update(await _run_async(transform, step, **options))
+            step, step_size = {}, 0
+    if step or not result:
+        result.update(await _run_async(transform, step, **options))
+    return result
+
+
+async def ascale_array(arr: np.ndarray, factor: float = 0.3,
+                       out: Optional[np.ndarray] = None,
+                       inplace: bool = False,
+                       threads: Optional[int] = None,
+                       backend: str = "auto",
+                       output_dtype: Any = None) -> np.ndarray:
+    """
+    Coroutine version of scale_array() that does not block the event loop.
+    
+    Arrays larger than _ASYNC_STEP_SIZE elements are scaled in slabs along
+    the first axis, one step at a time, under the same per-process
+    concurrency limit and cancellation rules as atransform().
+    
+    Args:
+        arr: Input numpy array
+        factor: Scaling factor (default: 0.3)
+        out: As for scale_array()
+        inplace: As for scale_array()
+        threads: As for scale_array()
+        backend: As for scale_array()
+        output_dtype: As for scale_array()
+        
+    Returns:
+        Scaled numpy array of the result dtype (out or arr itself when
+        given/inplace)
+        
+    Raises:
+        The same exceptions as scale_array()
+        asyncio.CancelledError: If the coroutine is cancelled
+    """
+    options = dict(threads=threads, backend=backend, output_dtype=output_dtype)
+    if not isinstance(arr, np.ndarray) or arr.size <= _ASYNC_STEP_SIZE:
+        return await _run_async(scale_array, arr, factor, out=out, inplace=inplace, **options)
+    
+    # Validate everything up front so no slab is written on bad arguments
+    if out is not None and inplace:
+        raise ValueError("out and inplace=True are mutually exclusive")
+    if not _is_numeric(arr.dtype):
+        raise TypeError(f"Array must be numeric, got {arr.dtype}")
+    _resolve_threads(threads)
+    _resolve_backend(backend)
+    dtype = _result_dtype(arr.dtype, _resolve_output_dtype(output_dtype))
+    if inplace:
+        _validate_out(arr, arr.shape, "Array", dtype)
+        out = arr
+    elif out is not None:
+        _validate_out(out, arr.shape, "out", dtype)
+        arr = _unalias(arr, out)
+    else:
+        out = np.empty_like(arr, dtype=dtype)
+    
+    rows = max(1, _ASYNC_STEP_SIZE // (arr.size // arr.shape[0]))
+    for start in range(0, arr.shape[0], rows):
+        stop = start + rows
+        await _run_async(scale_array, arr[start:stop], factor, out=out[start:stop], **options)
+    return out
+
+
+def _get_async_executor() -> "ThreadPoolExecutor":
+    """Executor for the async steps, sized by the concurrency limit."""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    global _async_executor
+    if _async_executor is None:
+        _async_executor = ThreadPoolExecutor(max_workers=_async_concurrency,
+                                             thread_name_prefix="pybase-async")
+    return _async_executor
+
+
+async def _run_async(func, *args, **kwargs):
+    """Run one step on the async executor without blocking the event loop."""
+    import asyncio
+    
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_async_executor(),
+                                      functools.partial(func, *args, **kwargs))
+
+
 # Version and availability info
 __version__ = "1.0.0"
 __author__ = "damon"
 
 def get_cpp_availability() -> bool:
     """Check if C++ implementation is available."""
-    return _CPP_AVAILABLE
+    return _cpp_available()
+
+
+def get_simd_backend() -> Optional[str]:
+    """
+    Get the SIMD kernel used by the C++ implementation.
+    
+    The strongest instruction set supported by the running CPU is selected
+    when the extension is imported.
+    
+    Returns:
+        "avx512", "avx2", "sse2" or "baseline", or None if the C++
+        implementation is not available
+    """
+    if not _cpp_available():
+        return None
+    return _transform.simd_backend()
+
+
+def set_simd_backend(name: str) -> None:
+    """
+    Select another SIMD kernel supported by the running CPU.
+    
+    Args:
+        name: One of the names returned by
+            ``_transform.supported_simd_backends()``
+            
+    Raises:
+        RuntimeError: If the C++ implementation is not available
+        ValueError: If the CPU does not support the requested kernel
+    """
+    if not _cpp_available():
+        raise RuntimeError("C++ transform module not available")
+    _transform.set_simd_backend(name)
+
+
+def get_num_threads() -> int:
+    """Get the default number of native threads used by the C++ kernels."""
+    return _num_threads
+
+
+def set_num_threads(threads: int) -> None:
+    """
+    Set the default number of native threads used by the C++ kernels.
+    
+    Args:
+        threads: Positive number of threads (1 disables multithreading)
+        
+    Raises:
+        ValueError: If threads is not a positive integer
+    """
+    global _num_threads, _thresholds
+    if threads is None:
+        raise ValueError("threads must be a positive integer, got None")
+    _num_threads = _resolve_threads(threads)
+    
+    # Cached autotune results only apply to the thread count they measured
+    _thresholds = None
+
+
+def get_async_concurrency() -> int:
+    """Get the maximum number of async transform steps running at once."""
+    return _async_concurrency
+
+
+def set_async_concurrency(limit: int) -> None:
+    """
+    Set the maximum number of async transform steps running at once.
+    
+    The default of 1 runs one step at a time, which already keeps
+    get_num_threads() native threads busy; raise it when the steps are too
+    small to use the threads on their own.
+    
+    Args:
+        limit: Positive number of concurrent steps for this process
+        
+    Raises:
+        ValueError: If limit is not a positive integer
+    """
+    global _async_concurrency, _async_executor
+    if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+        raise ValueError(f"limit must be a positive integer, got {limit!r}")
+    _async_concurrency = limit
+    
+    # Steps already submitted finish on the old executor
+    if _async_executor is not None:
+        _async_executor.shutdown(wait=False)
+        _async_executor = None
+
+
+def set_cache_size(max_bytes: int) -> None:
+    """
+    Enable the result cache with a budget of max_bytes, or disable it with 0.
+    
+    While enabled, transform(), scale_array() and Pipeline calls that
+    allocate their output look up contiguous inputs by a hash of their bytes
+    plus shape, dtype, memory order, factor and pipeline steps, and return
+    the stored result for inputs seen before. Results are marked read-only
+    because the same array is returned to every caller; the least recently
+    used entries are evicted when the budget is exceeded. Calls with out=,
+    inplace=True or processes bypass the cache.
+    
+    Args:
+        max_bytes: Maximum total size of cached result arrays
+        
+    Raises:
+        ValueError: If max_bytes is not a non-negative integer
+    """
+    if isinstance(max_bytes, bool) or not isinstance(max_bytes, int) or max_bytes < 0:
+        raise ValueError(f"max_bytes must be a non-negative integer, got {max_bytes!r}")
+    _result_cache.resize(max_bytes)
+    if max_bytes == 0:
+        _result_cache.clear()
+
+
+def get_cache_info() -> "_cache.CacheInfo":
+    """
+    Get the result cache statistics.
+    
+    Returns:
+        CacheInfo(hits, misses, entries, nbytes, max_bytes)
+    """
+    return _result_cache.info()
+
+
+def clear_cache() -> None:
+    """Drop all cached results and reset the hit/miss counters."""
+    _result_cache.clear()
 
 
 def get_version() -> str:
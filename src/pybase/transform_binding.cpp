@@ -11,19 +11,54 @@ PYBIND11_MODULE(_transform, m) {
     // Bind the transform function
     m.def("transform", &pybase::transform, 
           "Transform input dictionary by scaling numpy arrays by 0.3",
-          py::arg("input_dict"));
+          py::arg("input_dict"), py::arg("out") = py::none(), py::arg("threads") = 1,
+          py::arg("key_cache") = py::none(), py::arg("factor") = 0.3,
+          py::arg("suffix") = py::str("_new"), py::arg("arena") = false,
+          py::arg("output_dtype") = py::none(),
+          py::arg("key_cache_size") = std::numeric_limits<size_t>::max());
     
     // Bind the scale_array function
     m.def("scale_array", &pybase::scale_array,
           "Scale a numpy array by a factor",
-          py::arg("arr"), py::arg("factor") = 0.3);
+          py::arg("arr"), py::arg("factor") = 0.3, py::arg("out") = py::none(),
+          py::arg("threads") = 1, py::arg("output_dtype") = py::none());
+    
+    // Bind the fused pipeline
+    m.def("apply_pipeline", &pybase::apply_pipeline,
+          "Scale a numpy array and apply elementwise steps in one pass",
+          py::arg("arr"), py::arg("factor"), py::arg("steps"), py::arg("out") = py::none(),
+          py::arg("threads") = 1, py::arg("output_dtype") = py::none());
+    
+    // Bind the content hash used by the result cache
+    m.def("content_hash", &pybase::content_hash,
+          "XXH64 hash of the bytes of a contiguous array",
+          py::arg("arr"), py::arg("seed") = 0);
+    
+    // Bind the overlap check used before writing transform() destinations
+    m.def("overlapping_ranges", &pybase::overlapping_ranges,
+          "Index pairs of outputs, and of inputs and outputs, whose memory ranges overlap",
+          py::arg("inputs"), py::arg("outputs"));
     
     // Bind the create_new_key function
     m.def("create_new_key", &pybase::create_new_key,
           "Create a new key by appending suffix",
           py::arg("key"), py::arg("suffix") = "_new");
+    m.def("create_new_keys", &pybase::create_new_keys,
+          "Create new keys for a sequence of keys in one call",
+          py::arg("keys"), py::arg("suffix") = "_new", py::arg("cache") = py::none(),
+          py::arg("cache_size") = std::numeric_limits<size_t>::max());
+    
+    // Bind the SIMD dispatch helpers
+    m.def("simd_backend", &pybase::simd_backend,
+          "Name of the active SIMD scale kernel");
+    m.def("supported_simd_backends", &pybase::supported_simd_backends,
+          "SIMD scale kernels supported by the running CPU");
+    m.def("set_simd_backend", &pybase::set_simd_backend,
+          "Select a supported SIMD scale kernel",
+          py::arg("name"));
     
     // Add module attributes
     m.attr("__version__") = "1.0.0";
     m.attr("__author__") = "damon";
+    m.attr("PARALLEL_THRESHOLD") = pybase::kParallelThreshold;
 } 
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+基准测试套件功能测试
+"""
+
+import json
+
+import pytest
+import numpy as np
+from .common import unit_test, integration_test
+from pybase import bench
+
+
+def make_report(medians):
+    """根据 {用例名: p50} 构造最小报告"""
+    return {
+        "version": bench.REPORT_VERSION,
+        "results": [{"name": name, "seconds": {"p50": p50}} for name, p50 in medians.items()],
+    }
+
+
+@unit_test
+def test_bench_run_report(tmp_path):
+    """测试报告结构、百分位数和带宽"""
+    report = bench.run(repeat=5, warmup=1, min_sample_time=1e-4, match="size=1024,dtype=float32")
+    
+    assert report["version"] == bench.REPORT_VERSION
+    assert report["config"]["match"] == "size=1024,dtype=float32"
+    assert set(report["host"]) >= {"pybase", "python", "numpy", "machine", "cpu_count", "cpp"}
+    assert [result["params"]["layout"] for result in report["results"]] == ["contiguous", "strided", "fortran"]
+    
+    for result in report["results"]:
+        seconds = result["seconds"]
+        assert result["benchmark"] == "scale_array"
+        assert result["repeat"] == 5 and result["number"] >= 1
+        assert 0 < seconds["min"] <= seconds["p50"] <= seconds["p90"] <= seconds["p99"]
+        # float32 输入 + float64 输出
+        assert result["bytes"] == 1024 * (4 + 8)
+        assert result["gbps"] == pytest.approx(result["bytes"] / seconds["p50"] / 1e9)
+        assert result["items_per_second"] == pytest.approx(1024 / seconds["p50"])
+    
+    # JSON 往返
+    path = bench.save(report, tmp_path / "report.json")
+    assert bench.load(path) == json.loads(json.dumps(report))
+
+
+@unit_test
+def test_bench_key_cases():
+    """测试键名基准没有带宽，并且可以只用 NumPy 后端运行"""
+    report = bench.run(repeat=3, warmup=0, min_sample_time=1e-4, backend="numpy", match="keys=100]")
+    
+    assert [result["name"] for result in report["results"]] == [
+        "create_new_key[keys=100]", "create_new_keys[keys=100]",
+    ]
+    for result in report["results"]:
+        assert result["bytes"] is None and result["gbps"] is None
+        assert result["items"] == 100
+
+
+@unit_test
+def test_bench_suites_cover_matrix():
+    """测试套件覆盖尺寸、类型、键数和内存布局，且 full 包含 quick"""
+    quick = [bench._case_name(name, params) for name, params, _ in bench._cases("quick", "auto", None, 0)]
+    full = [bench._case_name(name, params) for name, params, _ in bench._cases("full", "auto", None, 0)]
+    
+    assert len(set(quick)) == len(quick)
+    assert set(quick) <= set(full)
+    for part in ("layout=contiguous", "layout=strided", "layout=fortran", "dtype=int32",
+                 "transform[keys=10000", "create_new_key[", "create_new_keys["):
+        assert any(part in name for name in quick), part
+
+
+@unit_test
+def test_bench_inputs_layout():
+    """测试输入数组的内存布局和可复现性"""
+    rng = np.random.default_rng(0)
+    strided = bench._make_array(1024, "float32", "strided", rng)
+    fortran = bench._make_array(1024, "int32", "fortran", rng)
+    
+    assert strided.dtype == np.float32 and strided.size == 1024 and not strided.flags.c_contiguous
+    assert fortran.flags.f_contiguous and not fortran.flags.c_contiguous and fortran.size == 1024
+    np.testing.assert_array_equal(
+        bench._make_array(16, "float64", "contiguous", np.random.default_rng(1)),
+        bench._make_array(16, "float64", "contiguous", np.random.default_rng(1)),
+    )
+
+
+@unit_test
+def test_bench_compare():
+    """测试报告对比的状态判定"""
+    baseline = make_report({"a": 1.0, "b": 1.0, "c": 1.0, "gone": 1.0})
+    current = make_report({"a": 1.05, "b": 1.5, "c": 0.5, "new": 1.0})
+    
+    rows = {row["name"]: row for row in bench.compare(baseline, current, threshold=0.1)}
+    
+    assert [name for name in rows] == ["a", "b", "c", "new", "gone"]
+    assert rows["a"]["status"] == "unchanged"
+    assert rows["b"]["status"] == "regression" and rows["b"]["ratio"] == pytest.approx(1.5)
+    assert rows["c"]["status"] == "improvement"
+    assert rows["new"]["status"] == "added" and rows["new"]["baseline"] is None
+    assert rows["gone"]["status"] == "removed" and rows["gone"]["current"] is None
+
+
+@unit_test
+def test_bench_invalid_arguments(tmp_path):
+    """测试无效参数"""
+    with pytest.raises(ValueError, match="suite"):
+        bench.run(suite="huge")
+    with pytest.raises(ValueError, match="repeat"):
+        bench.run(repeat=0)
+    with pytest.raises(ValueError, match="warmup"):
+        bench.run(warmup=-1)
+    with pytest.raises(ValueError, match="min_sample_time"):
+        bench.run(min_sample_time=0)
+    with pytest.raises(ValueError, match="threshold"):
+        bench.compare(make_report({}), make_report({}), threshold=-1)
+    
+    path = tmp_path / "other.json"
+    path.write_text(json.dumps({"version": 0, "results": []}))
+    with pytest.raises(ValueError, match="benchmark report"):
+        bench.load(path)
+
+
+@integration_test
+def test_bench_transform_cases():
+    """测试 transform 基准（多键）"""
+    report = bench.run(repeat=3, warmup=1, min_sample_time=1e-4, match="transform[keys=100,")
+    
+    (result,) = report["results"]
+    assert result["params"] == {"keys": 100, "size": 1024, "dtype": "float64"}
+    assert result["bytes"] == 100 * 1024 * 16
+    assert result["gbps"] > 0
@@ -79,6 +79,7 @@ def test_cli_command_structure():
     assert 'hello' in cli.commands
     assert 'list' in cli.commands
     assert 'progress' in cli.commands
+    assert 'bench' in cli.commands
 
 
 @integration_test
@@ -97,4 +98,49 @@ def test_cli_full_workflow(cli_helper):
     
     for cmd in commands:
         result = cli_helper.run_cli_command(cli, cmd)
-        assert_cli_success(result) 
\ No newline at end of file
+        assert_cli_success(result) 
+
+@cli_test
+def test_cli_bench_json(cli_helper, tmp_path):
+    """测试 bench 命令输出并保存 JSON 报告"""
+    import json
+    from pybase.cli import cli
+    
+    output = tmp_path / "bench.json"
+    result = cli_helper.run_cli_command(cli, [
+        "bench", "--match", "keys=100]", "--repeat", "3", "--warmup", "1", "--json", "-o", str(output),
+    ])
+    assert_cli_success(result)
+    
+    report = json.loads(result.output)
+    assert [r["name"] for r in report["results"]] == ["create_new_key[keys=100]", "create_new_keys[keys=100]"]
+    assert json.loads(output.read_text()) == report
+
+
+@cli_test
+def test_cli_bench_compare(cli_helper, tmp_path):
+    """测试 bench 命令与基线对比，出现回归时返回非零退出码"""
+    import json
+    from pybase.cli import cli
+    
+    baseline = tmp_path / "baseline.json"
+    result = cli_helper.run_cli_command(cli, [
+        "bench", "--match", "create_new_keys[keys=100]", "--repeat", "3", "-o", str(baseline),
+    ])
+    assert_cli_success(result)
+    assert_cli_output_contains(result, "create_new_keys[keys=100]")
+    
+    # 宽松阈值下不判定为回归
+    args = ["bench", "--match", "create_new_keys[keys=100]", "--repeat", "3", "--compare", str(baseline)]
+    result = cli_helper.run_cli_command(cli, args + ["--threshold", "100"])
+    assert_cli_success(result)
+    assert_cli_output_contains(result, "与基线对比")
+    
+    # 把基线改得极快，当前结果必然是回归
+    report = json.loads(baseline.read_text())
+    for entry in report["results"]:
+        entry["seconds"]["p50"] = 1e-12
+    baseline.write_text(json.dumps(report))
+    result = cli_helper.run_cli_command(cli, args)
+    assert result.exit_code == 1
+    assert_cli_output_contains(result, "regression")
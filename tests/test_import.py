@@ -0,0 +1,144 @@
+"""
+导入开销测试
+
+每个用例都在独立的子进程中运行，保证 sys.modules 是干净的
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from .common import unit_test, slow_test
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# pybase.transform 在 numpy 之后的导入耗时预算（秒），留出未缓存字节码时的余量
+IMPORT_BUDGET = 0.1
+
+
+def run_python(code: str) -> dict:
+    """在 -W error 的子进程中运行代码，返回其打印的 JSON"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-W", "error", "-c", textwrap.dedent(code)],
+        capture_output=True, text=True, env=env, check=False,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+@unit_test
+def test_import_pybase_is_lazy():
+    """测试 import pybase 不导入 numpy，属性在首次访问时加载"""
+    state = run_python("""
+        import json, sys
+        import pybase
+        before = "numpy" in sys.modules or "pybase.transform" in sys.modules
+        scale_array = pybase.scale_array
+        print(json.dumps({
+            "before": before,
+            "loaded": "pybase.transform" in sys.modules,
+            "same": scale_array is sys.modules["pybase.transform"].scale_array,
+            "listed": "scale_array" in dir(pybase) and "transform_npz" in pybase.__all__,
+        }))
+    """)
+    
+    assert state == {"before": False, "loaded": True, "same": True, "listed": True}
+
+
+@unit_test
+def test_import_pybase_unknown_attribute():
+    """测试未知属性仍抛出 AttributeError"""
+    state = run_python("""
+        import json
+        import pybase
+        try:
+            pybase.missing
+        except AttributeError as error:
+            print(json.dumps({"error": str(error)}))
+    """)
+    
+    assert "missing" in state["error"]
+
+
+@unit_test
+def test_pybase_version_from_metadata():
+    """测试 __version__ 来自安装包元数据，未安装时给出占位版本"""
+    state = run_python("""
+        import json, sys
+        import importlib.metadata as metadata
+        import pybase
+        try:
+            expected = metadata.version("pybase")
+        except metadata.PackageNotFoundError:
+            expected = "0+unknown"
+        version = pybase.__version__
+        metadata.version = lambda name: "9.9.9"
+        print(json.dumps({"version": version, "expected": expected, "cached": pybase.__version__}))
+    """)
+    
+    assert state["version"] == state["expected"]
+    assert state["cached"] == state["version"]
+
+
+@unit_test
+def test_import_transform_defers_heavy_modules():
+    """测试导入 pybase.transform 不加载扩展、asyncio 和进程池，首次调用时才加载扩展"""
+    state = run_python("""
+        import json, sys
+        import numpy as np
+        import pybase.transform as t
+        heavy = ["pybase._transform", "asyncio", "concurrent.futures", "multiprocessing"]
+        loaded = [name for name in heavy if name in sys.modules]
+        t.scale_array(np.ones(4), 0.5)
+        print(json.dumps({"loaded": loaded, "extension": "pybase._transform" in sys.modules}))
+    """)
+    
+    assert state["loaded"] == []
+    assert state["extension"]
+
+
+@unit_test
+def test_missing_extension_warns_on_first_use():
+    """测试缺少扩展时导入不告警，首次使用时告警一次并回退到 NumPy"""
+    state = run_python("""
+        import json, sys, warnings
+        sys.modules["pybase._transform"] = None
+        import numpy as np
+        import pybase.transform as t
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            first = t.scale_array(np.ones(4), 0.5).tolist()
+            t.scale_array(np.ones(4), 0.5)
+        print(json.dumps({
+            "first": first,
+            "warnings": [str(w.message) for w in caught],
+            "available": t.get_cpp_availability(),
+        }))
+    """)
+    
+    assert state["first"] == [0.5] * 4
+    assert state["warnings"] == ["C++ transform module not available. Using Python fallback."]
+    assert state["available"] is False
+
+
+@slow_test
+def test_import_time_budget():
+    """测试 numpy 已导入时 pybase.transform 的导入耗时不超过预算"""
+    timings = [
+        run_python("""
+            import json, time
+            import numpy
+            start = time.perf_counter()
+            import pybase.transform
+            print(json.dumps({"seconds": time.perf_counter() - start}))
+        """)["seconds"]
+        for _ in range(3)
+    ]
+    
+    assert min(timings) < IMPORT_BUDGET, timings
@@ -0,0 +1,181 @@
+"""
+NPY/NPZ 文件转换功能测试
+"""
+
+import zipfile
+
+import pytest
+import numpy as np
+from .common import unit_test, integration_test
+from pybase.npyio import transform_npy, transform_npz
+
+
+@unit_test
+def test_transform_npy_basic(tmp_path):
+    """测试基本的 .npy 文件转换"""
+    src = tmp_path / "input.npy"
+    dst = tmp_path / "output.npy"
+    data = np.random.random((37, 53))
+    np.save(src, data)
+    
+    result = transform_npy(src, dst, factor=0.5, chunk_bytes=1000)
+    
+    assert result == dst
+    output = np.load(dst)
+    assert output.dtype == np.float64
+    assert output.shape == data.shape
+    np.testing.assert_array_almost_equal(output, data * 0.5)
+    
+    # 输入文件不被修改
+    np.testing.assert_array_equal(np.load(src), data)
+
+
+@unit_test
+def test_transform_npy_dtypes_and_order(tmp_path):
+    """测试不同数据类型、字节序和 Fortran 顺序"""
+    cases = {
+        "int32": np.arange(1000, dtype=np.int32).reshape(10, 100),
+        "float32": np.linspace(0, 1, 999, dtype=np.float32),
+        "big_endian": np.arange(500, dtype=">f8"),
+        "fortran": np.asfortranarray(np.random.random((20, 30))),
+        "empty": np.zeros((0, 4)),
+    }
+    
+    for name, data in cases.items():
+        src = tmp_path / f"{name}.npy"
+        dst = tmp_path / f"{name}_new.npy"
+        np.save(src, data)
+        
+        transform_npy(src, dst, chunk_bytes=4096, backend="numpy" if name == "empty" else "auto")
+        
+        output = np.load(dst)
+        assert output.shape == data.shape, name
+        np.testing.assert_array_almost_equal(output, data.astype(np.float64) * 0.3, err_msg=name)
+        if name == "fortran":
+            assert output.flags.f_contiguous
+
+
+@unit_test
+def test_transform_npy_invalid(tmp_path):
+    """测试无效输入"""
+    src = tmp_path / "input.npy"
+    np.save(src, np.ones(10))
+    
+    with pytest.raises(ValueError, match="different files"):
+        transform_npy(src, src)
+    
+    with pytest.raises(ValueError, match="chunk_bytes"):
+        transform_npy(src, tmp_path / "out.npy", chunk_bytes=0)
+    
+    strings = tmp_path / "strings.npy"
+    np.save(strings, np.array(["a", "b"]))
+    with pytest.raises(TypeError, match="must be numeric"):
+        transform_npy(strings, tmp_path / "out.npy")
+    
+    not_npy = tmp_path / "text.npy"
+    not_npy.write_text("not an npy file")
+    with pytest.raises(ValueError):
+        transform_npy(not_npy, tmp_path / "out.npy")
+
+
+@integration_test
+def test_transform_npy_large_file(tmp_path):
+    """测试多块大文件转换"""
+    src = tmp_path / "large.npy"
+    dst = tmp_path / "large_new.npy"
+    data = np.lib.format.open_memmap(src, mode="w+", dtype=np.float32, shape=(2000, 1500))
+    data[:] = np.arange(1500, dtype=np.float32)
+    data.flush()
+    del data
+    
+    transform_npy(src, dst, factor=2.0, chunk_bytes=1 << 20)
+    
+    output = np.load(dst, mmap_mode="r")
+    np.testing.assert_array_equal(output[0], np.arange(1500) * 2.0)
+    np.testing.assert_array_equal(output[-1], np.arange(1500) * 2.0)
+
+
+@unit_test
+def test_transform_npz_basic(tmp_path):
+    """测试 .npz 归档逐成员转换"""
+    src = tmp_path / "input.npz"
+    dst = tmp_path / "output.npz"
+    arrays = {
+        "a": np.random.random((30, 40)),
+        "b": np.arange(100, dtype=np.int16),
+        "c": np.asfortranarray(np.random.random((5, 7)).astype(np.float32)),
+        "empty": np.zeros((0, 3)),
+    }
+    np.savez_compressed(src, **arrays)
+    
+    result = transform_npz(src, dst, factor=0.5)
+    
+    assert result == dst
+    with np.load(dst) as output, zipfile.ZipFile(dst) as archive:
+        # 键名与顺序与 transform() 一致，压缩方式与输入一致
+        assert list(output.keys()) == [f"{key}_new" for key in arrays]
+        assert all(info.compress_type == zipfile.ZIP_DEFLATED for info in archive.infolist())
+        for key, data in arrays.items():
+            assert output[f"{key}_new"].dtype == np.float64
+            np.testing.assert_array_almost_equal(output[f"{key}_new"], data * 0.5, err_msg=key)
+        assert output["c_new"].flags.f_contiguous
+    
+    # 输入文件不被修改
+    with np.load(src) as original:
+        np.testing.assert_array_equal(original["a"], arrays["a"])
+
+
+@unit_test
+def test_transform_npz_invalid(tmp_path):
+    """测试 .npz 无效输入"""
+    src = tmp_path / "input.npz"
+    np.savez(src, x=np.ones(3))
+    
+    with pytest.raises(ValueError, match="different files"):
+        transform_npz(src, src)
+    
+    strings = tmp_path / "strings.npz"
+    np.savez(strings, x=np.ones(3), s=np.array(["a", "b"]))
+    with pytest.raises(TypeError, match="must be numeric"):
+        transform_npz(strings, tmp_path / "out.npz")
+    
+    other = tmp_path / "other.npz"
+    with zipfile.ZipFile(other, "w") as archive:
+        archive.writestr("notes.txt", "not an array")
+    with pytest.raises(ValueError, match="not a .npy array"):
+        transform_npz(other, tmp_path / "out.npz")
+
+
+@unit_test
+def test_npyio_output_dtype(tmp_path):
+    """测试 .npy / .npz 转换的 output_dtype"""
+    data = np.asfortranarray(np.random.random((37, 53)).astype(np.float32))
+    ints = np.arange(-500, 500, dtype=np.int16)
+    np.save(tmp_path / "f.npy", data)
+    np.save(tmp_path / "i.npy", ints)
+    
+    # 分块边界与输出元素大小一致
+    transform_npy(tmp_path / "f.npy", tmp_path / "f_out.npy", factor=0.5, chunk_bytes=1000,
+                  output_dtype="same")
+    output = np.load(tmp_path / "f_out.npy")
+    assert output.dtype == np.float32 and output.flags.f_contiguous
+    np.testing.assert_array_equal(output, (data.astype(np.float64) * 0.5).astype(np.float32))
+    
+    transform_npy(tmp_path / "i.npy", tmp_path / "i_out.npy", chunk_bytes=100, output_dtype=np.int8)
+    output = np.load(tmp_path / "i_out.npy")
+    assert output.dtype == np.int8
+    np.testing.assert_array_equal(output, np.clip(np.rint(ints * 0.3), -128, 127))
+    
+    with pytest.raises(TypeError, match="Integer output dtype"):
+        transform_npy(tmp_path / "f.npy", tmp_path / "bad.npy", output_dtype=np.int32)
+    with pytest.raises(ValueError, match="Unsupported output_dtype"):
+        transform_npy(tmp_path / "f.npy", tmp_path / "bad.npy", output_dtype=np.complex64)
+    
+    np.savez(tmp_path / "in.npz", f=data, i=ints)
+    transform_npz(tmp_path / "in.npz", tmp_path / "out.npz", output_dtype="same")
+    with np.load(tmp_path / "out.npz") as output:
+        assert output["f_new"].dtype == np.float32 and output["i_new"].dtype == np.int16
+        np.testing.assert_array_equal(output["i_new"], np.rint(ints * 0.3))
+    transform_npz(tmp_path / "in.npz", tmp_path / "out.npz", output_dtype=np.float16)
+    with np.load(tmp_path / "out.npz") as output:
+        assert output["f_new"].dtype == np.float16 and output["i_new"].dtype == np.float16
@@ -5,7 +5,14 @@ Transform 功能测试
 import pytest
 import numpy as np
 from .common import cpp_test, unit_test, integration_test
-from pybase.transform import transform, scale_array, create_new_key, get_cpp_availability
+from pybase.transform import (
+    transform, scale_array, create_new_key, get_cpp_availability,
+    get_num_threads, set_num_threads, get_simd_backend, set_simd_backend,
+    transform_stream, atransform, ascale_array, get_async_concurrency,
+    set_async_concurrency, LazyTransformResult, Pipeline, set_cache_size,
+    get_cache_info, clear_cache, IncrementalTransformer, create_new_keys,
+    Transformer, BufferPool,
+)
 
 
 @cpp_test
@@ -269,4 +276,1549 @@ def test_transform_preserves_input():
     np.testing.assert_array_equal(original_array, np.array([1.0, 2.0, 3.0]))
     
     # 验证结果数组是新的
-    assert result["test_new"] is not original_array 
\ No newline at end of file
+    assert result["test_new"] is not original_array 
+
+@cpp_test
+def test_transform_fused_cast_dtypes():
+    """测试各种输入类型在 C++ 内核中直接转换为 float64"""
+    dtypes = [np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16,
+              np.uint32, np.uint64, np.float16, np.float32, np.float64]
+    input_dict = {np.dtype(dt).name: np.arange(6, dtype=dt).reshape(2, 3) for dt in dtypes}
+    
+    result = transform(input_dict)
+    
+    expected = np.arange(6, dtype=np.float64).reshape(2, 3) * 0.3
+    for dt in dtypes:
+        out = result[np.dtype(dt).name + "_new"]
+        assert out.dtype == np.float64
+        np.testing.assert_array_almost_equal(out, expected)
+
+
+@cpp_test
+def test_transform_non_contiguous_and_byteswapped():
+    """测试非连续数组和非本机字节序数组"""
+    base = np.arange(12, dtype=np.float64).reshape(3, 4)
+    input_dict = {
+        "transposed": base.T,
+        "sliced": base[:, ::2],
+        "big_endian": base.astype(">f8"),
+    }
+    
+    result = transform(input_dict)
+    
+    np.testing.assert_array_almost_equal(result["transposed_new"], base.T * 0.3)
+    np.testing.assert_array_almost_equal(result["sliced_new"], base[:, ::2] * 0.3)
+    np.testing.assert_array_almost_equal(result["big_endian_new"], base * 0.3)
+
+
+@cpp_test
+def test_scale_array_out_and_inplace():
+    """测试 scale_array 的 out 参数和原地模式"""
+    arr = np.array([[1.0, 2.0], [3.0, 4.0]])
+    out = np.empty_like(arr)
+    
+    result = scale_array(arr, factor=0.5, out=out)
+    assert result is out
+    np.testing.assert_array_almost_equal(out, [[0.5, 1.0], [1.5, 2.0]])
+    
+    # 整数输入写入 float64 目标数组
+    scale_array(np.array([[1, 2], [3, 4]], dtype=np.int32), factor=2.0, out=out)
+    np.testing.assert_array_almost_equal(out, [[2.0, 4.0], [6.0, 8.0]])
+    
+    result = scale_array(arr, factor=2.0, inplace=True)
+    assert result is arr
+    np.testing.assert_array_almost_equal(arr, [[2.0, 4.0], [6.0, 8.0]])
+
+
+@cpp_test
+def test_scale_array_out_overlapping():
+    """测试与输入部分重叠的 out 数组"""
+    buf = np.arange(6, dtype=np.float64)
+    scale_array(buf[:5], factor=2.0, out=buf[1:])
+    np.testing.assert_array_almost_equal(buf[1:], [0.0, 2.0, 4.0, 6.0, 8.0])
+
+
+@unit_test
+def test_scale_array_out_invalid():
+    """测试无效的 out / inplace 参数"""
+    arr = np.array([1.0, 2.0, 3.0])
+    
+    with pytest.raises(ValueError, match="has shape"):
+        scale_array(arr, out=np.empty(4))
+    
+    with pytest.raises(TypeError, match="dtype float64"):
+        scale_array(arr, out=np.empty(3, dtype=np.float32))
+    
+    readonly = np.empty(3)
+    readonly.flags.writeable = False
+    with pytest.raises(ValueError, match="must be writeable"):
+        scale_array(arr, out=readonly)
+    
+    with pytest.raises(ValueError, match="mutually exclusive"):
+        scale_array(arr, out=np.empty(3), inplace=True)
+    
+    with pytest.raises(TypeError, match="dtype float64"):
+        scale_array(np.array([1, 2, 3]), inplace=True)
+    
+    with pytest.raises(ValueError, match="requires a numpy array"):
+        scale_array([1.0, 2.0], inplace=True)
+
+
+@cpp_test
+def test_transform_out_and_inplace():
+    """测试 transform 的 out 参数和原地模式"""
+    input_dict = {"a": np.array([1.0, 2.0]), "b": np.array([[1, 2], [3, 4]])}
+    
+    first = transform(input_dict)
+    buffers = {key: value for key, value in first.items()}
+    
+    # 复用上一次的结果作为输出缓冲区
+    second = transform(input_dict, out=buffers)
+    assert second["a_new"] is buffers["a_new"]
+    assert second["b_new"] is buffers["b_new"]
+    np.testing.assert_array_almost_equal(second["b_new"], [[0.3, 0.6], [0.9, 1.2]])
+    
+    # 部分提供的 out 字典：缺失的键重新分配
+    partial = transform(input_dict, out={"a_new": np.zeros(2)})
+    np.testing.assert_array_almost_equal(partial["b_new"], [[0.3, 0.6], [0.9, 1.2]])
+    
+    inputs = {"x": np.array([1.0, 2.0, 3.0])}
+    original = inputs["x"]
+    result = transform(inputs, inplace=True)
+    assert result["x_new"] is original
+    np.testing.assert_array_almost_equal(original, [0.3, 0.6, 0.9])
+    
+    with pytest.raises(ValueError, match="has shape"):
+        transform(input_dict, out={"a_new": np.zeros(3)})
+    
+    with pytest.raises(TypeError, match="dtype float64"):
+        transform({"i": np.array([1, 2])}, inplace=True)
+
+
+@pytest.mark.parametrize("backend", ["auto", "numpy"])
+@unit_test
+def test_transform_cross_key_aliasing(backend):
+    """测试一个键的输出与另一个键的输入重叠"""
+    x = np.array([1.0, 2.0])
+    y = np.array([2.0, 2.0])
+    
+    # a 的输出就是 b 的输入：b 必须读到原始的 y
+    result = transform({"a": x, "b": y}, out={"a_new": y}, backend=backend)
+    assert result["a_new"] is y
+    np.testing.assert_array_almost_equal(result["a_new"], [0.3, 0.6])
+    np.testing.assert_array_almost_equal(result["b_new"], [0.6, 0.6])
+    
+    # 输出是另一个键输入的一部分（多线程时顺序不确定）
+    buf = np.arange(8, dtype=np.float64)
+    expected = {"a_new": buf[4:] * 0.3, "b_new": buf[2:6] * 0.3}
+    result = transform({"a": buf[4:].copy(), "b": buf[2:6]}, out={"a_new": buf[:4]},
+                       threads=2, backend=backend)
+    np.testing.assert_array_almost_equal(result["a_new"], expected["a_new"])
+    np.testing.assert_array_almost_equal(result["b_new"], expected["b_new"])
+    
+    # 交错但不重叠的输出是允许的
+    buf = np.zeros(8)
+    result = transform({"a": np.ones(4), "b": np.full(4, 2.0)},
+                       out={"a_new": buf[::2], "b_new": buf[1::2]}, backend=backend)
+    np.testing.assert_array_almost_equal(buf, [0.3, 0.6] * 4)
+    
+    # 两个键的输出缓冲区重叠
+    with pytest.raises(ValueError, match="overlap"):
+        transform({"a": x, "b": y}, out={"a_new": buf[:2], "b_new": buf[1:3]}, backend=backend)
+
+
+@pytest.mark.parametrize("backend", ["auto", "numpy"])
+@unit_test
+def test_transform_inplace_duplicate_input(backend):
+    """测试 inplace=True 时同一数组出现在两个键下"""
+    x = np.array([1.0, 2.0, 3.0])
+    
+    with pytest.raises(ValueError, match="overlap"):
+        transform({"a": x, "b": x}, inplace=True, backend=backend)
+    # 出错时不能已经缩放过
+    np.testing.assert_array_equal(x, [1.0, 2.0, 3.0])
+    
+    # 重叠的视图同样被拒绝
+    with pytest.raises(ValueError, match="overlap"):
+        transform({"a": x[:2], "b": x[1:]}, inplace=True, backend=backend)
+    np.testing.assert_array_equal(x, [1.0, 2.0, 3.0])
+    
+    # 不重叠的视图仍可原地缩放
+    result = transform({"a": x[:1], "b": x[1:]}, inplace=True, backend=backend)
+    np.testing.assert_array_almost_equal(x, [0.3, 0.6, 0.9])
+    assert np.shares_memory(result["b_new"], x)
+
+
+@cpp_test
+def test_overlapping_ranges_matches_python(monkeypatch):
+    """测试原生重叠检测与纯 Python 实现结果一致"""
+    import pybase.transform as transform_module
+    buffer = np.zeros(64)
+    rng = np.random.default_rng(0)
+    inputs, outputs = [], []
+    for _ in range(40):
+        start, stop = sorted(rng.integers(0, 64, size=2))
+        step = int(rng.choice([1, 2, -1]))
+        view = buffer[start:stop + 1][::step]
+        inputs.append(view if rng.random() < 0.5 else np.ones(3))
+        outputs.append(None if rng.random() < 0.3 else (inputs[-1] if rng.random() < 0.2 else view))
+    inputs.append(np.ones(0))
+    outputs.append(np.ones(0))
+    
+    native = transform_module._overlapping_ranges(inputs, outputs)
+    monkeypatch.setattr(transform_module, "_CPP_AVAILABLE", False)
+    python = transform_module._overlapping_ranges(inputs, outputs)
+    assert sorted(map(sorted, native[0])) == sorted(map(sorted, python[0]))
+    assert sorted(native[1]) == sorted(python[1])
+    assert native[1] and all(outputs[j] is not inputs[i] or i != j for i, j in native[1])
+
+
+@cpp_test
+def test_scale_array_threads():
+    """测试多线程缩放与单线程结果一致"""
+    arr = np.random.random((513, 1021))
+    
+    serial = scale_array(arr, factor=0.7, threads=1)
+    threaded = scale_array(arr, factor=0.7, threads=4)
+    np.testing.assert_array_equal(serial, threaded)
+    np.testing.assert_array_almost_equal(threaded, arr * 0.7)
+    
+    # 多线程写入 out 缓冲区和 transform
+    out = np.empty_like(arr)
+    scale_array(arr.astype(np.float32), factor=0.7, out=out, threads=3)
+    np.testing.assert_array_almost_equal(out, arr.astype(np.float32) * 0.7)
+    
+    result = transform({"big": arr}, threads=4)
+    np.testing.assert_array_almost_equal(result["big_new"], arr * 0.3)
+
+
+@unit_test
+def test_num_threads_config():
+    """测试默认线程数配置"""
+    original = get_num_threads()
+    try:
+        set_num_threads(2)
+        assert get_num_threads() == 2
+        np.testing.assert_array_almost_equal(scale_array([1.0, 2.0]), [0.3, 0.6])
+    finally:
+        set_num_threads(original)
+    
+    for invalid in (0, -1, 1.5, None):
+        with pytest.raises(ValueError, match="positive integer"):
+            set_num_threads(invalid)
+    
+    with pytest.raises(ValueError, match="positive integer"):
+        scale_array(np.ones(3), threads=0)
+
+
+@unit_test
+def test_default_threads_follow_affinity(monkeypatch):
+    """测试默认线程数遵循 CPU 亲和性，而不是机器的全部核心数"""
+    import os
+    import pybase.transform as transform_module
+    
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 3}, raising=False)
+    monkeypatch.setattr(os, "cpu_count", lambda: 64)
+    assert transform_module._available_cpus() == 2
+    
+    monkeypatch.delattr(os, "sched_getaffinity", raising=False)
+    assert transform_module._available_cpus() == 64
+
+
+@cpp_test
+def test_scale_array_releases_gil():
+    """测试原生缩放期间释放 GIL，其它 Python 线程可以继续运行"""
+    import sys
+    import threading
+    import time
+    if not get_cpp_availability():
+        pytest.skip("C++ 实现不可用")
+    
+    arr = np.random.random(1 << 23)
+    out = np.empty_like(arr)
+    counter = [0]
+    started = threading.Event()
+    stop = threading.Event()
+    
+    def spin():
+        started.set()
+        while not stop.is_set():
+            counter[0] += 1
+            # 主动让出 GIL；解释器不会再按时间片切换线程
+            time.sleep(0)
+    
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(100)
+    thread = threading.Thread(target=spin, daemon=True)
+    try:
+        thread.start()
+        started.wait()
+        progress = []
+        for _ in range(3):
+            before = counter[0]
+            scale_array(arr, 0.5, out=out, threads=1, backend="cpp")
+            progress.append(counter[0] - before)
+    finally:
+        stop.set()
+        sys.setswitchinterval(interval)
+        thread.join()
+    
+    # 持有 GIL 的调用期间计数线程完全无法运行
+    assert min(progress) > 10, progress
+    np.testing.assert_array_equal(out, arr * 0.5)
+
+
+@cpp_test
+def test_transform_parallel_keys():
+    """测试多个键在多线程下并行处理"""
+    rng = np.random.default_rng(0)
+    sizes = [1, 7, 100, 5000, 70000, 150000, 300000]
+    input_dict = {f"key{i}": rng.random(size) for i, size in enumerate(sizes * 3)}
+    input_dict["int_key"] = np.arange(200000, dtype=np.int64)
+    
+    serial = transform(input_dict, threads=1)
+    parallel = transform(input_dict, threads=4)
+    
+    assert serial.keys() == parallel.keys()
+    for key, value in input_dict.items():
+        np.testing.assert_array_equal(parallel[key + "_new"], serial[key + "_new"])
+        np.testing.assert_array_almost_equal(parallel[key + "_new"], value * 0.3)
+    
+    # 并行模式写入预分配的输出
+    reused = transform(input_dict, out=parallel, threads=4)
+    assert all(reused[key] is parallel[key] for key in parallel)
+
+
+@cpp_test
+def test_simd_backends_agree():
+    """测试所有受支持的 SIMD 内核结果一致"""
+    if not get_cpp_availability():
+        pytest.skip("C++ implementation not available")
+    from pybase import _transform
+    
+    backends = _transform.supported_simd_backends()
+    assert backends[0] == "baseline"
+    assert get_simd_backend() == backends[-1]
+    
+    # 长度不是向量宽度整数倍，覆盖尾部处理
+    arr64 = np.random.random(1037)
+    arr32 = arr64.astype(np.float32)
+    try:
+        for backend in backends:
+            set_simd_backend(backend)
+            assert get_simd_backend() == backend
+            np.testing.assert_array_equal(scale_array(arr64, 0.3), arr64 * 0.3)
+            np.testing.assert_array_equal(scale_array(arr32, 0.3), arr32.astype(np.float64) * 0.3)
+    finally:
+        set_simd_backend(backends[-1])
+    
+    with pytest.raises(ValueError, match="not supported"):
+        set_simd_backend("neon")
+
+
+@cpp_test
+def test_scale_array_strided_views():
+    """测试转置、切片、Fortran 顺序、负步长和广播视图"""
+    base = np.arange(4 * 5 * 6, dtype=np.float64).reshape(4, 5, 6)
+    views = {
+        "transposed": base.T,
+        "permuted": base.transpose(1, 0, 2),
+        "column": base[:, 2, :],
+        "stepped": base[::2, :, ::3],
+        "reversed": base[::-1, :, ::-1],
+        "fortran": np.asfortranarray(base),
+        "broadcast": np.broadcast_to(base[0, 0], (7, 6)),
+        "int_view": base.astype(np.int32)[:, ::2].T,
+        "float32_view": base.astype(np.float32)[1:, 1:, ::-2],
+    }
+    
+    for name, view in views.items():
+        result = scale_array(view, factor=0.5)
+        assert result.shape == view.shape, name
+        np.testing.assert_array_equal(result, view.astype(np.float64) * 0.5, err_msg=name)
+    
+    # Fortran 顺序输入得到 Fortran 顺序输出
+    assert scale_array(np.asfortranarray(base)).flags.f_contiguous
+    assert scale_array(base.T).flags.f_contiguous
+
+
+@cpp_test
+def test_scale_array_strided_out_and_threads():
+    """测试写入带步长的 out 以及多线程处理视图"""
+    base = np.random.random((600, 800))
+    
+    dest = np.zeros((1600, 1200))
+    view = dest[::2, ::2]
+    result = scale_array(base.T, factor=2.0, out=view, threads=4)
+    assert result is view
+    np.testing.assert_array_equal(dest[::2, ::2], base.T * 2.0)
+    assert not dest[1::2].any()
+    
+    # 原地缩放一个列切片
+    data = base.copy()
+    scale_array(data[:, 1::3], factor=3.0, inplace=True, threads=4)
+    np.testing.assert_array_equal(data[:, 1::3], base[:, 1::3] * 3.0)
+    np.testing.assert_array_equal(data[:, ::3], base[:, ::3])
+
+
+@unit_test
+def test_numpy_backend_matches_cpp():
+    """测试 NumPy 后端与 C++ 后端语义一致"""
+    base = np.random.random((300, 450))
+    input_dict = {
+        "float64": base,
+        "float32": base.astype(np.float32),
+        "int16": (base * 100).astype(np.int16),
+        "transposed": base.T,
+        "fortran": np.asfortranarray(base),
+        "sliced": base[::3, 1::2],
+        "list": [[1.0, 2.0], [3.0, 4.0]],
+    }
+    
+    result = transform(input_dict, backend="numpy")
+    
+    for key, value in input_dict.items():
+        expected = np.asarray(value, dtype=np.float64) * 0.3
+        assert result[key + "_new"].dtype == np.float64
+        np.testing.assert_array_almost_equal(result[key + "_new"], expected)
+    assert result["fortran_new"].flags.f_contiguous
+    
+    if get_cpp_availability():
+        native = transform(input_dict, backend="cpp")
+        for key in result:
+            np.testing.assert_array_almost_equal(result[key], native[key])
+
+
+@unit_test
+def test_numpy_backend_out_and_chunks():
+    """测试 NumPy 后端的 out、原地模式和分块边界"""
+    # 元素数不是分块大小的整数倍
+    arr = np.random.random(200003)
+    out = np.empty_like(arr)
+    result = scale_array(arr, factor=0.7, out=out, backend="numpy")
+    assert result is out
+    np.testing.assert_array_almost_equal(out, arr * 0.7)
+    
+    result = scale_array(np.arange(5, dtype=np.int64), factor=0.5, backend="numpy")
+    assert result.dtype == np.float64
+    np.testing.assert_array_almost_equal(result, [0.0, 0.5, 1.0, 1.5, 2.0])
+    
+    data = {"x": np.array([1.0, 2.0, 3.0])}
+    original = data["x"]
+    result = transform(data, inplace=True, backend="numpy")
+    assert result["x_new"] is original
+    np.testing.assert_array_almost_equal(original, [0.3, 0.6, 0.9])
+    
+    buf = np.arange(6, dtype=np.float64)
+    scale_array(buf[:5], factor=2.0, out=buf[1:], backend="numpy")
+    np.testing.assert_array_almost_equal(buf[1:], [0.0, 2.0, 4.0, 6.0, 8.0])
+
+
+@unit_test
+def test_backend_selection(monkeypatch):
+    """测试后端选择和无效的后端参数"""
+    with pytest.raises(ValueError, match="backend must be one of"):
+        transform({"a": np.ones(2)}, backend="fortran")
+    
+    with pytest.raises(ValueError, match="backend must be one of"):
+        scale_array(np.ones(2), backend="gpu")
+    
+    # 模拟没有 C++ 扩展的环境
+    import pybase.transform as transform_module
+    monkeypatch.setattr(transform_module, "_CPP_AVAILABLE", False)
+    
+    with pytest.raises(RuntimeError, match="not available"):
+        transform({"a": np.ones(2)}, backend="cpp")
+    
+    result = transform({"a": np.ones(2)})
+    np.testing.assert_array_almost_equal(result["a_new"], [0.3, 0.3])
+
+
+@integration_test
+def test_autotune_persists_thresholds(tmp_path, monkeypatch):
+    """测试自动调优结果写入缓存并在新进程中复用"""
+    if not get_cpp_availability():
+        pytest.skip("C++ implementation not available")
+    import pybase.transform as transform_module
+    from pybase import _autotune
+    
+    monkeypatch.setenv("PYBASE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(transform_module, "_thresholds", None)
+    
+    thresholds = transform_module.autotune()
+    assert set(thresholds) == {"native_min_size", "parallel_min_size"}
+    assert (tmp_path / "autotune.json").exists()
+    
+    # 模拟新进程：从缓存加载
+    monkeypatch.setattr(transform_module, "_thresholds", None)
+    assert transform_module._get_thresholds() == (thresholds["native_min_size"],
+                                                  thresholds["parallel_min_size"])
+    
+    # 主机签名变化或缓存损坏时使用默认值
+    signature = dict(transform_module._host_signature(), cpu_count=-1)
+    assert _autotune.load(signature) is None
+    (tmp_path / "autotune.json").write_text("{broken", encoding="utf-8")
+    assert _autotune.load(transform_module._host_signature()) is None
+
+
+@unit_test
+def test_auto_dispatch_by_size(monkeypatch):
+    """测试 auto 模式按数组大小选择后端"""
+    if not get_cpp_availability():
+        pytest.skip("C++ implementation not available")
+    import pybase.transform as transform_module
+    
+    native_calls = []
+    native_transform = transform_module._transform.transform
+    native_scale = transform_module._transform.scale_array
+    
+    def spy_transform(input_dict, out, threads, key_cache=None, **options):
+        native_calls.append((sorted(input_dict), threads))
+        return native_transform(input_dict, out, threads, key_cache, **options)
+    
+    def spy_scale(arr, factor, out, threads, **options):
+        native_calls.append((arr.size, threads))
+        return native_scale(arr, factor, out, threads, **options)
+    
+    monkeypatch.setattr(transform_module._transform, "transform", spy_transform)
+    monkeypatch.setattr(transform_module._transform, "scale_array", spy_scale)
+    monkeypatch.setattr(transform_module, "_thresholds",
+                        {"native_min_size": 100, "parallel_min_size": 1000})
+    
+    input_dict = {"small": np.ones(10), "big": np.ones(500), "tiny": [1.0, 2.0]}
+    result = transform(input_dict, threads=4)
+    
+    # 小数组走 NumPy，大数组走 C++，结果保持输入顺序
+    assert native_calls == [(["big"], 1)]
+    assert list(result) == ["small_new", "big_new", "tiny_new"]
+    np.testing.assert_array_almost_equal(result["small_new"], np.full(10, 0.3))
+    np.testing.assert_array_almost_equal(result["big_new"], np.full(500, 0.3))
+    
+    native_calls.clear()
+    scale_array(np.ones(10), threads=4)
+    scale_array(np.ones(500), threads=4)
+    scale_array(np.ones(5000), threads=4)
+    assert native_calls == [(500, 1), (5000, 4)]
+    
+    # 显式指定后端时不按大小分派
+    native_calls.clear()
+    transform(input_dict, backend="cpp", threads=4)
+    assert native_calls == [(["big", "small", "tiny"], 4)]
+
+
+@cpp_test
+def test_transform_preserves_insertion_order():
+    """测试输出字典保持输入的插入顺序"""
+    keys = ["zeta", "alpha", "mid", "beta", "键"]
+    input_dict = {key: np.array([float(i)]) for i, key in enumerate(keys)}
+    
+    for backend in ("auto", "numpy") + (("cpp",) if get_cpp_availability() else ()):
+        result = transform(input_dict, backend=backend)
+        assert list(result) == [key + "_new" for key in keys]
+        np.testing.assert_array_almost_equal(result["键_new"], [1.2])
+
+
+@cpp_test
+def test_native_transform_accepts_dict():
+    """测试 C++ 扩展直接处理 Python 字典"""
+    if not get_cpp_availability():
+        pytest.skip("C++ implementation not available")
+    from pybase import _transform
+    
+    result = _transform.transform({"b": [1.0, 2.0], "a": np.arange(3)})
+    assert list(result) == ["b_new", "a_new"]
+    np.testing.assert_array_almost_equal(result["a_new"], [0.0, 0.3, 0.6])
+    
+    with pytest.raises(TypeError, match="keys must be strings"):
+        _transform.transform({1: np.ones(2)})
+    
+    with pytest.raises(TypeError, match="out must be a dict"):
+        _transform.transform({"a": np.ones(2)}, out=[np.ones(2)])
+
+
+@unit_test
+def test_transform_stream_order_and_values():
+    """测试流式转换保持顺序并返回正确结果"""
+    def batches():
+        for i in range(20):
+            yield {"x": np.full(100, float(i)), "y": [i, i + 1]}
+    
+    results = list(transform_stream(batches(), max_in_flight=3))
+    
+    assert len(results) == 20
+    for i, result in enumerate(results):
+        assert list(result) == ["x_new", "y_new"]
+        np.testing.assert_array_almost_equal(result["x_new"], np.full(100, i * 0.3))
+        np.testing.assert_array_almost_equal(result["y_new"], [i * 0.3, (i + 1) * 0.3])
+
+
+@unit_test
+def test_transform_stream_bounded_read_ahead():
+    """测试流式转换的预读数量受 max_in_flight 限制"""
+    import time
+    produced = []
+    
+    def batches():
+        for i in range(12):
+            produced.append(i)
+            yield {"x": np.ones(10) * i}
+    
+    for i, _ in enumerate(transform_stream(batches(), max_in_flight=2)):
+        time.sleep(0.01)
+        assert len(produced) <= i + 1 + 2
+    assert len(produced) == 12
+
+
+@unit_test
+def test_transform_stream_errors_and_early_exit():
+    """测试流式转换的异常传播和提前退出"""
+    def failing():
+        yield {"x": np.ones(2)}
+        raise RuntimeError("producer failed")
+    
+    stream = transform_stream(failing())
+    np.testing.assert_array_almost_equal(next(stream)["x_new"], [0.3, 0.3])
+    with pytest.raises(RuntimeError, match="producer failed"):
+        next(stream)
+    
+    stream = transform_stream(iter([{"x": np.ones(2)}, {"x": np.array(["a"])}]))
+    next(stream)
+    with pytest.raises(TypeError, match="must be numeric"):
+        next(stream)
+    
+    # 提前退出后后台线程会结束
+    import threading
+    import time
+    stream = transform_stream({"x": np.ones(3)} for _ in range(1000))
+    next(stream)
+    stream.close()
+    deadline = time.time() + 2
+    while time.time() < deadline and any(t.name.startswith("pybase-stream") for t in threading.enumerate()):
+        time.sleep(0.01)
+    assert not any(t.name.startswith("pybase-stream") for t in threading.enumerate())
+    
+    with pytest.raises(ValueError, match="max_in_flight"):
+        transform_stream([], max_in_flight=0)
+
+
+@unit_test
+def test_atransform_matches_transform(monkeypatch):
+    """测试异步转换结果与同步版本一致，且分步执行时事件循环不被阻塞"""
+    import asyncio
+    import pybase.transform as transform_module
+    monkeypatch.setattr(transform_module, "_ASYNC_STEP_SIZE", 1000)
+    
+    input_dict = {f"key_{i}": np.random.random(300 * (i + 1)) for i in range(6)}
+    input_dict["ints"] = np.arange(50, dtype=np.int32)
+    
+    async def main():
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+        
+        task = asyncio.ensure_future(ticker())
+        results = await asyncio.gather(atransform(input_dict), atransform(input_dict, backend="numpy"))
+        task.cancel()
+        return results, ticks
+    
+    (result, numpy_result), ticks = asyncio.run(main())
+    expected = transform(input_dict)
+    assert list(result) == list(expected)
+    for key in expected:
+        np.testing.assert_array_almost_equal(result[key], expected[key])
+        np.testing.assert_array_almost_equal(numpy_result[key], expected[key])
+    assert ticks > 0
+    
+    assert asyncio.run(atransform({})) == {}
+    with pytest.raises(TypeError, match="must be numeric"):
+        asyncio.run(atransform({"x": np.array(["a"])}))
+
+
+@unit_test
+def test_atransform_aliasing_across_steps(monkeypatch):
+    """测试分步执行时，不同步骤之间的输入与目标数组重叠也会被处理"""
+    import asyncio
+    import pybase.transform as transform_module
+    monkeypatch.setattr(transform_module, "_ASYNC_STEP_SIZE", 4)
+    
+    # b 的输入是 a 的目标数组，且两者位于不同步骤
+    x = np.ones(4)
+    y = np.arange(10.0, 14.0)
+    result = asyncio.run(atransform({"a": x, "b": y}, out={"a_new": y}))
+    assert result["a_new"] is y
+    np.testing.assert_array_almost_equal(y, np.ones(4) * 0.3)
+    np.testing.assert_array_almost_equal(result["b_new"], np.arange(10.0, 14.0) * 0.3)
+    
+    # 与同步版本一致：重复的 inplace 输入在任何步骤执行前报错
+    z = np.ones(4)
+    with pytest.raises(ValueError, match="overlap"):
+        asyncio.run(atransform({"a": z, "b": z}, inplace=True))
+    np.testing.assert_array_equal(z, np.ones(4))
+    
+    # 参数错误同样在写入任何数据之前报出
+    out = {"a_new": np.zeros(4), "b_new": np.zeros(3)}
+    with pytest.raises(ValueError, match="shape"):
+        asyncio.run(atransform({"a": np.ones(4), "b": np.ones(4)}, out=out))
+    np.testing.assert_array_equal(out["a_new"], np.zeros(4))
+
+
+@unit_test
+def test_ascale_array_steps_and_cancellation(monkeypatch):
+    """测试异步缩放的分块、inplace 以及取消"""
+    import asyncio
+    import pybase.transform as transform_module
+    monkeypatch.setattr(transform_module, "_ASYNC_STEP_SIZE", 100)
+    
+    arr = np.asfortranarray(np.random.random((50, 30)))
+    result = asyncio.run(ascale_array(arr, 2.0))
+    np.testing.assert_array_almost_equal(result, arr * 2.0)
+    assert result.flags.f_contiguous
+    
+    data = np.random.random((40, 10))
+    expected = data * 0.3
+    assert asyncio.run(ascale_array(data, inplace=True)) is data
+    np.testing.assert_array_almost_equal(data, expected)
+    
+    with pytest.raises(TypeError, match="float64"):
+        asyncio.run(ascale_array(np.ones((50, 30)), out=np.zeros((50, 30), dtype=np.float32)))
+    
+    # 取消后不再执行后续步骤
+    big = np.ones((2000, 10))
+    out = np.zeros_like(big)
+    
+    async def cancel_early():
+        task = asyncio.ensure_future(ascale_array(big, out=out))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    
+    asyncio.run(cancel_early())
+    assert out[-1].sum() == 0
+
+
+@unit_test
+def test_async_concurrency_config():
+    """测试异步并发上限配置"""
+    original = get_async_concurrency()
+    try:
+        set_async_concurrency(3)
+        assert get_async_concurrency() == 3
+        
+        import asyncio
+        result = asyncio.run(atransform({"x": np.ones(4)}))
+        np.testing.assert_array_almost_equal(result["x_new"], np.ones(4) * 0.3)
+        
+        for invalid in (0, -1, 1.5, True, None):
+            with pytest.raises(ValueError, match="limit"):
+                set_async_concurrency(invalid)
+    finally:
+        set_async_concurrency(original)
+
+
+@integration_test
+def test_transform_processes_shared_memory():
+    """测试通过共享内存在进程池中分片转换"""
+    import gc
+    input_dict = {
+        "large": np.random.random(200000),
+        "fortran": np.asfortranarray(np.random.random((60, 70))),
+        "ints": np.arange(1000, dtype=">i4"),
+        "strided": np.random.random((100, 100))[::2, ::3],
+        "empty": np.zeros((0, 5)),
+    }
+    expected = transform(input_dict)
+    
+    result = transform(input_dict, processes=2)
+    
+    assert list(result) == list(expected)
+    for key in expected:
+        assert result[key].dtype == np.float64
+        np.testing.assert_array_almost_equal(result[key], expected[key], err_msg=key)
+    assert result["fortran_new"].flags.f_contiguous
+    
+    # 输出是共享内存段上的视图，其它引用释放后仍然有效
+    large = result["large_new"]
+    del result
+    gc.collect()
+    np.testing.assert_array_almost_equal(large, input_dict["large"] * 0.3)
+    
+    # 单个大数组会被拆分到多个进程
+    single = transform({"x": np.arange(100000, dtype=np.float32)}, processes=3, threads=1)
+    np.testing.assert_array_almost_equal(single["x_new"], np.arange(100000) * 0.3)
+    
+    # 工作进程不直接从（多线程的）调用进程 fork 出来
+    from pybase import _sharding
+    assert _sharding._get_pool(3)._mp_context.get_start_method() in ("forkserver", "spawn")
+    
+    # 不修改进程全局的 forkserver 预加载列表
+    import multiprocessing.forkserver
+    assert _sharding.__name__ not in multiprocessing.forkserver._forkserver._preload_modules
+
+
+@unit_test
+def test_transform_processes_invalid():
+    """测试 processes 参数校验"""
+    data = {"x": np.ones(3)}
+    for invalid in (0, -2, 1.5, True):
+        with pytest.raises(ValueError, match="processes"):
+            transform(data, processes=invalid)
+    
+    with pytest.raises(ValueError, match="processes cannot be combined"):
+        transform(data, processes=2, inplace=True)
+    
+    with pytest.raises(ValueError, match="processes cannot be combined"):
+        transform(data, out={}, processes=2)
+    
+    # processes=1 不启动进程池
+    np.testing.assert_array_almost_equal(transform(data, processes=1)["x_new"], np.ones(3) * 0.3)
+
+
+@unit_test
+def test_transform_lazy(mocker):
+    """测试惰性转换：按需计算并缓存结果"""
+    import pybase.transform as transform_module
+    spy = mocker.spy(transform_module, "scale_array")
+    input_dict = {
+        "a": np.random.random((20, 30)),
+        "b": np.arange(10, dtype=np.int32),
+        "c": np.random.random(5),
+    }
+    
+    result = transform(input_dict, lazy=True)
+    
+    assert isinstance(result, LazyTransformResult)
+    assert list(result) == ["a_new", "b_new", "c_new"]
+    assert len(result) == 3
+    assert "a_new" in result and "a" not in result
+    assert spy.call_count == 0
+    
+    # 首次访问时计算，之后复用
+    first = result["b_new"]
+    np.testing.assert_array_almost_equal(first, np.arange(10) * 0.3)
+    assert result["b_new"] is first
+    assert spy.call_count == 1
+    assert result.is_computed("b_new") and not result.is_computed("a_new")
+    
+    # 区域访问只计算请求的部分
+    region = result.region("a_new", np.s_[2:4, ::3])
+    assert region.shape == (2, 10)
+    np.testing.assert_array_almost_equal(region, input_dict["a"][2:4, ::3] * 0.3)
+    assert spy.call_args.args[0].shape == (2, 10)
+    assert result.region("a_new", np.s_[2:4, ::3]) is region
+    assert not result.is_computed("a_new")
+    np.testing.assert_array_almost_equal(result.region("a_new", [0, 5]), input_dict["a"][[0, 5]] * 0.3)
+    assert result.region("a_new", (1, 2)) == pytest.approx(input_dict["a"][1, 2] * 0.3)
+    
+    # 转为普通字典得到与立即计算相同的结果
+    expected = transform(input_dict)
+    materialized = dict(result)
+    for key in expected:
+        np.testing.assert_array_almost_equal(materialized[key], expected[key])
+    
+    with pytest.raises(KeyError):
+        result["missing_new"]
+
+
+@unit_test
+def test_transform_lazy_out_and_validation():
+    """测试惰性转换与 out 参数以及参数校验"""
+    data = np.random.random(100)
+    dest = np.zeros(100)
+    
+    result = transform({"x": data}, out={"x_new": dest}, lazy=True)
+    region = result.region("x_new", np.s_[10:20])
+    np.testing.assert_array_almost_equal(dest[10:20], data[10:20] * 0.3)
+    assert dest[:10].sum() == 0
+    assert np.shares_memory(region, dest)
+    assert result["x_new"] is dest
+    np.testing.assert_array_almost_equal(dest, data * 0.3)
+    
+    # 校验在调用时立即进行
+    with pytest.raises(TypeError, match="must be numeric"):
+        transform({"x": np.array(["a"])}, lazy=True)
+    
+    with pytest.raises(ValueError, match="lazy=True cannot be combined"):
+        transform({"x": data}, inplace=True, lazy=True)
+    
+    assert len(transform({}, lazy=True)) == 0
+
+
+@unit_test
+def test_pipeline_matches_numpy():
+    """测试融合流水线与逐步 NumPy 计算结果一致"""
+    arr = np.random.random((300, 500)) * 10 - 5
+    pipeline = Pipeline().scale(0.3).offset(2.0).clip(0.5, 2.5).abs().log()
+    expected = np.log(np.abs(np.clip(arr * 0.3 + 2.0, 0.5, 2.5)))
+    
+    assert len(pipeline) == 5
+    assert repr(pipeline) == "Pipeline().scale(0.3).offset(2.0).clip(0.5, 2.5).abs().log()"
+    
+    for backend in ("auto", "numpy"):
+        result = pipeline(arr, backend=backend)
+        assert result.dtype == np.float64
+        np.testing.assert_allclose(result, expected, err_msg=backend)
+    
+    # 不以 scale 开头、单侧 clip 以及整数输入
+    ints = np.arange(-50, 50, dtype=np.int32)
+    result = Pipeline().offset(1).clip(hi=10).scale(2)(ints)
+    np.testing.assert_allclose(result, np.minimum(ints + 1, 10) * 2.0)
+    
+    # 空流水线等价于转换为 float64
+    np.testing.assert_array_equal(Pipeline()(ints), ints.astype(np.float64))
+    
+    # NaN 在 clip 中保持传播
+    nan_result = Pipeline().clip(0, 1)(np.array([np.nan, 2.0, -1.0]))
+    assert np.isnan(nan_result[0])
+    np.testing.assert_array_equal(nan_result[1:], [1.0, 0.0])
+    
+    with pytest.raises(ValueError, match="at least one"):
+        Pipeline().clip()
+
+
+@cpp_test
+def test_pipeline_layouts_and_out():
+    """测试流水线在视图、Fortran 顺序、out 和多线程下的正确性"""
+    pipeline = Pipeline().scale(0.5).offset(-1.0).abs()
+    base = np.random.random((1200, 900)).astype(np.float32)
+    cases = {
+        "contiguous": base,
+        "fortran": np.asfortranarray(base),
+        "strided": base[::3, ::2],
+        "reversed": base[::-1],
+    }
+    for name, arr in cases.items():
+        expected = np.abs(arr.astype(np.float64) * 0.5 - 1.0)
+        np.testing.assert_allclose(pipeline(arr, backend="cpp", threads=4), expected, err_msg=name)
+    
+    # 跨步输出与原地计算
+    dest = np.zeros((1200, 900))[:, ::-1]
+    result = pipeline(base, out=dest, backend="cpp", threads=2)
+    assert result is dest
+    np.testing.assert_allclose(dest, np.abs(base * 0.5 - 1.0))
+    
+    data = np.random.random(100000)
+    expected = np.abs(data * 0.5 - 1.0)
+    assert pipeline(data, inplace=True, backend="cpp") is data
+    np.testing.assert_allclose(data, expected)
+    
+    with pytest.raises(TypeError, match="must be numeric"):
+        pipeline(np.array(["a"]))
+
+
+@pytest.fixture
+def result_cache():
+    """启用结果缓存，测试结束后关闭"""
+    set_cache_size(1 << 20)
+    yield
+    set_cache_size(0)
+
+
+@unit_test
+def test_result_cache_scale_array(result_cache):
+    """测试按内容哈希缓存 scale_array 结果"""
+    arr = np.random.random(1000)
+    
+    first = scale_array(arr)
+    assert not first.flags.writeable
+    assert get_cache_info().misses == 1
+    
+    # 相同内容（不同对象）命中缓存
+    second = scale_array(arr.copy())
+    assert second is first
+    info = get_cache_info()
+    assert (info.hits, info.misses, info.entries, info.nbytes) == (1, 1, 1, 8000)
+    
+    # 系数、dtype、形状、内存顺序或流水线不同都不会命中
+    assert scale_array(arr, 0.5) is not first
+    assert scale_array(arr.astype(np.float32)) is not first
+    assert scale_array(arr.reshape(10, 100)) is not first
+    matrix = np.random.random((20, 30))
+    assert scale_array(np.asfortranarray(matrix)) is not scale_array(matrix)
+    assert Pipeline().scale(0.3).offset(1.0)(arr) is not first
+    np.testing.assert_array_almost_equal(Pipeline().scale(0.3)(arr), arr * 0.3)
+    
+    # 写入调用方缓冲区或非连续视图时绕过缓存
+    before = get_cache_info()
+    out = np.empty(1000)
+    assert scale_array(arr, out=out) is out and out.flags.writeable
+    scale_array(np.random.random(2000)[::2])
+    assert get_cache_info()[:3] == before[:3]
+    
+    clear_cache()
+    assert get_cache_info()[:4] == (0, 0, 0, 0)
+
+
+@unit_test
+def test_result_cache_transform_and_eviction(result_cache):
+    """测试 transform 的缓存以及 LRU 淘汰"""
+    input_dict = {"a": np.arange(100.0), "b": np.ones((10, 10), dtype=np.int32)}
+    first = transform(input_dict)
+    second = transform({"b": input_dict["b"].copy(), "a": input_dict["a"].copy(), "c": np.zeros(3)})
+    
+    assert list(second) == ["b_new", "a_new", "c_new"]
+    assert second["a_new"] is first["a_new"] and second["b_new"] is first["b_new"]
+    assert get_cache_info().hits == 2
+    
+    # 超出字节预算时淘汰最久未使用的条目
+    set_cache_size(3 * 8000)
+    clear_cache()
+    arrays = [np.full(1000, float(i)) for i in range(4)]
+    results = [scale_array(a) for a in arrays[:3]]
+    scale_array(arrays[0])
+    scale_array(arrays[3])
+    info = get_cache_info()
+    assert info.entries == 3 and info.nbytes <= info.max_bytes
+    assert scale_array(arrays[0]) is results[0]
+    assert scale_array(arrays[1]) is not results[1]
+    
+    # 大于整个预算的结果不缓存
+    scale_array(np.zeros(10000))
+    assert get_cache_info().nbytes <= 3 * 8000
+    
+    for invalid in (-1, 1.5, None):
+        with pytest.raises(ValueError, match="max_bytes"):
+            set_cache_size(invalid)
+
+
+@unit_test
+def test_incremental_transformer(mocker):
+    """测试增量转换只处理新追加的数据"""
+    import pybase.transform as transform_module
+    spy = mocker.spy(transform_module, "scale_array")
+    incremental = IncrementalTransformer(factor=2.0)
+    
+    series = np.arange(5.0)
+    matrix = np.ones((3, 4), dtype=np.int32)
+    result = incremental.update({"series": series, "matrix": matrix})
+    np.testing.assert_array_almost_equal(result["series_new"], series * 2.0)
+    np.testing.assert_array_almost_equal(result["matrix_new"], matrix * 2.0)
+    assert incremental.processed("series") == 5
+    
+    # 追加后只缩放新数据
+    spy.reset_mock()
+    series = np.append(series, [10.0, 20.0, 30.0])
+    matrix = np.vstack([matrix, np.full((2, 4), 3, dtype=np.int32)])
+    result = incremental.update({"series": series, "matrix": matrix})
+    assert [len(call.args[0]) for call in spy.call_args_list] == [3, 2]
+    np.testing.assert_array_almost_equal(result["series_new"], series * 2.0)
+    np.testing.assert_array_almost_equal(result["matrix_new"], matrix * 2.0)
+    assert result["matrix_new"].shape == (5, 4)
+    
+    # 没有新数据时不调用缩放
+    spy.reset_mock()
+    again = incremental.update({"series": series})
+    assert spy.call_count == 0
+    np.testing.assert_array_almost_equal(again["series_new"], series * 2.0)
+    
+    # 缓冲区按倍数增长，多次追加的总拷贝量是线性的
+    reallocations = 0
+    for _ in range(200):
+        previous = incremental._buffers["series"]
+        series = np.append(series, [1.0])
+        incremental.update({"series": series})
+        reallocations += incremental._buffers["series"] is not previous
+    assert reallocations <= 6
+    np.testing.assert_array_almost_equal(incremental.update({"series": series})["series_new"], series * 2.0)
+
+
+@unit_test
+def test_incremental_transformer_errors_and_reset():
+    """测试增量转换的错误处理与重置"""
+    incremental = IncrementalTransformer()
+    incremental.update({"x": np.ones(10), "m": np.ones((2, 3))})
+    
+    with pytest.raises(ValueError, match="shrank"):
+        incremental.update({"x": np.ones(5)})
+    
+    with pytest.raises(ValueError, match="trailing shape"):
+        incremental.update({"m": np.ones((4, 2))})
+    
+    with pytest.raises(ValueError, match="at least one dimension"):
+        incremental.update({"s": np.float64(1.0)})
+    
+    with pytest.raises(TypeError, match="must be numeric"):
+        incremental.update({"t": np.array(["a", "b"])})
+    
+    incremental.reset("x")
+    assert incremental.processed("x") == 0
+    np.testing.assert_array_almost_equal(incremental.update({"x": np.ones(5)})["x_new"], np.ones(5) * 0.3)
+    
+    incremental.reset()
+    assert incremental.processed("m") == 0
+    
+    with pytest.raises(ValueError, match="threads"):
+        IncrementalTransformer(threads=0)
+
+
+@pytest.mark.parametrize("native", [True, False])
+@unit_test
+def test_create_new_keys(monkeypatch, native):
+    """测试批量生成新键以及键对象复用"""
+    import pybase.transform as transform_module
+    if native and not get_cpp_availability():
+        pytest.skip("C++ 实现不可用")
+    monkeypatch.setattr(transform_module, "_CPP_AVAILABLE", native and get_cpp_availability())
+    monkeypatch.setattr(transform_module, "_new_key_cache", {})
+    
+    keys = [f"key_{i}" for i in range(1000)]
+    first = create_new_keys(keys)
+    assert first == [key + "_new" for key in keys]
+    
+    # 重复的键返回同一个字符串对象
+    second = create_new_keys(iter(list(keys)))
+    assert all(a is b for a, b in zip(first, second))
+    assert create_new_keys(["a"], suffix="_old") == ["a_old"]
+    assert create_new_keys([]) == []
+    
+    with pytest.raises(ValueError, match="Key must be a string"):
+        create_new_keys(["a", 1])
+    
+    with pytest.raises(ValueError, match="Suffix must be a string"):
+        create_new_keys(["a"], suffix=None)
+    
+    # 新键不被驻留：已驻留的同值字符串不会被返回
+    import sys
+    import uuid
+    key = f"k{uuid.uuid4().hex}"
+    interned = sys.intern("".join([key, "_new"]))
+    assert create_new_keys([key]) == [interned]
+    assert create_new_keys([key])[0] is not interned
+    
+    # 缓存表写满后只读：已缓存的键继续复用，不会被整体清空
+    monkeypatch.setattr(transform_module, "_new_key_cache", {})
+    monkeypatch.setattr(transform_module, "_KEY_CACHE_MAX_ENTRIES", 4)
+    many = [f"x{i}" for i in range(10)]
+    first = create_new_keys(many)
+    second = create_new_keys(many)
+    assert second == [key + "_new" for key in many]
+    assert [a is b for a, b in zip(first, second)] == [True] * 4 + [False] * 6
+    assert len(transform_module._new_key_cache["_new"]) == 4
+    
+    # 上限由所有后缀共享；后缀过多时只淘汰最久未使用的那个
+    assert create_new_keys(["a"], suffix="_b") == ["a_b"]
+    assert "a" not in transform_module._new_key_cache["_b"]
+    monkeypatch.setattr(transform_module, "_KEY_CACHE_MAX_SUFFIXES", 2)
+    create_new_keys(["a"])
+    create_new_keys(["a"], suffix="_c")
+    assert list(transform_module._new_key_cache) == ["_new", "_c"]
+    assert create_new_keys(many)[0] is first[0]
+
+
+@pytest.mark.parametrize("native", [True, False])
+@unit_test
+def test_create_new_keys_large_schema(monkeypatch, native):
+    """测试大模式（10 万键）重复调用时复用键对象，超出上限的部分不会清空缓存"""
+    import pybase.transform as transform_module
+    if native and not get_cpp_availability():
+        pytest.skip("C++ 实现不可用")
+    monkeypatch.setattr(transform_module, "_CPP_AVAILABLE", native and get_cpp_availability())
+    monkeypatch.setattr(transform_module, "_new_key_cache", {})
+    
+    keys = [f"column_{i}" for i in range(100000)]
+    first = create_new_keys(keys)
+    again = create_new_keys(keys)
+    assert all(a is b for a, b in zip(first, again))
+    
+    # C++ 实现的 transform() 使用同一张表
+    if native:
+        result = list(transform(dict.fromkeys(keys, np.ones(1)), backend="cpp"))
+        assert all(a is b for a, b in zip(first, result))
+    
+    # 超过上限时只缓存前面的键，之后的调用继续复用它们
+    monkeypatch.setattr(transform_module, "_new_key_cache", {})
+    monkeypatch.setattr(transform_module, "_KEY_CACHE_MAX_ENTRIES", 1 << 14)
+    first = create_new_keys(keys)
+    for _ in range(2):
+        again = create_new_keys(keys)
+        assert sum(a is b for a, b in zip(first, again)) == 1 << 14
+
+
+@cpp_test
+def test_transform_reuses_key_objects():
+    """测试 transform 在相同键集合上复用输出键对象"""
+    data = {f"col_{i}": np.ones(3) for i in range(50)}
+    first = list(transform(data, backend="cpp"))
+    second = list(transform(dict(data), backend="cpp"))
+    assert all(a is b for a, b in zip(first, second))
+    assert first == create_new_keys(data)
+
+
+@unit_test
+def test_transformer_plans(mocker):
+    """测试 Transformer 按模式缓存执行计划"""
+    import pybase.transform as transform_module
+    validate = mocker.spy(transform_module, "_validate_dict")
+    transformer = Transformer(factor=0.5, suffix="_scaled")
+    assert not hasattr(transformer, "__dict__")
+    
+    batch = {"a": np.arange(10.0), "b": np.ones((3, 4), dtype=np.int32)}
+    result = transformer(batch)
+    assert list(result) == ["a_scaled", "b_scaled"]
+    np.testing.assert_array_almost_equal(result["a_scaled"], np.arange(10.0) * 0.5)
+    np.testing.assert_array_almost_equal(result["b_scaled"], np.ones((3, 4)) * 0.5)
+    assert validate.call_count == 1
+    
+    # 相同模式的后续调用跳过完整校验
+    for i in range(5):
+        result = transformer({"a": np.full(10, float(i)), "b": np.zeros((3, 4), dtype=np.int32)})
+        np.testing.assert_array_almost_equal(result["a_scaled"], np.full(10, i * 0.5))
+    assert validate.call_count == 1
+    
+    # dtype 或键改变时重新编译计划
+    transformer({"a": np.arange(10, dtype=np.float32), "b": batch["b"]})
+    transformer({"b": batch["b"], "a": batch["a"]})
+    assert validate.call_count == 3
+    
+    # 列表输入每次都校验，但结果正确
+    np.testing.assert_array_almost_equal(transformer({"l": [1.0, 2.0]})["l_scaled"], [0.5, 1.0])
+    
+    with pytest.raises(TypeError, match="must be numeric"):
+        transformer({"a": np.array(["x"]), "b": batch["b"]})
+    with pytest.raises(ValueError, match="All keys must be strings"):
+        transformer({1: np.ones(2)})
+
+
+@cpp_test
+def test_transformer_plan_keys(monkeypatch):
+    """测试 Transformer 的计划使用自己的输出键，不依赖全局键缓存"""
+    import pybase.transform as transform_module
+    batch = {f"col_{i}": np.ones(3) for i in range(100)}
+    transformers = [Transformer(suffix=f"_s{i}", backend="cpp") for i in range(6)]
+    first = [list(transformer(batch)) for transformer in transformers]
+    
+    # 全局缓存被清空（或被其他后缀挤出）后，仍返回计划中的键对象
+    monkeypatch.setattr(transform_module, "_new_key_cache", {})
+    for transformer, keys in zip(transformers, first):
+        assert all(a is b for a, b in zip(transformer(batch), keys))
+    assert transform_module._new_key_cache == {}
+
+
+@unit_test
+def test_transformer_backends_and_options():
+    """测试 Transformer 的后端选择和参数校验"""
+    batch = {"x": np.random.random((50, 20)), "y": np.arange(7, dtype=np.uint8)}
+    expected = transform(batch)
+    for backend in ("numpy", "auto"):
+        result = Transformer(backend=backend)(batch)
+        assert list(result) == list(expected)
+        for key in expected:
+            np.testing.assert_array_almost_equal(result[key], expected[key])
+    
+    assert Transformer()({}) == {}
+    assert "factor=0.3" in repr(Transformer())
+    
+    with pytest.raises(ValueError, match="Unsupported output_dtype"):
+        Transformer(dtype=np.complex128)
+    with pytest.raises(ValueError, match="Suffix must be a string"):
+        Transformer(suffix=1)
+    with pytest.raises(ValueError, match="backend"):
+        Transformer(backend="gpu")
+    with pytest.raises(ValueError, match="Input must be a dictionary"):
+        Transformer()([1, 2])
+
+
+@unit_test
+def test_buffer_pool_reuse():
+    """测试输出缓冲池在稳定循环中复用数组"""
+    pool = BufferPool(max_bytes=1 << 20)
+    batch = {"a": np.random.random((100, 50)), "f": np.asfortranarray(np.random.random((20, 30)))}
+    
+    first = transform(batch, pool=pool)
+    np.testing.assert_array_almost_equal(first["a_new"], batch["a"] * 0.3)
+    assert first["f_new"].flags.f_contiguous
+    assert (pool.hits, pool.misses) == (0, 2)
+    
+    buffers = {key: value for key, value in first.items()}
+    pool.release(first)
+    assert pool.nbytes == sum(v.nbytes for v in buffers.values())
+    
+    # 释放后的缓冲区被下一次调用复用
+    second = transform({"a": batch["a"] * 2, "f": batch["f"]}, pool=pool)
+    assert second["a_new"] is buffers["a_new"] and second["f_new"] is buffers["f_new"]
+    np.testing.assert_array_almost_equal(second["a_new"], batch["a"] * 0.6)
+    assert (pool.hits, pool.nbytes) == (2, 0)
+    
+    # scale_array 同样可以使用缓冲池
+    pool.release(second["a_new"])
+    result = scale_array(batch["a"], 2.0, pool=pool)
+    assert result is buffers["a_new"]
+    np.testing.assert_array_almost_equal(result, batch["a"] * 2.0)
+    
+    # 输入与复用的缓冲区是同一块内存时结果仍然正确
+    pool.release(result)
+    aliased = scale_array(result, 0.5, pool=pool)
+    np.testing.assert_array_almost_equal(aliased, batch["a"])
+
+
+@unit_test
+def test_buffer_pool_limits():
+    """测试缓冲池的容量上限与参数校验"""
+    pool = BufferPool(max_bytes=8000)
+    pool.release([np.empty(1000), np.empty(1000)])
+    assert pool.nbytes == 8000
+    
+    # 视图和只读数组不会进入缓冲池
+    base = np.empty(2000)
+    readonly = np.empty(10)
+    readonly.flags.writeable = False
+    pool.clear()
+    pool.release([base[:1000], readonly])
+    assert pool.nbytes == 0
+    
+    # 同一数组不会重复加入
+    arr = np.empty(10)
+    pool.release(arr)
+    pool.release(arr)
+    assert pool.nbytes == arr.nbytes
+    
+    with pytest.raises(ValueError, match="max_bytes"):
+        BufferPool(-1)
+    with pytest.raises(ValueError, match="pool cannot be combined"):
+        transform({"x": np.ones(3)}, inplace=True, pool=pool)
+
+
+@pytest.mark.parametrize("backend", ["auto", "numpy"])
+@unit_test
+def test_transform_arena(backend):
+    """测试 arena 模式下所有结果位于同一块连续内存"""
+    data = {
+        "a": np.arange(5, dtype=np.int32),
+        "b": np.ones((3, 4)),
+        "c": np.asfortranarray(np.arange(6, dtype=np.float32).reshape(2, 3)),
+    }
+    result = transform(data, arena=True, backend=backend)
+    
+    assert list(result) == ["a_new", "b_new", "c_new"]
+    for key, value in data.items():
+        out = result[key + "_new"]
+        assert out.shape == value.shape and out.dtype == np.float64
+        assert out.ctypes.data % 64 == 0
+        np.testing.assert_array_almost_equal(out, value * 0.3)
+    assert result["c_new"].flags.f_contiguous
+    
+    # 所有结果共享同一个底层缓冲区
+    bases = {id(np.asarray(out).base) for out in result.values()}
+    assert len(bases) == 1
+
+
+@pytest.mark.parametrize("backend", ["auto", "numpy"])
+@unit_test
+def test_transform_stack(backend):
+    """测试 stack 模式返回堆叠数组与键索引"""
+    data = {"x": np.arange(6).reshape(2, 3), "y": np.ones((2, 3)), "z": np.zeros((2, 3))}
+    stacked, index = transform(data, stack=True, backend=backend)
+    
+    assert stacked.shape == (3, 2, 3) and stacked.dtype == np.float64
+    assert index == {"x_new": 0, "y_new": 1, "z_new": 2}
+    for key, value in data.items():
+        np.testing.assert_array_almost_equal(stacked[index[key + "_new"]], value * 0.3)
+    
+    stacked, index = transform({}, stack=True)
+    assert stacked.size == 0 and index == {}
+    
+    # 0 维输入堆叠成一维数组（C++ 内核不支持 0 维数组，auto 会回退到 NumPy）
+    import warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        stacked, index = transform({"a": np.array(2.0), "b": np.array(3, dtype=np.int32)},
+                                   stack=True, backend=backend)
+    np.testing.assert_array_almost_equal(stacked, [0.6, 0.9])
+    assert index == {"a_new": 0, "b_new": 1}
+    
+    # 形状不一致或与其他输出选项组合时报错
+    with pytest.raises(ValueError, match="same shape"):
+        transform({"x": np.ones(3), "y": np.ones(4)}, stack=True)
+    with pytest.raises(ValueError, match="mutually exclusive"):
+        transform(data, arena=True, stack=True)
+    with pytest.raises(ValueError, match="cannot be combined"):
+        transform(data, arena=True, inplace=True)
+    with pytest.raises(ValueError, match="cannot be combined"):
+        transform(data, stack=True, lazy=True)
+
+
+@pytest.mark.parametrize("backend", ["auto", "numpy"])
+@unit_test
+def test_output_dtype_rules(backend):
+    """测试 output_dtype 的类型提升规则"""
+    data = {
+        "f2": np.linspace(-2, 2, 9).astype(np.float16),
+        "f4": np.linspace(-2, 2, 9).astype(np.float32),
+        "i2": np.arange(-4, 5, dtype=np.int16),
+        "u1": np.arange(9, dtype=np.uint8),
+    }
+    expected = {
+        None: ["float64"] * 4,
+        "same": ["float16", "float32", "int16", "uint8"],
+        "float": ["float16", "float32", "float64", "float64"],
+        np.float32: ["float32"] * 4,
+    }
+    for output_dtype, dtypes in expected.items():
+        result = transform(data, backend=backend, output_dtype=output_dtype)
+        assert [value.dtype.name for value in result.values()] == dtypes
+        # 先以 float64 计算，再一次性舍入到目标类型
+        for key, value in data.items():
+            reference = value.astype(np.float64) * 0.3
+            if result[key + "_new"].dtype.kind in "iu":
+                reference = np.rint(reference)
+            np.testing.assert_array_equal(result[key + "_new"], reference.astype(result[key + "_new"].dtype))
+    
+    # 整数结果按“四舍六入五成双”舍入，并饱和到类型范围
+    ints = np.array([-500, -5, 5, 15, 25, 500, 2**31 - 1], dtype=np.int32)
+    result = scale_array(ints, 0.3, backend=backend, output_dtype="same")
+    np.testing.assert_array_equal(result, [-150, -2, 2, 4, 8, 150, 644245094])
+    result = scale_array(ints, 1000.0, backend=backend, output_dtype=np.int16)
+    np.testing.assert_array_equal(result, [-32768, -5000, 5000, 15000, 25000, 32767, 32767])
+    result = scale_array(np.array([1, 2**63 - 1], dtype=np.int64), 4.0, backend=backend, output_dtype="same")
+    np.testing.assert_array_equal(result, [4, 2**63 - 1])
+    result = Pipeline().log()(np.array([0, 1, 2], dtype=np.uint8), backend=backend, output_dtype="same")
+    np.testing.assert_array_equal(result, [0, 0, 1])
+    
+    with pytest.raises(TypeError, match="requires integer input"):
+        scale_array(np.ones(3), backend=backend, output_dtype=np.int32)
+    with pytest.raises(TypeError, match="requires integer input"):
+        transform({"a": np.ones(3, dtype=np.float32)}, backend=backend, output_dtype="int8")
+    with pytest.raises(ValueError, match="Unsupported output_dtype"):
+        scale_array(np.ones(3), backend=backend, output_dtype=np.complex64)
+    with pytest.raises(ValueError, match="processes"):
+        transform(data, processes=2, output_dtype="same")
+
+
+@pytest.mark.parametrize("backend", ["auto", "numpy"])
+@unit_test
+def test_output_dtype_layouts_and_destinations(backend):
+    """测试 output_dtype 与各种内存布局及输出选项的组合"""
+    rng = np.random.default_rng(0)
+    # 覆盖所有 float16 取值（含次正规数、inf 和 NaN）
+    halves = np.arange(1 << 16, dtype=np.uint16).view(np.float16)
+    result = scale_array(halves, 1.0, backend=backend, output_dtype="same")
+    np.testing.assert_array_equal(result.view(np.uint16)[~np.isnan(halves)],
+                                  halves.view(np.uint16)[~np.isnan(halves)])
+    assert np.isnan(result[np.isnan(halves)]).all()
+    
+    wide = rng.standard_normal(300_000) * np.logspace(-8, 5, 300_000)
+    result = scale_array(wide, 0.3, backend=backend, output_dtype=np.float16)
+    with np.errstate(over="ignore"):
+        np.testing.assert_array_equal(result, (wide * 0.3).astype(np.float16))
+    
+    # 跨步视图、Fortran 数组以及多线程
+    base = np.asfortranarray(rng.standard_normal((400, 300)).astype(np.float32))
+    for arr in (base, base[::3, 1::2], base.T):
+        result = scale_array(arr, 0.3, threads=4, backend=backend, output_dtype="same")
+        assert result.dtype == np.float32
+        np.testing.assert_array_equal(result, (arr.astype(np.float64) * 0.3).astype(np.float32))
+    assert scale_array(base, backend=backend, output_dtype="same").flags.f_contiguous
+    
+    # out、inplace、缓冲池、arena 与 stack
+    arr = np.arange(10, dtype=np.float32)
+    out = np.empty(10, dtype=np.float32)
+    assert scale_array(arr, 2.0, out=out, backend=backend, output_dtype="same") is out
+    with pytest.raises(TypeError, match="dtype float64"):
+        scale_array(arr, out=out, backend=backend)
+    inplace = arr.copy()
+    scale_array(inplace, 2.0, inplace=True, backend=backend, output_dtype="float")
+    np.testing.assert_array_equal(inplace, out)
+    
+    pool = BufferPool(max_bytes=1 << 20)
+    pool.release(np.empty(10, dtype=np.float32))
+    assert transform({"a": arr}, pool=pool, backend=backend, output_dtype="same")["a_new"].dtype == np.float32
+    assert pool.hits == 1
+    
+    data = {"a": arr, "b": np.arange(10, dtype=np.int16), "c": np.ones(3, dtype=np.float16)}
+    result = transform(data, arena=True, backend=backend, output_dtype="same")
+    assert [value.dtype.name for value in result.values()] == ["float32", "int16", "float16"]
+    assert all(value.ctypes.data % 64 == 0 for value in result.values())
+    stacked, index = transform({"a": arr, "b": np.arange(10, dtype=np.int16)}, stack=True,
+                               backend=backend, output_dtype="same")
+    assert stacked.dtype == np.float32
+    np.testing.assert_array_equal(stacked[index["b_new"]], (np.arange(10) * 0.3).astype(np.float32))
+    
+    # Transformer 与惰性结果
+    transformer = Transformer(factor=2.0, dtype="same", backend=backend)
+    assert "dtype='same'" in repr(transformer)
+    for _ in range(2):
+        assert transformer(data)["b_new"].dtype == np.int16
+    lazy = transform(data, lazy=True, backend=backend, output_dtype="float")
+    assert lazy["b_new"].dtype == np.float64
+    assert lazy.region("a_new", 3) == np.float32(0.9)
+    
+    # 没有输入时 stack 也使用显式指定的类型
+    stacked, index = transform({}, stack=True, backend=backend, output_dtype=np.float32)
+    assert stacked.dtype == np.float32 and index == {}
+
+
+@pytest.mark.parametrize("backend", ["auto", "numpy"])
+@unit_test
+def test_output_dtype_async_stream_incremental(monkeypatch, backend):
+    """测试 output_dtype 在异步、流式和增量接口中的传递"""
+    import asyncio
+    import pybase.transform as transform_module
+    monkeypatch.setattr(transform_module, "_ASYNC_STEP_SIZE", 100)
+    
+    arr = np.arange(1000, dtype=np.float32).reshape(50, 20)
+    expected = (arr.astype(np.float64) * 0.3).astype(np.float32)
+    
+    # 分片执行的 ascale_array 和按步执行的 atransform
+    result = asyncio.run(ascale_array(arr, backend=backend, output_dtype="same"))
+    assert result.dtype == np.float32
+    np.testing.assert_array_equal(result, expected)
+    out = np.empty_like(arr)
+    assert asyncio.run(ascale_array(arr, out=out, backend=backend, output_dtype="same")) is out
+    with pytest.raises(TypeError, match="dtype float64"):
+        asyncio.run(ascale_array(arr, out=out, backend=backend))
+    result = asyncio.run(atransform({"a": arr, "b": arr[:2]}, backend=backend, output_dtype=np.float16))
+    assert [value.dtype for value in result.values()] == [np.float16, np.float16]
+    
+    # transform_stream
+    batches = [{"x": np.arange(5, dtype=np.int32) * i} for i in range(3)]
+    for i, batch in enumerate(transform_stream(batches, backend=backend, output_dtype="same")):
+        assert batch["x_new"].dtype == np.int32
+        np.testing.assert_array_equal(batch["x_new"], np.rint(np.arange(5) * i * 0.3))
+    with pytest.raises(ValueError, match="Unsupported output_dtype"):
+        transform_stream(batches, output_dtype=np.complex128)
+    
+    # IncrementalTransformer：缓冲区使用结果类型，类型变化时报错
+    incremental = IncrementalTransformer(backend=backend, output_dtype="same")
+    ticks = np.arange(3, dtype=np.float32)
+    assert incremental.update({"t": ticks})["t_new"].dtype == np.float32
+    ticks = np.arange(10, dtype=np.float32)
+    result = incremental.update({"t": ticks})["t_new"]
+    assert result.dtype == np.float32
+    np.testing.assert_array_equal(result, (ticks.astype(np.float64) * 0.3).astype(np.float32))
+    with pytest.raises(ValueError, match="result dtype"):
+        incremental.update({"t": np.arange(12, dtype=np.float64)})
+    with pytest.raises(TypeError, match="Integer output dtype"):
+        IncrementalTransformer(output_dtype=np.int16).update({"t": ticks})
+
+
+@unit_test
+def test_numpy_backend_strided_output_dtype_blocks(monkeypatch):
+    """测试 NumPy 后端对非连续输入按块处理，不产生整数组大小的临时数组"""
+    import pybase.transform as transform_module
+    monkeypatch.setattr(transform_module, "_NUMPY_CHUNK_SIZE", 64)
+    block = []
+    original = transform_module._numpy_block
+    
+    def spy_block(arr, factor, out, steps):
+        block.append(arr.size)
+        original(arr, factor, out, steps)
+    
+    monkeypatch.setattr(transform_module, "_numpy_block", spy_block)
+    
+    rng = np.random.default_rng(0)
+    base = rng.standard_normal((30, 40, 7))
+    fortran = np.asfortranarray(base)
+    for arr in (base[::2, 1::3], fortran[:, ::2], base.transpose(2, 0, 1)[:, ::-1], base[:, :, 0]):
+        del block[:]
+        for output_dtype in (np.float32, np.float16):
+            result = scale_array(arr, 0.3, backend="numpy", output_dtype=output_dtype)
+            np.testing.assert_array_equal(result, (arr * 0.3).astype(output_dtype))
+        assert block and max(block) <= 64
+    
+    ints = np.arange(3000, dtype=np.int64).reshape(60, 50)[:, ::2]
+    result = scale_array(ints, 0.3, backend="numpy", output_dtype="same")
+    np.testing.assert_array_equal(result, np.rint(ints * 0.3).astype(np.int64))